@@ -8,6 +8,9 @@ from sol_binder.cli.compile import compile_sol
 from sol_binder.cli.deploy import deploy_contract
 from sol_binder.cli.transact import transact
 from sol_binder.cli.init import init
+from sol_binder.cli.gas_report import gas_report
+from sol_binder.cli.warmup import warmup
+from sol_binder.cli.multicall import deploy_multicall
 from sol_binder.cli.click_group import SolBinderClickGroup
 
 
@@ -26,6 +29,9 @@ cli.add_command(compile_sol, name="compile")
 cli.add_command(deploy_contract, name="deploy")
 cli.add_command(call, name="call")
 cli.add_command(transact, name="transact")
+cli.add_command(warmup, name="warmup")
+cli.add_command(gas_report, name="gas-report")
+cli.add_command(deploy_multicall, name="deploy-multicall")
 
 if __name__ == '__main__':
     cli()
@@ -1,31 +1,109 @@
-from typing import TYPE_CHECKING, List, Union
+from typing import TYPE_CHECKING, List, Iterable
 from typing import Optional
 import os
-import re
 
+from .imports.bind_cache import BindCache, BindResult
+from .imports.lockfile import ImportLock, DEFAULT_LOCK_FILENAME
+from .imports.remappings import Remappings
+from .imports.resolver import ImportResolver, DEFAULT_MAX_WORKERS
+from .imports.scanner import iter_import_directives, rewrite_imports
+from .imports.store import ContentStore
+from .imports.validators import ValidatorCache
 from .retrievers.localfile import LocalFileRetriever
-from .utils import normalize_url_path
+from .retrievers.registry import RetrieverRegistry
 from .project.config import ProjectConfig
-from .solbinder_logging import get_solbinder_logger
+from .project.errors import ProjectConfigLocationError
 
 if TYPE_CHECKING:
     from .retrievers.base import BaseRetriever
 
 
 class SolBinder(object):
-    def __init__(self, import_path: Optional[str] = None, verbose: bool = False):
+    def __init__(self, import_path: Optional[str] = None, verbose: bool = False,
+                 max_workers: int = DEFAULT_MAX_WORKERS, lock_path: Optional[str] = None,
+                 refresh_imports: bool = False, remappings: Optional[Iterable[str]] = None,
+                 remappings_root: Optional[str] = None):
+        """
+        :param refresh_imports: Revalidate every remote import and update the pins of the ones that changed
+        :param remappings: solc-style import remappings, e.g. "@foo/=https://github.com/foo/foo/blob/v1.0/"
+        :param remappings_root: Directory the remapping targets that are relative paths (e.g. "@foo/=lib/foo/") are
+               resolved against, usually the project root. The import path if None
+        """
         self.import_path = import_path or self.__get_default_import_path()
-        self.retrievers: List["BaseRetriever"] = list()
+        self.lock_path = lock_path or self.__get_default_lock_path(self.import_path)
+        base_path = None
+        if remappings_root is not None:
+            base_path = os.path.relpath(os.path.abspath(remappings_root), os.path.abspath(self.import_path))
+        self.remappings = Remappings(remappings or (), base_path)
+        self.__registry = RetrieverRegistry(LocalFileRetriever(self.import_path))
         self.__register_default_retrievers()
         self.__verbose = verbose
+        self.__resolver = ImportResolver(self.import_path, self.__registry.get,
+                                         ContentStore(os.path.join(self.import_path, ".objects")),
+                                         ImportLock(self.lock_path, self.remappings.get_fingerprint()),
+                                         ValidatorCache(os.path.join(self.import_path, ".validators.json")),
+                                         max_workers, refresh_imports, self.remappings)
+        self.__bind_cache = self.__create_bind_cache()
+
+    @property
+    def retrievers(self) -> List["BaseRetriever"]:
+        return list(self.__registry)
+
+    @property
+    def allow_paths(self) -> List[str]:
+        """The directories solc may read the imports of bound sources from"""
+        return [self.import_path] + [os.path.normpath(os.path.join(self.import_path, target))
+                                     for target in self.remappings.get_local_targets()]
 
     def bind(self, source: str):
-        imp_translations = self.__download_imports(source, self.import_path)
-        source = self.__preprocess_source(source, imp_translations)
-        return source
+        return self.bind_with_imports(source).source
+
+    def bind_with_imports(self, source: str) -> BindResult:
+        """Bind `source`, also returning the hashes of every file in its import graph"""
+        key = self.__bind_cache.get_key(source)
+        cached = None if self.__resolver.refresh else self.__bind_cache.get(key)
+        if cached is not None:
+            return cached
+        directives = list(iter_import_directives(source))
+        imp_translations, nodes = self.__resolver.resolve(directive.path for directive in directives)
+        result = BindResult(
+            source=rewrite_imports(source, imp_translations, directives),
+            imports={url: node.hash for url, node in nodes.items()},
+            files={node.local_path: self.__bind_cache.stat(node.local_path) for node in nodes.values()},
+        )
+        self.__bind_cache.put(key, result)
+        return result
+
+    def verify_imports(self) -> List[str]:
+        """
+        :return: Urls of the locked imports whose content does not match the hash pinned in the lockfile
+        """
+        return self.__resolver.verify()
+
+    @classmethod
+    def from_project_config(cls, project_config: ProjectConfig, **kwargs) -> "SolBinder":
+        from .retrievers.archive import ArchiveRetriever
+        binder = cls(import_path=project_config.imports_cache_dir, remappings=project_config.remappings,
+                     remappings_root=project_config.project_root, **kwargs)
+        for prefix, archive in (project_config.import_archives or dict()).items():
+            if not archive.startswith(("http://", "https://")):
+                archive = os.path.join(project_config.project_root, archive)
+            binder.register_retriever(ArchiveRetriever(prefix, archive, os.path.join(binder.import_path, ".archives")),
+                                      prepend=True)
+        return binder
+
+    def register_retriever(self, retriever: "BaseRetriever", prepend: bool = False):
+        """
+        :param prepend: Take precedence over the retrievers already registered
+        """
+        self.__registry.register(retriever, prepend)
+        self.__bind_cache = self.__create_bind_cache()
 
-    def register_retriever(self, retriever: "BaseRetriever"):
-        self.retrievers.append(retriever)
+    def __create_bind_cache(self) -> BindCache:
+        # The retrievers decide what an import resolves to, e.g. the archive registered for a prefix, in that order
+        retrievers = "|".join(retriever.get_fingerprint() for retriever in self.__registry)
+        return BindCache(os.path.join(self.import_path, ".binds"),
+                         f"{os.path.abspath(self.import_path)}:{self.remappings.get_fingerprint()}:{retrievers}")
 
     def __register_default_retrievers(self):
         from .retrievers.github import GitHubRetriever
@@ -33,90 +111,13 @@ class SolBinder(object):
         self.register_retriever(OpenZeppelinRetriever())
         self.register_retriever(GitHubRetriever())
 
-    def __detect_retriever(self, import_path: str) -> Union[None, "BaseRetriever"]:
-        for retriever in self.retrievers:
-            if retriever.can_supply(import_path):
-                return retriever
-        return LocalFileRetriever(self.import_path)
-
     @staticmethod
     def __get_default_import_path():
         return os.path.dirname(ProjectConfig.find_project_config_path()) + "/sol_binder_cache"
 
     @staticmethod
-    def __iter_import_urls(source):
-        for l in source.splitlines():
-            l = l.strip()
-            if l.startswith('//'):
-                continue
-            match = re.search(r'import "([^"]+)"\S*;', l)
-            if match is None:
-                continue
-            sol_import_path = match.group(1)
-            yield sol_import_path
-
-    def __download_single_import(self, url):
-        url = normalize_url_path(url)
-        retriever = self.__detect_retriever(url)
-        if retriever is None:
-            raise NotImplementedError(f"No suitable retriever for {url}")
-        if self.__verbose:
-            get_solbinder_logger().info(f"Retrieving '{url}'")
-        source = retriever.get_source(url)
-        local_path = os.path.normpath(os.path.join(self.import_path, retriever.get_local_path(url)))
-        return source, local_path
-
-    def __download_imports(self, source, storage_dir, context_url=None):
-        translations = dict()
-        storage_dir = os.path.abspath(storage_dir)
-        for imp_path in self.__iter_import_urls(source):
-            retriever = self.__detect_retriever(imp_path)
-            if retriever is None:
-                raise NotImplementedError(f"No suitable retriever for {imp_path}")
-            sub_context_url = retriever.get_dep_context(imp_path) or context_url
-            if context_url is not None:
-                absolute_imp_path = normalize_url_path(os.path.join(context_url, imp_path))
-            else:
-                absolute_imp_path = imp_path
-            retriever = self.__detect_retriever(absolute_imp_path)
-            local_path = os.path.normpath(os.path.join(self.import_path, retriever.get_local_path(absolute_imp_path)))
-            cached = False
-            if not os.path.exists(local_path):
-                if self.__verbose or True:
-                    get_solbinder_logger().info(f"Downloading {local_path}")
-                imp_source, local_path = self.__download_single_import(absolute_imp_path)
-            else:
-                cached = True
-                if self.__verbose or True:
-                    get_solbinder_logger().info(f"Cached {local_path}")
-                imp_source = open(local_path).read()
-            translations[imp_path] = local_path
-            translations.update(self.__download_imports(imp_source, storage_dir, sub_context_url))
-            if not cached:
-                dir_name = os.path.dirname(local_path)
-                if not os.path.isdir(dir_name):
-                    os.makedirs(dir_name)
-
-                if self.__verbose or True:
-                    get_solbinder_logger().info(f"Writing {local_path}")
-                with open(local_path, "w") as f:
-                    # self.preprocess_source(imp_source, translations)
-                    f.write(imp_source)
-        return translations
-
-    @staticmethod
-    def __preprocess_source(source: str, import_translations: dict):
-        modified_source = ""
-        for l in source.splitlines():
-            l = l.strip()
-            if l.startswith('//'):
-                continue
-            match = re.search(r'import "([^"]+)"\S*;', l)
-            if match:
-                remote_path = match.group(1)
-                local_path = import_translations[remote_path]
-                new_line = l.replace(remote_path, local_path)
-            else:
-                new_line = l
-            modified_source += new_line + "\n"
-        return modified_source
+    def __get_default_lock_path(import_path: str):
+        try:
+            return os.path.join(os.path.dirname(ProjectConfig.find_project_config_path()), DEFAULT_LOCK_FILENAME)
+        except ProjectConfigLocationError:
+            return os.path.join(import_path, DEFAULT_LOCK_FILENAME)
@@ -8,7 +8,7 @@ from ..project.config import ProjectConfig
 
 
 @click.command()
-@click.option("-n", "--network", "network_name", default="dev", help="Name of network to use")
+@click.option("-n", "--network", "network_name", default=None, help="Name of network to use")
 @click.argument("contract_name")
 @click.argument("function")
 @click.argument("arguments", required=False, nargs=-1)
@@ -17,12 +17,13 @@ def call(ctx, network_name: str, contract_name: str, function: str, arguments: L
     solbinder_config = ProjectConfig.load_project_config(ctx.obj['project_path'])
     network_info = solbinder_config.get_network_info(network_name)
     try:
-        deployment_data = solbinder_config.get_deployment_data(contract_name)
+        deployment_data = solbinder_config.get_deployment_data(contract_name, network_name)
     except FileNotFoundError:
         click.secho(f"Contract '{contract_name}' not found", fg="red")
         exit(1)
 
-    contract_instance = ContractInstance.from_deployment_data(deployment_data, None)
+    contract_instance = ContractInstance.from_deployment_data(deployment_data, None,
+                                                            w3=solbinder_config.get_w3(network_name))
 
     args = parse_arguments(arguments)
     result = contract_instance.call(function, *args)
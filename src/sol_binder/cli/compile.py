@@ -4,11 +4,9 @@ import json
 
 import click
 
-from semantic_version import Version
-from solcx import compile_source
-
-from .utils import get_sol_cache_path
 from ..binder import SolBinder
+from ..compilation.batch import ProjectCompilation
+from ..compilation.scheduler import compile_project
 from ..project.config import ProjectConfig
 from ..utils import extract_abi_from_compiled_contract
 
@@ -18,22 +16,52 @@ __all__ = ['compile_sol']
 @click.command()
 @click.option("-s", "--solc-version", default=None, help="Sol compiler version")
 @click.option("-a", "--abi", "abi_path", default=None, help="Save ABI file")
-@click.argument("contract_file")
-def compile_sol(solc_version: Optional[str], contract_file, abi_path):
-    if not solc_version:
-        solc_version = ProjectConfig.load_project_config().solc_version
-    project_data_dir = get_sol_cache_path()
-    if not os.path.isdir(project_data_dir):
-        os.makedirs(project_data_dir)
-    binder = SolBinder(import_path=os.path.join(project_data_dir, "import_cache"))
-    with open(contract_file) as contract_handle:
-        source = contract_handle.read()
-    processed_source = binder.bind(source)
-    compiled = compile_source(processed_source,
-                              solc_version=Version(solc_version),
-                              allow_paths=binder.import_path)
+@click.option("--refresh-imports", is_flag=True, default=False, help="Revalidate remote imports and update their pins")
+@click.option("--all", "compile_all", is_flag=True, default=False, help="Compile every contract of the project")
+@click.option("-j", "--jobs", default=None, type=int, help="Number of compiler processes (defaults to the CPU count)")
+@click.argument("contract_file", required=False)
+@click.pass_context
+def compile_sol(ctx, solc_version: Optional[str], contract_file, abi_path, refresh_imports: bool, compile_all: bool,
+                jobs: Optional[int]):
+    project_config = ProjectConfig.load_project_config()
+    binder = SolBinder.from_project_config(project_config, refresh_imports=refresh_imports)
+    if compile_all:
+        return _compile_all(ctx, project_config, binder, solc_version, jobs)
+    if contract_file is None:
+        raise click.UsageError("Either CONTRACT_FILE or --all is required")
+    artifact_cache = project_config.get_artifact_cache()
+    compilation = compile_project(project_config, binder, solc_version, [contract_file], artifact_cache, 1,
+                                  project_config.get_build_graph())
+    _report(compilation)
+    click.secho(artifact_cache.get_stats(), fg="yellow")
+    if compilation.errors:
+        ctx.exit(1)
+    compiled = compilation.get_compiled_contract(contract_file)
     if abi_path:
         abi = extract_abi_from_compiled_contract(compiled)
         with open(abi_path, "w") as abi_fh:
             json.dump(abi, abi_fh)
     return compiled
+
+
+def _compile_all(ctx, project_config: ProjectConfig, binder: SolBinder, solc_version: Optional[str],
+                 jobs: Optional[int]):
+    artifact_cache = project_config.get_artifact_cache()
+    compilation = compile_project(project_config, binder, solc_version, artifact_cache=artifact_cache,
+                                  max_workers=jobs, build_graph=project_config.get_build_graph())
+    _report(compilation)
+    click.secho(artifact_cache.get_stats(), fg="yellow")
+    if compilation.errors:
+        ctx.exit(1)
+    return compilation
+
+
+def _report(compilation: ProjectCompilation):
+    for unit_name in sorted(compilation.processed_sources):
+        error = compilation.errors.get(unit_name)
+        if error is not None:
+            click.secho(f"Failed to compile {unit_name}:\n{error}", fg="red")
+        elif unit_name in compilation.up_to_date:
+            click.secho(f"Skipped {unit_name}: up to date", fg="yellow")
+        else:
+            click.secho(f"Compiled {unit_name}", fg="green")
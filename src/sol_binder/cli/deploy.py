@@ -5,32 +5,64 @@ import click
 from ..commands.errors import ContractDeploymentError, ContractAlreadyDeployedError, W3ConnectionError
 from ..project.config import ProjectConfig
 from ..commands.deploy import deploy_contract as _deploy_contract, deploy_all
+from ..commands.estimate import estimate_all, report_estimate
 
 
 @click.command()
 @click.option("-u", "--account", default=None, help="blockchain account address")
 @click.option("-p", "--private-key", "private_key", default=None, help="Private Key required for transactions")
 @click.option("-s", "--solc-version", default=None, help="Sol compiler version")
-@click.option("-n", "--network", "network_name", default="dev", help="Name of network to use")
+@click.option("-n", "--network", "network_name", default=None, help="Name of network to use")
+@click.option("--refresh-imports", is_flag=True, default=False, help="Revalidate remote imports and update their pins")
+@click.option("--pipeline", is_flag=True, default=False,
+              help="Broadcast all deployments at once instead of waiting for each of them to be mined")
+@click.option("--estimate", is_flag=True, default=False,
+              help="Only print the projected gas and cost of the deployments, without sending anything")
 @click.argument("contract", required=False)
 @click.pass_context
-def deploy_contract(ctx, account: str, private_key: str, network_name: str, solc_version: str, contract: str):
+def deploy_contract(ctx, account: str, private_key: str, network_name: str, solc_version: str, contract: str,
+                    refresh_imports: bool, pipeline: bool, estimate: bool):
     solbinder_config = ProjectConfig.load_project_config(ctx.obj['project_path'])
     if solc_version is None:
         solc_version = solbinder_config.solc_version
+    if estimate:
+        try:
+            deployment_estimate = estimate_all(account=account,
+                                               private_key=private_key,
+                                               solc_version=solc_version,
+                                               solbinder_config=solbinder_config,
+                                               contract_names=None if contract is None else [contract],
+                                               verbose=ctx.obj['verbose'],
+                                               refresh_imports=refresh_imports,
+                                               network_name=network_name)
+        except W3ConnectionError:
+            click.secho(f"Error connecting to W3 network", fg="red")
+            ctx.exit(1)
+        report_estimate(deployment_estimate)
+        if deployment_estimate.failed:
+            ctx.exit(1)
+        return
     if contract is None:
-        deploy_all(account=account,
-                   private_key=private_key,
-                   solc_version=solc_version,
-                   solbinder_config=solbinder_config,
-                   on_already_deployed=lambda p: click.secho(f"Contract already deployed!", fg="green"))
+        results = deploy_all(account=account,
+                             private_key=private_key,
+                             solc_version=solc_version,
+                             solbinder_config=solbinder_config,
+                             verbose=ctx.obj['verbose'],
+                             refresh_imports=refresh_imports,
+                             pipeline=pipeline,
+                             network_name=network_name,
+                             on_already_deployed=lambda p: click.secho(f"Contract already deployed!", fg="green"))
+        if results is not None and results.failed:
+            ctx.exit(1)
     else:
         _try_deploy_contract(account=account,
                              private_key=private_key,
                              solc_version=solc_version,
                              solbinder_config=solbinder_config,
                              verbose=ctx.obj['verbose'],
-                             contract_name=contract)
+                             refresh_imports=refresh_imports,
+                             contract_name=contract,
+                             network_name=network_name)
 
 
 def _try_deploy_contract(*args, **kwargs):
@@ -0,0 +1,66 @@
+from typing import *
+
+import math
+
+import click
+
+__all__ = ['gas_report']
+
+from ..commands.errors import GasReportError
+from ..commands.gas_report import GasReport, load_scenario, run_gas_report
+from ..project.config import ProjectConfig
+
+
+@click.command()
+@click.option("-s", "--solc-version", default=None, help="Sol compiler version")
+@click.option("-n", "--network", "network_name", default=None, help="Name of the (dev) network to use")
+@click.option("-b", "--baseline", "baseline_path", default=None, help="Compare against a saved gas report")
+@click.option("--save", "save_path", default=None, help="Save the gas report, e.g. as a new baseline")
+@click.option("-t", "--threshold", default=0.0, type=float,
+              help="Fail if the average gas of a function grows by more than this ratio of the baseline")
+@click.argument("scenario_file", required=False)
+@click.pass_context
+def gas_report(ctx, solc_version: Optional[str], network_name: Optional[str], baseline_path: Optional[str],
+               save_path: Optional[str], threshold: float, scenario_file: Optional[str]):
+    """Deploy every contract and run SCENARIO_FILE on a dev chain, reporting the gas used by each function"""
+    solbinder_config = ProjectConfig.load_project_config(ctx.obj['project_path'])
+    try:
+        scenario = load_scenario(scenario_file) if scenario_file else []
+        report = run_gas_report(solbinder_config, scenario, network_name, solc_version)
+    except GasReportError as e:
+        click.secho(f"Gas report failed: {e}", fg="red")
+        ctx.exit(1)
+    _print_report(report)
+    if save_path:
+        report.save(save_path)
+    if baseline_path:
+        regressions = _print_diff(report, GasReport.load(baseline_path), threshold)
+        if regressions:
+            click.secho(f"{regressions} functions use more gas than the baseline", fg="red")
+            ctx.exit(1)
+
+
+def _print_report(report: GasReport):
+    click.echo(f"{'contract':<24} {'function':<24} {'calls':>6} {'min':>10} {'avg':>10} {'max':>10} {'estimate':>10}")
+    for contract, functions in report.get_stats().items():
+        for function, stats in functions.items():
+            estimate = "" if stats.estimate is None else stats.estimate
+            click.echo(f"{contract:<24} {function:<24} {stats.calls:>6} {stats.min:>10} {stats.avg:>10} "
+                       f"{stats.max:>10} {estimate:>10}")
+
+
+def _print_diff(report: GasReport, baseline: GasReport, threshold: float) -> int:
+    """
+    :return: Number of regressions above `threshold`
+    """
+    regressions = 0
+    for diff in report.diff(baseline):
+        if diff.status != "changed":
+            click.secho(f"{diff.contract}.{diff.function}: {diff.status}", fg="yellow")
+            continue
+        regression = diff.change > threshold
+        regressions += regression
+        change = "from zero" if math.isinf(diff.change) else f"{diff.change:+.2%}"
+        click.secho(f"{diff.contract}.{diff.function}: {diff.baseline} -> {diff.current} ({change})",
+                    fg="red" if regression else "green")
+    return regressions
@@ -0,0 +1,19 @@
+import click
+
+__all__ = ['deploy_multicall']
+
+from ..contracts.multicall import deploy_multicall as _deploy_multicall
+from ..project.config import ProjectConfig
+
+
+@click.command()
+@click.option("-u", "--account", default=None, help="blockchain account address")
+@click.option("-p", "--private-key", "private_key", default=None, help="Private Key required for transactions")
+@click.option("-s", "--solc-version", default=None, help="Sol compiler version, 0.8.0 or later")
+@click.option("-n", "--network", "network_name", default=None, help="Name of network to use")
+@click.pass_context
+def deploy_multicall(ctx, account: str, private_key: str, solc_version: str, network_name: str):
+    """Deploy the Multicall aggregator used to batch contract reads"""
+    project_config = ProjectConfig.load_project_config(ctx.obj['project_path'])
+    deployment_data = _deploy_multicall(project_config, network_name, account, private_key, solc_version)
+    click.secho(f"Deployed Multicall at {deployment_data.contract_address}", fg="green")
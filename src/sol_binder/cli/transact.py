@@ -1,9 +1,10 @@
 from typing import List, Optional
 
 import click
+from eth_account import Account
 
 from ..cli.utils import parse_arguments
-from ..contracts.instance import ContractInstance
+from ..contracts.instance import ContractInstance, ManualNonceNotSupported
 from ..project.config import ProjectConfig
 
 
@@ -12,7 +13,7 @@ from ..project.config import ProjectConfig
 @click.option("-p", "--private-key", "private_key", default=None, help="Private Key required for transactions")
 @click.option("-v", "--value", "value", default=0, help="Transaction Value")
 @click.option("-N", "--nonce", "nonce", default=None, help="Specify nonce value manually")
-@click.option("-n", "--network", "network_name", default="dev", help="Name of network to use")
+@click.option("-n", "--network", "network_name", default=None, help="Name of network to use")
 @click.argument("contract_name")
 @click.argument("function")
 @click.argument("arguments", required=False, nargs=-1)
@@ -23,21 +24,30 @@ def transact(ctx, account: str, private_key: str, value: int,
              nonce: Optional[int]):
     solbinder_config = ProjectConfig.load_project_config(ctx.obj['project_path'])
     try:
-        deployment_data = solbinder_config.get_deployment_data(contract_name)
+        deployment_data = solbinder_config.get_deployment_data(contract_name, network_name)
     except FileNotFoundError:
         click.secho(f"Contract '{contract_name}' not found", fg="red")
         exit(1)
     else:
-        contract_instance = ContractInstance.from_deployment_data(deployment_data, None, private_key)
+        contract_instance = ContractInstance.from_deployment_data(deployment_data, None, private_key=private_key,
+                                                                  w3=solbinder_config.get_w3(network_name))
+        contract_instance.fee_oracle = solbinder_config.get_fee_oracle(network_name)
         w3 = contract_instance.web3
         args = parse_arguments(arguments)
         if account is None:
-            account = w3.eth.accounts[0]
-        tx_hash = contract_instance.transact(function, func_args=args,
-                                             tx_params={'from': account, 'value': value, 'nonce': nonce})
-        tx_receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+            account = Account.from_key(private_key).address if private_key else w3.eth.accounts[0]
+        tx_args = {'from': account, 'value': value}
+        if nonce is not None:
+            tx_args['nonce'] = nonce
+        try:
+            tx_hash = contract_instance.transact(function, func_args=args, tx_args=tx_args)
+        except ManualNonceNotSupported:
+            click.secho("Setting the nonce manually is not supported, the nonce manager of the network picks it",
+                        fg="red")
+            ctx.exit(1)
+        tx_receipt = solbinder_config.get_receipt_waiter(network_name).wait_for_receipt(tx_hash)
         gas_used = w3.fromWei(
-            tx_receipt['gasUsed'] * w3.eth.gas_price,
+            tx_receipt['gasUsed'] * contract_instance.fee_oracle.get_effective_gas_price(tx_receipt),
             'ether'
         )
         click.echo(f"gas used in ETH: {gas_used}")
@@ -0,0 +1,28 @@
+from typing import *
+
+import click
+
+__all__ = ['warmup']
+
+from ..compilation.errors import CompilationError
+from ..compilation.solc_registry import get_solc_registry
+from ..project.config import ProjectConfig
+
+
+@click.command()
+@click.option("-s", "--solc-version", "extra_versions", multiple=True, help="Additional solc version to install")
+@click.pass_context
+def warmup(ctx, extra_versions: Tuple[str]):
+    """Install every solc version the project needs, so that compiling never has to go online"""
+    project_config = ProjectConfig.load_project_config(ctx.obj['project_path'])
+    specs = sorted(project_config.get_solc_versions() | set(extra_versions))
+    registry = get_solc_registry()
+    try:
+        installed = registry.warm_up(specs)
+    except CompilationError as e:
+        click.secho(f"Warm-up failed: {e}", fg="red")
+        exit(1)
+    for version in installed:
+        click.secho(f"Installed solc {version}", fg="green")
+    for spec in specs:
+        click.secho(f"{spec} -> solc {registry.resolve(spec)}", fg="yellow")
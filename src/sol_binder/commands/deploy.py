@@ -1,35 +1,152 @@
 ﻿import base64
 import hashlib
+import itertools
 import json
 import os
 from typing import *
 
 import click
 from hexbytes import HexBytes
+from web3 import Web3
 from web3.exceptions import TransactionNotFound
 
 from ..binder import SolBinder
+from ..compilation.batch import ProjectCompilation
+from ..compilation.scheduler import compile_project
 from ..commands.errors import W3ConnectionError, ContractAlreadyDeployedError, ContractDeploymentError
+from ..commands.planner import get_deployment_waves, get_dependencies, resolve_plan
 from ..contract_tool import ContractTool
-from ..project.config import ProjectConfig, ContractDeploymentData
+from ..project.config import ProjectConfig, ContractDeploymentData, ProjectContractDeployment
 
+DEFAULT_RECEIPT_TIMEOUT = 600
 
-def deploy_all(*args, solbinder_config: ProjectConfig = None,
-               on_already_deployed: Callable = None, **kwargs):
+
+def deploy_all(account: str = None, private_key: str = None, solc_version: str = None,
+               solbinder_config: ProjectConfig = None, on_already_deployed: Callable = None,
+               verbose: bool = False, force: bool = False, refresh_imports: bool = False,
+               max_workers: Optional[int] = None, pipeline: bool = False,
+               network_name: Optional[str] = None) -> Optional["DeploymentResults"]:
+    """
+    :param max_workers: Number of compiler processes, defaults to the number of cores
+    :param network_name: Network to deploy to, the default network of the project if None
+    :param pipeline: Broadcast all the deployments of a wave at once instead of waiting for each of them to be mined
+    :return: The results of every deployment, in pipeline mode
+    """
     if solbinder_config is None:
         solbinder_config = ProjectConfig.load_project_config()
-    for deployment_plan in solbinder_config.iter_deployment_plans():
+    if solc_version is None:
+        solc_version = solbinder_config.solc_version
+    deployment_plans = list(solbinder_config.iter_deployment_plans())
+    binder = SolBinder.from_project_config(solbinder_config, verbose=verbose, refresh_imports=refresh_imports)
+    compilation = compile_deployment_plans(solbinder_config, binder, deployment_plans, solc_version, max_workers)
+    # Contracts whose arguments reference other deployments are deployed after them
+    waves = get_deployment_waves(deployment_plans)
+    if pipeline:
+        return _deploy_all_pipelined(waves, compilation, binder, solbinder_config, account, private_key,
+                                     force, on_already_deployed, network_name)
+    for deployment_plan in itertools.chain.from_iterable(waves):
         try:
-            deploy_contract(deployment_plan.name, *args, **kwargs)
+            deploy_contract(deployment_plan.name, account, private_key, solc_version,
+                            solbinder_config=solbinder_config, verbose=verbose, force=force,
+                            compilation=compilation, binder=binder, network_name=network_name)
         except ContractAlreadyDeployedError:
             if not on_already_deployed:
                 raise
             on_already_deployed(deployment_plan)
 
 
+def compile_deployment_plans(solbinder_config: ProjectConfig, binder: SolBinder,
+                             deployment_plans: Iterable[ProjectContractDeployment], solc_version: Optional[str] = None,
+                             max_workers: Optional[int] = None) -> ProjectCompilation:
+    """
+    Compile the whole project at once, every deployment then takes its artifacts from the same compiler run
+    """
+    filepaths = set(solbinder_config.iterate_contract_file_paths())
+    filepaths.update(os.path.normpath(plan.filepath) for plan in deployment_plans)
+    compilation = compile_project(solbinder_config, binder, solc_version, sorted(filepaths),
+                                  solbinder_config.get_artifact_cache(), max_workers,
+                                  solbinder_config.get_build_graph())
+    _report_up_to_date(compilation)
+    return compilation
+
+
+def _deploy_all_pipelined(waves: List[List[ProjectContractDeployment]], compilation: ProjectCompilation,
+                          binder: SolBinder, solbinder_config: ProjectConfig, account: Optional[str],
+                          private_key: Optional[str], force: bool,
+                          on_already_deployed: Optional[Callable],
+                          network_name: Optional[str] = None) -> "DeploymentResults":
+    w3 = solbinder_config.get_w3(network_name)
+    if not w3.isConnected():
+        raise W3ConnectionError("Error connecting to w3")
+    chain_id = solbinder_config.get_network_info(network_name)["network_id"]
+    contract_tool = ContractTool(w3, binder.import_path, chain_id, solbinder_config.get_artifact_cache(),
+                                 solbinder_config.get_fee_oracle(network_name),
+                                 solbinder_config.get_receipt_waiter(network_name))
+    if account is None:
+        account = w3.eth.accounts[0]
+    os.makedirs(solbinder_config.deploy_cache_dir, exist_ok=True)
+    results = DeploymentResults()
+    for wave in waves:
+        # Every contract of a wave only depends on earlier waves, so the whole wave is sent at once
+        ready = []
+        for plan in wave:
+            failed_dependencies = get_dependencies(plan) & set(results.failed)
+            if failed_dependencies:
+                results.failed[plan.name] = ContractDeploymentError(
+                    f"Not deployed, its dependencies failed: {', '.join(sorted(failed_dependencies))}")
+                continue
+            try:
+                ready.append(resolve_plan(plan, get_dependency_addresses(solbinder_config, plan, results.deployed,
+                                                                         network_name)))
+            except ContractDeploymentError as e:
+                results.failed[plan.name] = e
+        wave_results = deploy_pipelined(ready, compilation, contract_tool, solbinder_config, account, private_key,
+                                        force, network_name=network_name)
+        plans_by_name = {plan.name: plan for plan in wave}
+        for name in wave_results.already_deployed:
+            if on_already_deployed:
+                on_already_deployed(plans_by_name[name])
+            else:
+                wave_results.failed[name] = ContractAlreadyDeployedError(f"Contract '{name}' already deployed!")
+        results.update(wave_results)
+    _report_results(results)
+    return results
+
+
+def get_dependency_addresses(solbinder_config: ProjectConfig, plan: ProjectContractDeployment,
+                             deployed: Optional[Dict[str, ContractDeploymentData]] = None,
+                             network_name: Optional[str] = None,
+                             planned: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    :param deployed: Deployments made in this run, the saved deployment data is used for the others
+    :param planned: Addresses the deployments that are not made yet will get, e.g. to estimate them
+    :return: The addresses of the deployments referenced by the arguments of `plan`
+    """
+    addresses = dict()
+    for name in get_dependencies(plan):
+        if deployed and name in deployed:
+            addresses[name] = deployed[name].contract_address
+            continue
+        if planned and name in planned:
+            addresses[name] = planned[name]
+            continue
+        try:
+            addresses[name] = solbinder_config.get_deployment_data(name, network_name).contract_address
+        except FileNotFoundError:
+            raise ContractDeploymentError(f"'{plan.name}' references '{name}', which must be deployed first")
+    return addresses
+
+
 def deploy_contract(contract_name: str, account: str, private_key: str, solc_version: str,
                     solbinder_config: ProjectConfig = None,
-                    verbose: bool = False, force: bool = False):
+                    verbose: bool = False, force: bool = False, refresh_imports: bool = False,
+                    compilation: Optional[ProjectCompilation] = None, binder: Optional[SolBinder] = None,
+                    network_name: Optional[str] = None):
+    """
+    :param compilation: Output of the project-wide compile stage. The contract is compiled on its own if None
+    :param binder: Binder to reuse, created from the project config if None
+    :param network_name: Network to deploy to, the default network of the project if None
+    """
     if solbinder_config is None:
         solbinder_config = ProjectConfig.load_project_config()
     deployment_cache_path = solbinder_config.deploy_cache_dir
@@ -37,43 +154,166 @@ def deploy_contract(contract_name: str, account: str, private_key: str, solc_ver
         os.makedirs(deployment_cache_path)
         # Build the constructor arguments
 
-    binder = SolBinder(verbose=verbose, import_path=solbinder_config.imports_cache_dir)
-    w3 = solbinder_config.get_w3()
-    chain_id = solbinder_config.get_network_info()["network_id"]
+    if binder is None:
+        binder = SolBinder.from_project_config(solbinder_config, verbose=verbose, refresh_imports=refresh_imports)
+    w3 = solbinder_config.get_w3(network_name)
+    chain_id = solbinder_config.get_network_info(network_name)["network_id"]
     deployment_plan = solbinder_config.get_deployment_plan(contract_name)
-    contract_args = deployment_plan.args
+    contract_args = resolve_plan(deployment_plan, get_dependency_addresses(solbinder_config, deployment_plan,
+                                                                           network_name=network_name)).args
     if not w3.isConnected():
         raise W3ConnectionError("Error connecting to w3")
-    contract_tool = ContractTool(w3, binder.import_path, chain_id)
-    with open(deployment_plan.filepath) as contract_handle:
-        source = contract_handle.read()
-    processed_source = binder.bind(source)
-
-    source_hash = ContractTool.hash_source(processed_source)
+    contract_tool = ContractTool(w3, binder.import_path, chain_id, solbinder_config.get_artifact_cache(),
+                                 solbinder_config.get_fee_oracle(network_name),
+                                 solbinder_config.get_receipt_waiter(network_name))
+    if compilation is None:
+        compilation = compile_project(solbinder_config, binder, solc_version, [deployment_plan.filepath],
+                                      solbinder_config.get_artifact_cache(), 1, solbinder_config.get_build_graph())
+        _report_up_to_date(compilation)
+    if compilation.get_error(deployment_plan.filepath):
+        raise ContractDeploymentError(compilation.get_error(deployment_plan.filepath))
+    processed_source = compilation.get_processed_source(deployment_plan.filepath)
+    compiled_contract = compilation.get_compiled_contract(deployment_plan.filepath)
 
-    try:
-        deployment_data = solbinder_config.get_deployment_data(contract_name)
-        tx_hash = HexBytes(base64.b64decode(deployment_data.tx_hash))
-        w3.eth.get_transaction_receipt(tx_hash)
-        if source_hash == deployment_data.source_hash and not force:
-            raise ContractAlreadyDeployedError(f"Contract '{contract_name}' already deployed!")
-    except FileNotFoundError:
-        pass
-    except TransactionNotFound:
-        pass
+    if not force:
+        check_not_deployed(solbinder_config, w3, contract_name, processed_source, network_name)
 
     if account is None:
         account = w3.eth.accounts[0]
     try:
         deployed_contract: ContractDeploymentData = contract_tool.deploys(
-            processed_source, account, private_key, solc_version=solc_version, args=contract_args)
+            processed_source, account, private_key, solc_version=solc_version, args=contract_args,
+            compiled_contract=compiled_contract)
     except TypeError as e:
         raise ContractDeploymentError(e)
     click.secho(f"gas used in ETH: {w3.fromWei(deployed_contract.deployment_cost_wei, 'ether')}", fg="yellow")
 
-    deployed_contract.save(
-        solbinder_config.get_deployment_filepath(contract_name)
-    )
+    solbinder_config.save_deployment_data({contract_name: deployed_contract}, network_name)
 
     click.secho(f"Deployed contract address: {deployed_contract.contract_address}", fg="green")
     return deployed_contract
+
+
+def check_not_deployed(solbinder_config: ProjectConfig, w3: Web3, contract_name: str, processed_source: str,
+                       network_name: Optional[str] = None):
+    """
+    :param w3: The web3 instance of `network_name`
+    :raises ContractAlreadyDeployedError: If the same source was already deployed under `contract_name`
+    """
+    source_hash = ContractTool.hash_source(processed_source)
+    try:
+        deployment_data = solbinder_config.get_deployment_data(contract_name, network_name)
+        tx_hash = HexBytes(base64.b64decode(deployment_data.tx_hash))
+        w3.eth.get_transaction_receipt(tx_hash)
+        if source_hash == deployment_data.source_hash:
+            raise ContractAlreadyDeployedError(f"Contract '{contract_name}' already deployed!")
+    except FileNotFoundError:
+        pass
+    except TransactionNotFound:
+        pass
+
+
+class DeploymentResults(object):
+    """Outcome of the deployment of several contracts, by deployment plan name"""
+
+    def __init__(self):
+        self.deployed: Dict[str, ContractDeploymentData] = dict()
+        self.failed: Dict[str, Exception] = dict()
+        self.already_deployed: List[str] = list()
+
+    def update(self, other: "DeploymentResults"):
+        self.deployed.update(other.deployed)
+        self.failed.update(other.failed)
+        self.already_deployed.extend(other.already_deployed)
+
+
+class _PendingDeployment(NamedTuple):
+    plan: ProjectContractDeployment
+    processed_source: str
+    compiled_contract: dict
+    transaction: dict
+
+
+def deploy_pipelined(deployment_plans: Iterable[ProjectContractDeployment], compilation: ProjectCompilation,
+                     contract_tool: ContractTool, solbinder_config: ProjectConfig, account: str,
+                     private_key: Optional[str] = None, force: bool = False,
+                     receipt_timeout: float = DEFAULT_RECEIPT_TIMEOUT,
+                     network_name: Optional[str] = None) -> DeploymentResults:
+    """
+    Deploy independent contracts without waiting for each other: consecutive nonces are reserved up front, every
+    transaction is broadcast, then all the receipts are awaited together. The deployment files are written at the
+    end, for the contracts that were deployed successfully.
+
+    :param network_name: Network of `contract_tool`, whose nonce manager and deployment manifest are used
+    """
+    w3 = contract_tool.w3
+    results = DeploymentResults()
+    # The same fees for every deployment of the batch
+    fee_params = contract_tool.fee_oracle.get_fee_params()
+    pending: List[_PendingDeployment] = []
+    for plan in deployment_plans:
+        try:
+            if compilation.get_error(plan.filepath):
+                raise ContractDeploymentError(compilation.get_error(plan.filepath))
+            processed_source = compilation.get_processed_source(plan.filepath)
+            if not force:
+                check_not_deployed(solbinder_config, w3, plan.name, processed_source, network_name)
+            compiled_contract = compilation.get_compiled_contract(plan.filepath)
+            # Build everything before reserving nonces, so that bad constructor arguments don't leave a nonce gap
+            transaction = contract_tool.build_deployment(compiled_contract, account, plan.args,
+                                                         tx_params=dict(fee_params))
+        except ContractAlreadyDeployedError:
+            results.already_deployed.append(plan.name)
+        except Exception as e:
+            results.failed[plan.name] = e
+        else:
+            pending.append(_PendingDeployment(plan, processed_source, compiled_contract, transaction))
+    if not pending:
+        return results
+
+    nonce_manager = solbinder_config.get_nonce_manager(network_name)
+    sent: Dict[HexBytes, _PendingDeployment] = dict()
+    broadcast_failed = False
+    for deployment, nonce in zip(pending, nonce_manager.reserve_nonces(account, len(pending))):
+        if broadcast_failed:
+            # Later nonces would never be mined
+            results.failed[deployment.plan.name] = ContractDeploymentError("Not sent, an earlier deployment failed")
+            continue
+        try:
+            sent[contract_tool.send_transaction(dict(deployment.transaction, nonce=nonce), private_key)] = deployment
+        except Exception as e:
+            results.failed[deployment.plan.name] = e
+            broadcast_failed = True
+    if broadcast_failed:
+        nonce_manager.sync_from_chain([account])
+
+    # All the receipts are polled together, once per block
+    receipts = contract_tool.receipt_waiter.wait_for_receipts(sent, timeout=receipt_timeout)
+    for tx_hash, deployment in sent.items():
+        tx_receipt = receipts.get(tx_hash)
+        if tx_receipt is None:
+            results.failed[deployment.plan.name] = ContractDeploymentError(
+                f"Deployment transaction {tx_hash.hex()} not confirmed after {receipt_timeout} seconds")
+            continue
+        if tx_receipt['status'] != 1:
+            results.failed[deployment.plan.name] = ContractDeploymentError(
+                f"Deployment transaction {tx_hash.hex()} reverted")
+            continue
+        results.deployed[deployment.plan.name] = contract_tool.get_deployment_data(
+            deployment.processed_source, deployment.compiled_contract, tx_receipt, account)
+
+    # A single write of the manifest for all of them
+    solbinder_config.save_deployment_data(results.deployed, network_name)
+    return results
+
+
+def _report_results(results: DeploymentResults):
+    for name, deployed_contract in sorted(results.deployed.items()):
+        click.secho(f"{name}: deployed at {deployed_contract.contract_address}", fg="green")
+    for name, error in sorted(results.failed.items()):
+        click.secho(f"{name}: deployment failed: {error}", fg="red")
+
+
+def _report_up_to_date(compilation: ProjectCompilation):
+    for unit_name in compilation.up_to_date:
+        click.secho(f"Skipped {unit_name}: up to date", fg="yellow")
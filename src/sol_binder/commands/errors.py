@@ -8,3 +8,11 @@ class ContractDeploymentError(Exception):
 
 class ContractAlreadyDeployedError(ContractDeploymentError):
     pass
+
+
+class GasReportError(Exception):
+    pass
+
+
+class DeploymentPlanError(ContractDeploymentError):
+    pass
@@ -0,0 +1,134 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import *
+
+import itertools
+
+import click
+from eth_account import Account
+from web3 import Web3
+
+from ..binder import SolBinder
+from ..commands.deploy import compile_deployment_plans, check_not_deployed, get_dependency_addresses
+from ..commands.errors import W3ConnectionError, ContractAlreadyDeployedError, ContractDeploymentError
+from ..commands.planner import get_deployment_waves, resolve_plan, get_create_address
+from ..contract_tool import ContractTool
+from ..project.config import ProjectConfig, ProjectContractDeployment
+
+MAX_ESTIMATORS = 16
+
+
+class DeploymentEstimate(object):
+    """Projected cost of the deployments of a project, by deployment plan name"""
+
+    def __init__(self, expected_gas_price: int, max_gas_price: int):
+        """
+        :param expected_gas_price: Price per gas the deployments are expected to pay, in wei
+        :param max_gas_price: Highest price per gas the deployments would accept, in wei
+        """
+        self.expected_gas_price = expected_gas_price
+        self.max_gas_price = max_gas_price
+        self.gas: Dict[str, int] = dict()
+        self.failed: Dict[str, Exception] = dict()
+        self.already_deployed: List[str] = list()
+
+    @property
+    def total_gas(self) -> int:
+        return sum(self.gas.values())
+
+    def get_cost(self, name: Optional[str] = None) -> int:
+        """
+        :return: Expected cost in wei of the deployment `name`, or of all of them
+        """
+        return (self.total_gas if name is None else self.gas[name]) * self.expected_gas_price
+
+    def get_max_cost(self, name: Optional[str] = None) -> int:
+        return (self.total_gas if name is None else self.gas[name]) * self.max_gas_price
+
+
+def estimate_all(account: Optional[str] = None, private_key: Optional[str] = None, solc_version: Optional[str] = None,
+                 solbinder_config: Optional[ProjectConfig] = None, contract_names: Optional[Iterable[str]] = None,
+                 force: bool = False, verbose: bool = False, refresh_imports: bool = False,
+                 max_workers: Optional[int] = None, network_name: Optional[str] = None) -> DeploymentEstimate:
+    """
+    Estimate the cost of deploying the project without sending anything: the constructor transactions are built
+    and their gas estimated concurrently, priced with the current fees of the network.
+    Plans referencing contracts that are not deployed yet are estimated with the addresses these would get, when
+    deployed in order from `account`. The nonce managers and the deployment files are left untouched.
+
+    :param private_key: Only used to get the account the deployments would be sent from
+    :param contract_names: Deployment plans to estimate, all of them if None
+    :param force: Also estimate the contracts that are already deployed
+    :param network_name: Network to estimate on, the default network of the project if None
+    """
+    if solbinder_config is None:
+        solbinder_config = ProjectConfig.load_project_config()
+    if solc_version is None:
+        solc_version = solbinder_config.solc_version
+    # Ordered like deploy_all, so the dependencies of a plan are checked before it
+    deployment_plans = list(itertools.chain.from_iterable(
+        get_deployment_waves(solbinder_config.iter_deployment_plans())))
+    if contract_names is not None:
+        contract_names = {solbinder_config.get_deployment_plan(name).name for name in contract_names}
+        deployment_plans = [plan for plan in deployment_plans if plan.name in contract_names]
+    binder = SolBinder.from_project_config(solbinder_config, verbose=verbose, refresh_imports=refresh_imports)
+    compilation = compile_deployment_plans(solbinder_config, binder, deployment_plans, solc_version, max_workers)
+
+    w3 = solbinder_config.get_w3(network_name)
+    if not w3.isConnected():
+        raise W3ConnectionError("Error connecting to w3")
+    chain_id = solbinder_config.get_network_info(network_name)["network_id"]
+    fee_oracle = solbinder_config.get_fee_oracle(network_name)
+    contract_tool = ContractTool(w3, binder.import_path, chain_id, solbinder_config.get_artifact_cache(), fee_oracle)
+    if account is None:
+        account = Account.from_key(private_key).address if private_key else w3.eth.accounts[0]
+    fee_params = fee_oracle.get_fee_params()
+    estimate = DeploymentEstimate(fee_oracle.get_expected_gas_price(),
+                                  fee_params.get("maxFeePerGas", fee_params.get("gasPrice")))
+
+    plans = []
+    nonce = w3.eth.get_transaction_count(account, "pending")
+    planned: Dict[str, str] = dict()
+    for plan in deployment_plans:
+        try:
+            if compilation.get_error(plan.filepath):
+                raise ContractDeploymentError(compilation.get_error(plan.filepath))
+            if not force:
+                check_not_deployed(solbinder_config, w3, plan.name, compilation.get_processed_source(plan.filepath),
+                                   network_name)
+            plans.append(resolve_plan(plan, get_dependency_addresses(solbinder_config, plan,
+                                                                     network_name=network_name, planned=planned)))
+            planned[plan.name] = get_create_address(account, nonce + len(planned))
+        except ContractAlreadyDeployedError:
+            estimate.already_deployed.append(plan.name)
+        except ContractDeploymentError as e:
+            estimate.failed[plan.name] = e
+    if not plans:
+        return estimate
+
+    def estimate_gas(plan: ProjectContractDeployment) -> int:
+        # Building the transaction without a gas limit has the node estimate it
+        return contract_tool.build_deployment(compilation.get_compiled_contract(plan.filepath), account, plan.args,
+                                              tx_params=dict(fee_params))["gas"]
+
+    with ThreadPoolExecutor(max_workers=min(len(plans), MAX_ESTIMATORS)) as executor:
+        futures = {plan.name: executor.submit(estimate_gas, plan) for plan in plans}
+        for name, future in futures.items():
+            try:
+                estimate.gas[name] = future.result()
+            except Exception as e:
+                estimate.failed[name] = e
+    return estimate
+
+
+def report_estimate(estimate: DeploymentEstimate):
+    def to_eth(wei: int) -> str:
+        return f"{Web3.fromWei(wei, 'ether')} ETH"
+
+    for name, gas in sorted(estimate.gas.items()):
+        click.echo(f"{name}: {gas} gas, {to_eth(estimate.get_cost(name))} (max {to_eth(estimate.get_max_cost(name))})")
+    for name in sorted(estimate.already_deployed):
+        click.secho(f"{name}: already deployed", fg="green")
+    for name, error in sorted(estimate.failed.items()):
+        click.secho(f"{name}: not estimated: {error}", fg="red")
+    click.secho(f"Total: {estimate.total_gas} gas at {Web3.fromWei(estimate.expected_gas_price, 'gwei')} gwei, "
+                f"{to_eth(estimate.get_cost())} (max {to_eth(estimate.get_max_cost())})", fg="yellow")
@@ -0,0 +1,195 @@
+from dataclasses import dataclass, field
+from typing import *
+
+import itertools
+import json
+import math
+import os
+
+import yaml
+from web3 import Web3
+
+from ..binder import SolBinder
+from ..commands.errors import GasReportError
+from ..commands.planner import get_deployment_waves, resolve_plan
+from ..compilation.scheduler import compile_project
+from ..contract_tool import ContractTool
+from ..project.config import ProjectConfig
+
+DEPLOYMENT = "<deployment>"  # Function name the gas used by the deployment of a contract is reported under
+
+
+@dataclass
+class ScenarioCall:
+    contract: str  # Name of the deployment plan
+    function: str
+    args: List[Any] = field(default_factory=list)
+    value: int = 0
+    repeat: int = 1
+    account: Optional[str] = None  # Defaults to the first account of the node
+
+
+def load_scenario(path: str) -> List[ScenarioCall]:
+    """
+    Load the calls of a gas report scenario. A scenario is a yaml file in the form:
+
+        calls:
+          - contract: erc-20.sol
+            function: mint
+            args: [1000]
+            repeat: 3
+    """
+    with open(path) as fh:
+        data = yaml.safe_load(fh) or dict()
+    try:
+        return [ScenarioCall(**call) for call in data.get("calls", [])]
+    except TypeError as e:
+        raise GasReportError(f"Invalid scenario {path}: {e}")
+
+
+class GasStats(NamedTuple):
+    calls: int
+    min: int
+    avg: int
+    max: int
+    estimate: Optional[int]
+
+
+class GasDiff(NamedTuple):
+    contract: str
+    function: str
+    baseline: Optional[int]  # Average gas in the baseline, None if the function is new
+    current: Optional[int]  # Average gas now, None if the function isn't in the report anymore
+
+    @property
+    def status(self) -> str:
+        """Whether the function is "new", "removed" or "changed" since the baseline"""
+        if self.baseline is None:
+            return "new"
+        if self.current is None:
+            return "removed"
+        return "changed"
+
+    @property
+    def change(self) -> Optional[float]:
+        """
+        Relative change of the average gas, e.g. 0.05 for 5% more gas than the baseline. Infinite if the baseline
+        used no gas, None if the function is new or removed
+        """
+        if self.status != "changed":
+            return None
+        if self.baseline == 0:
+            return math.inf
+        return (self.current - self.baseline) / self.baseline
+
+
+class GasReport(object):
+    """Gas used by the deployments and function calls of a project, by contract and function"""
+
+    def __init__(self, stats: Optional[Dict[str, Dict[str, GasStats]]] = None):
+        self.__gas_used: Dict[str, Dict[str, List[int]]] = dict()
+        self.__estimates: Dict[str, Dict[str, int]] = dict()
+        self.__stats = stats
+
+    def add(self, contract: str, function: str, gas_used: int, estimate: Optional[int] = None):
+        self.__stats = None
+        self.__gas_used.setdefault(contract, dict()).setdefault(function, list()).append(gas_used)
+        if estimate is not None:
+            estimates = self.__estimates.setdefault(contract, dict())
+            estimates[function] = max(estimates.get(function, 0), estimate)
+
+    def get_stats(self) -> Dict[str, Dict[str, GasStats]]:
+        if self.__stats is None:
+            self.__stats = {
+                contract: {
+                    function: GasStats(len(gas), min(gas), sum(gas) // len(gas), max(gas),
+                                       self.__estimates.get(contract, dict()).get(function))
+                    for function, gas in sorted(functions.items())
+                }
+                for contract, functions in sorted(self.__gas_used.items())
+            }
+        return self.__stats
+
+    def diff(self, baseline: "GasReport") -> List[GasDiff]:
+        """
+        :return: The functions whose average gas differs from `baseline`, including new and removed ones
+        """
+        current, previous = self.get_stats(), baseline.get_stats()
+        diffs = []
+        for contract in sorted(set(current) | set(previous)):
+            functions = current.get(contract, dict())
+            baseline_functions = previous.get(contract, dict())
+            for function in sorted(set(functions) | set(baseline_functions)):
+                avg = functions[function].avg if function in functions else None
+                baseline_avg = baseline_functions[function].avg if function in baseline_functions else None
+                if avg != baseline_avg:
+                    diffs.append(GasDiff(contract, function, baseline_avg, avg))
+        return diffs
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        data = {
+            contract: {function: stats._asdict() for function, stats in functions.items()}
+            for contract, functions in self.get_stats().items()
+        }
+        with open(path, "w") as fh:
+            json.dump(data, fh, indent=2, sort_keys=True)
+
+    @classmethod
+    def load(cls, path: str) -> "GasReport":
+        with open(path) as fh:
+            data = json.load(fh)
+        return cls({
+            contract: {function: GasStats(**stats) for function, stats in functions.items()}
+            for contract, functions in data.items()
+        })
+
+
+def run_gas_report(solbinder_config: ProjectConfig, scenario: List[ScenarioCall], network: Optional[str] = None,
+                   solc_version: Optional[str] = None) -> GasReport:
+    """
+    Deploy every deployment plan of the project and run the calls of `scenario` against a local dev chain,
+    recording the gas used by each of them.
+    The deployments are not saved, so the project's deployment files are left untouched.
+    """
+    w3 = solbinder_config.get_w3(network)
+    if not w3.isConnected():
+        raise GasReportError("Error connecting to w3")
+    if not w3.eth.accounts:
+        raise GasReportError("Gas reports need a dev chain with unlocked accounts")
+    chain_id = solbinder_config.get_network_info(network)["network_id"]
+    binder = SolBinder.from_project_config(solbinder_config)
+    deployment_plans = list(solbinder_config.iter_deployment_plans())
+    compilation = compile_project(solbinder_config, binder, solc_version,
+                                  sorted({os.path.normpath(plan.filepath) for plan in deployment_plans}),
+                                  solbinder_config.get_artifact_cache(),
+                                  build_graph=solbinder_config.get_build_graph())
+    if compilation.errors:
+        raise GasReportError(f"Compilation failed: {', '.join(sorted(compilation.errors))}")
+
+    report = GasReport()
+    contract_tool = ContractTool(w3, binder.import_path, chain_id, solbinder_config.get_artifact_cache(),
+                                 solbinder_config.get_fee_oracle(network), solbinder_config.get_receipt_waiter(network))
+    contracts = dict()
+    addresses = dict()
+    for plan in itertools.chain.from_iterable(get_deployment_waves(deployment_plans)):
+        deployment = contract_tool.deploys(compilation.get_processed_source(plan.filepath), w3.eth.accounts[0],
+                                           args=resolve_plan(plan, addresses).args,
+                                           compiled_contract=compilation.get_compiled_contract(plan.filepath))
+        report.add(plan.name, DEPLOYMENT, deployment.deployment_gas_used)
+        addresses[plan.name] = deployment.contract_address
+        contracts[plan.name] = w3.eth.contract(address=Web3.toChecksumAddress(deployment.contract_address),
+                                               abi=deployment.abi)
+
+    for call in scenario:
+        if call.contract not in contracts:
+            raise GasReportError(f"Scenario calls unknown contract '{call.contract}'")
+        function = contracts[call.contract].functions[call.function](*call.args)
+        tx_params = {"from": call.account or w3.eth.accounts[0], "value": call.value}
+        for _ in range(call.repeat):
+            estimate = function.estimateGas(tx_params)
+            receipt = contract_tool.receipt_waiter.wait_for_receipt(function.transact(tx_params))
+            if receipt["status"] != 1:
+                raise GasReportError(f"{call.contract}.{call.function} reverted")
+            report.add(call.contract, call.function, receipt["gasUsed"], estimate)
+    return report
@@ -0,0 +1,82 @@
+from typing import *
+
+import re
+
+import rlp
+from eth_utils import keccak, to_checksum_address
+
+from ..commands.errors import DeploymentPlanError
+from ..project.config import ProjectContractDeployment
+
+# "${Token.address}" references the address of the deployment named Token
+REFERENCE_RE = re.compile(r"\$\{(?P<name>[^}]+)\.address\}")
+
+
+def iter_references(value: Any) -> Iterator[str]:
+    """Yield the names of the deployments referenced anywhere in a (possibly nested) constructor argument"""
+    if isinstance(value, str):
+        for match in REFERENCE_RE.finditer(value):
+            yield match.group("name")
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from iter_references(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from iter_references(item)
+
+
+def resolve_references(value: Any, addresses: Dict[str, str]) -> Any:
+    """
+    Replace the references in a constructor argument with the addresses of the deployments
+
+    :param addresses: Address of every referenced deployment by name
+    """
+    if isinstance(value, str):
+        match = REFERENCE_RE.fullmatch(value)
+        if match:
+            return addresses[match.group("name")]
+        return REFERENCE_RE.sub(lambda m: addresses[m.group("name")], value)
+    if isinstance(value, (list, tuple)):
+        return type(value)(resolve_references(item, addresses) for item in value)
+    if isinstance(value, dict):
+        return {key: resolve_references(item, addresses) for key, item in value.items()}
+    return value
+
+
+def resolve_plan(plan: ProjectContractDeployment, addresses: Dict[str, str]) -> ProjectContractDeployment:
+    return plan._replace(args=resolve_references(plan.args, addresses))
+
+
+def get_dependencies(plan: ProjectContractDeployment) -> Set[str]:
+    return set(iter_references(plan.args))
+
+
+def get_create_address(sender: str, nonce: int) -> str:
+    """The address of the contract deployed by the transaction of `sender` with `nonce`"""
+    return to_checksum_address(keccak(rlp.encode([bytes.fromhex(sender[2:]), nonce]))[12:])
+
+
+def get_deployment_waves(
+        deployment_plans: Iterable[ProjectContractDeployment]) -> List[List[ProjectContractDeployment]]:
+    """
+    Order deployment plans by the references between their arguments. Every plan only depends on plans of earlier
+    waves, so the plans of a wave can all be deployed at once.
+
+    :raises DeploymentPlanError: If a plan references an unknown deployment, or if the references form a cycle
+    """
+    plans = {plan.name: plan for plan in deployment_plans}
+    dependencies = {name: get_dependencies(plan) for name, plan in plans.items()}
+    for name, plan_dependencies in dependencies.items():
+        unknown = plan_dependencies - set(plans)
+        if unknown:
+            raise DeploymentPlanError(f"'{name}' references unknown deployments: {', '.join(sorted(unknown))}")
+    waves = []
+    done: Set[str] = set()
+    while len(done) < len(plans):
+        wave = [name for name in plans if name not in done and dependencies[name] <= done]
+        if not wave:
+            cycle = sorted(set(plans) - done)
+            raise DeploymentPlanError(f"Circular references between deployments: {', '.join(cycle)}")
+        waves.append([plans[name] for name in wave])
+        done.update(wave)
+    return waves
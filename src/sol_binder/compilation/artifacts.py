@@ -0,0 +1,146 @@
+from threading import Lock
+from typing import *
+
+import hashlib
+import json
+import os
+
+import solcx
+
+from ..solbinder_logging import get_solbinder_logger
+
+DEFAULT_MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+# compile_source arguments that don't affect the compiler output
+_NON_OUTPUT_ARGS = frozenset(["allow_paths", "base_path", "solc_binary"])
+
+
+class ArtifactCache(object):
+    """
+    On-disk cache of compiler outputs (ABI, bytecode, metadata...), keyed by the processed source, the hashes of the
+    files it imports, the solc version and the compiler settings.
+
+    The cache is bounded by size, least recently used entries are evicted first. The size is tallied as entries are
+    put, the cache directory is only scanned on the first put and when the size goes over the bound.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.__lock = Lock()
+        self.__total_bytes: Optional[int] = None  # Size of the entries, unknown until the directory is scanned
+
+    @staticmethod
+    def get_key(source: str, solc_version: Any, settings: Optional[Dict[str, Any]] = None,
+                imports: Optional[Dict[str, str]] = None) -> str:
+        """
+        :param imports: Hash of every file in the import graph of `source` by url, as in `BindResult.imports`. The
+                        compiler reads them from disk, so the output of a source changes with them
+        """
+        key_data = json.dumps({"source": source, "solc_version": str(solc_version), "settings": settings or dict(),
+                               "imports": imports or dict()}, sort_keys=True, default=str)
+        return hashlib.sha256(key_data.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry_path = self.__get_entry_path(key)
+        try:
+            with open(entry_path) as fh:
+                artifacts = json.load(fh)
+        except (FileNotFoundError, ValueError):
+            with self.__lock:
+                self.misses += 1
+            return None
+        # Mark as recently used
+        os.utime(entry_path)
+        with self.__lock:
+            self.hits += 1
+        return artifacts
+
+    def put(self, key: str, artifacts: Dict[str, Any]):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry_path = self.__get_entry_path(key)
+        tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as fh:
+            json.dump(artifacts, fh)
+        size = os.path.getsize(tmp_path)
+        try:
+            replaced_size = os.path.getsize(entry_path)
+        except FileNotFoundError:
+            replaced_size = 0
+        os.replace(tmp_path, entry_path)
+        with self.__lock:
+            if self.__total_bytes is not None:
+                self.__total_bytes += size - replaced_size
+            needs_eviction = self.__total_bytes is None or self.__total_bytes > self.max_bytes
+        if needs_eviction:
+            self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in `max_bytes`"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+        with self.__lock:
+            self.__total_bytes = total_bytes
+
+    def compile_source(self, source: str, solc_version: Any, imports: Optional[Dict[str, str]] = None,
+                       **kwargs) -> Dict[str, Any]:
+        """
+        Cached `solcx.compile_source`
+
+        :param imports: Hashes of the import graph of `source`, see `get_key`
+        """
+        settings = {k: v for k, v in kwargs.items() if k not in _NON_OUTPUT_ARGS}
+        key = self.get_key(source, solc_version, settings, imports)
+        compiled = self.get(key)
+        if compiled is not None:
+            get_solbinder_logger().info(f"Artifact cache hit: {key[:12]}")
+            return compiled
+        get_solbinder_logger().info(f"Artifact cache miss: {key[:12]}, compiling")
+        compiled = solcx.compile_source(source, solc_version=solc_version, **kwargs)
+        self.put(key, compiled)
+        return compiled
+
+    @classmethod
+    def get_standard_key(cls, input_data: Dict[str, Any], solc_version: Any, imports: Optional[Dict[str, str]] = None,
+                         **kwargs) -> str:
+        """
+        Key of the output of `solcx.compile_standard`
+
+        :param imports: Hashes of the import graphs of all the sources of `input_data`, see `get_key`
+        """
+        settings = {k: v for k, v in kwargs.items() if k not in _NON_OUTPUT_ARGS}
+        settings["standard_json"] = True
+        return cls.get_key(json.dumps(input_data, sort_keys=True), solc_version, settings, imports)
+
+    def compile_standard(self, input_data: Dict[str, Any], solc_version: Any, imports: Optional[Dict[str, str]] = None,
+                         **kwargs) -> Dict[str, Any]:
+        """Cached `solcx.compile_standard`"""
+        key = self.get_standard_key(input_data, solc_version, imports, **kwargs)
+        output = self.get(key)
+        if output is not None:
+            get_solbinder_logger().info(f"Artifact cache hit: {key[:12]}")
+            return output
+        get_solbinder_logger().info(f"Artifact cache miss: {key[:12]}, compiling")
+        output = solcx.compile_standard(input_data, solc_version=solc_version, **kwargs)
+        self.put(key, output)
+        return output
+
+    def get_stats(self) -> str:
+        return f"artifact cache: {self.hits} hits, {self.misses} misses"
+
+    def __get_entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
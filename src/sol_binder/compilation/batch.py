@@ -0,0 +1,77 @@
+from typing import *
+
+import os
+
+# Standard-JSON outputs -> the keys `solcx.compile_source` uses for them
+OUTPUT_KEYS = {
+    "abi": ("abi",),
+    "bin": ("evm", "bytecode", "object"),
+    "bin-runtime": ("evm", "deployedBytecode", "object"),
+    "metadata": ("metadata",),
+}
+OUTPUT_SELECTION = ["abi", "evm.bytecode.object", "evm.deployedBytecode.object", "metadata"]
+
+
+def get_source_unit_name(filepath: str) -> str:
+    return os.path.normpath(os.path.abspath(filepath))
+
+
+class ProjectCompilation(object):
+    """The processed sources of a project and the compiler output of all of them"""
+
+    def __init__(self, processed_sources: Dict[str, str], output: Dict[str, Any],
+                 errors: Optional[Dict[str, str]] = None, up_to_date: Optional[List[str]] = None):
+        """
+        :param processed_sources: Bound source of every contract file, by source unit name
+        :param output: solc standard-JSON output
+        :param errors: Compilation errors by source unit name, for the files that failed to compile
+        :param up_to_date: Source unit names of the files that were not compiled again, as nothing they depend on
+                           changed since their last compilation
+        """
+        self.processed_sources = processed_sources
+        self.output = output
+        self.errors = errors or dict()
+        self.up_to_date = up_to_date or list()
+
+    def __contains__(self, filepath: str) -> bool:
+        """Whether `filepath` was compiled successfully"""
+        unit_name = get_source_unit_name(filepath)
+        return unit_name in self.processed_sources and unit_name not in self.errors
+
+    def get_error(self, filepath: str) -> Optional[str]:
+        return self.errors.get(get_source_unit_name(filepath))
+
+    def get_processed_source(self, filepath: str) -> str:
+        return self.processed_sources[get_source_unit_name(filepath)]
+
+    def get_compiled_contract(self, filepath: str) -> Dict[str, Dict[str, Any]]:
+        """
+        :return: The contracts defined in `filepath`, in the same format (and order) as `solcx.compile_source`
+        """
+        unit_name = get_source_unit_name(filepath)
+        contracts = self.output.get("contracts", dict()).get(unit_name, dict())
+        return {
+            f"{unit_name}:{name}": self.__convert_contract(contracts[name]) for name in sorted(contracts)
+        }
+
+    @staticmethod
+    def __convert_contract(contract: Dict[str, Any]) -> Dict[str, Any]:
+        converted = dict()
+        for key, output_path in OUTPUT_KEYS.items():
+            value = contract
+            for part in output_path:
+                value = value.get(part, dict())
+            converted[key] = value
+        return converted
+
+
+def get_standard_input(processed_sources: Dict[str, str],
+                       settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    :param settings: Compiler settings, e.g. {"optimizer": {"enabled": True, "runs": 200}}
+    """
+    return {
+        "language": "Solidity",
+        "sources": {unit_name: {"content": source} for unit_name, source in sorted(processed_sources.items())},
+        "settings": dict(settings or dict(), outputSelection={"*": {"*": OUTPUT_SELECTION}}),
+    }
@@ -0,0 +1,92 @@
+from dataclasses import dataclass, field, asdict
+from typing import *
+
+import hashlib
+import json
+import os
+
+from filelock import FileLock
+
+BUILD_GRAPH_VERSION = 1
+
+
+@dataclass
+class BuildTarget:
+    fingerprint: str  # Hash of everything the compiler output depends on, also the artifact cache key of the output
+    solc_version: str
+    imports: Dict[str, str] = field(default_factory=dict)  # Hash of every file in the import closure by url
+
+    @staticmethod
+    def get_fingerprint(processed_source: str, imports: Dict[str, str], solc_version: str,
+                        settings: Dict[str, Any]) -> str:
+        data = json.dumps({
+            "version": BUILD_GRAPH_VERSION,
+            "source": processed_source,
+            "imports": imports,
+            "solc_version": solc_version,
+            "settings": settings,
+        }, sort_keys=True)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+
+class BuildGraph(object):
+    """
+    The import graph of the contracts of a project, as of their last successful compilation.
+
+    Every contract (target) is stored with the hashes of all the files it imports, directly or not, so a contract
+    only has to be compiled again if one of the files of its closure, its compiler or its settings changed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.targets: Dict[str, BuildTarget] = self.__read()
+
+    def get(self, unit_name: str) -> Optional[BuildTarget]:
+        return self.targets.get(unit_name)
+
+    def is_up_to_date(self, unit_name: str, fingerprint: str) -> bool:
+        target = self.get(unit_name)
+        return target is not None and target.fingerprint == fingerprint
+
+    def get_dependents(self, url: str) -> List[str]:
+        """
+        :return: The targets that import `url`, directly or not
+        """
+        return sorted(unit_name for unit_name, target in self.targets.items() if url in target.imports)
+
+    def update(self, targets: Dict[str, BuildTarget], removed: Iterable[str] = ()):
+        """
+        Merge `targets` into the graph file, keeping targets written by other processes in the meantime
+
+        :param removed: Targets that are not up to date anymore, e.g. because they failed to compile
+        """
+        removed = [unit_name for unit_name in removed if unit_name in self.targets]
+        if not removed and all(self.targets.get(name) == target for name, target in targets.items()):
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with FileLock(f"{self.path}.filelock"):
+            self.targets = self.__read()
+            self.targets.update(targets)
+            for unit_name in removed:
+                self.targets.pop(unit_name, None)
+            self.__write()
+
+    def __read(self) -> Dict[str, BuildTarget]:
+        try:
+            with open(self.path) as fh:
+                data = json.load(fh)
+        except (FileNotFoundError, ValueError):
+            return dict()
+        if data.get("version") != BUILD_GRAPH_VERSION:
+            return dict()
+        return {unit_name: BuildTarget(**target) for unit_name, target in data["targets"].items()}
+
+    def __write(self):
+        data = {
+            "version": BUILD_GRAPH_VERSION,
+            "targets": {unit_name: asdict(target) for unit_name, target in self.targets.items()},
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as fh:
+            json.dump(data, fh, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
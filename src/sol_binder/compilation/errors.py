@@ -0,0 +1,6 @@
+class CompilationError(Exception):
+    pass
+
+
+class SolcNotInstalledError(CompilationError):
+    pass
@@ -0,0 +1,205 @@
+from concurrent.futures import ProcessPoolExecutor, Future, FIRST_COMPLETED, wait
+from typing import *
+
+import json
+import os
+
+import solcx
+from solcx.exceptions import SolcError, SolcNotInstalled
+
+from ..solbinder_logging import get_solbinder_logger
+from .artifacts import ArtifactCache
+from .batch import ProjectCompilation, get_source_unit_name, get_standard_input
+from .build_graph import BuildGraph, BuildTarget
+from .errors import SolcNotInstalledError
+from .solc_registry import SolcRegistry, get_solc_registry
+
+if TYPE_CHECKING:
+    from ..binder import SolBinder
+    from ..project.config import ProjectConfig
+
+
+class CompileJob(NamedTuple):
+    solc_version: str
+    settings: Dict[str, Any]
+    unit_names: List[str]
+
+
+def _compile_job(input_data: Dict[str, Any], solc_version: str,
+                 allow_paths: List[str]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Runs in a worker process. Errors are returned as text, solc exceptions don't always survive pickling"""
+    try:
+        return solcx.compile_standard(input_data, solc_version=solc_version, allow_paths=allow_paths), None
+    except SolcError as e:
+        return None, e.message
+    except SolcNotInstalled as e:
+        return None, str(e)
+
+
+class CompileScheduler(object):
+    """
+    Compiles the contracts of a project in a pool of processes.
+
+    Contracts are grouped by compiler version and settings, every group is compiled by a single standard-JSON solc
+    run so that their shared imports are only parsed once. When there are more workers than groups, groups are split
+    so that every core gets a share of the work. If a run fails, its contracts are compiled one by one to tell which
+    of them are broken, so errors are reported per contract.
+
+    With a build graph, only the contracts whose import closure changed since their last compilation are compiled.
+    """
+
+    def __init__(self, project_config: "ProjectConfig", binder: "SolBinder", max_workers: Optional[int] = None,
+                 artifact_cache: Optional[ArtifactCache] = None, solc_registry: Optional[SolcRegistry] = None,
+                 build_graph: Optional[BuildGraph] = None):
+        """
+        :param max_workers: Number of compiler processes, defaults to the number of cores
+        :param artifact_cache: Cache of the compiler output, if any
+        :param solc_registry: Resolves the solc versions of the contracts, defaults to the shared registry
+        :param build_graph: Import graph of the last build. Contracts whose import closure didn't change since are
+                            not compiled again. Requires `artifact_cache`
+        """
+        self.project_config = project_config
+        self.binder = binder
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.artifact_cache = artifact_cache
+        self.solc_registry = solc_registry or get_solc_registry()
+        self.build_graph = build_graph
+
+    def compile(self, filepaths: Optional[Iterable[str]] = None,
+                solc_version: Optional[str] = None) -> ProjectCompilation:
+        """
+        :param filepaths: Contract files to compile. Defaults to every contract in `contracts_dir`
+        :param solc_version: Version for the contracts that don't override it, defaults to the project's
+        """
+        if filepaths is None:
+            filepaths = self.project_config.iterate_contract_file_paths()
+        processed_sources = dict()
+        errors: Dict[str, str] = dict()
+        targets: Dict[str, BuildTarget] = dict()
+        up_to_date: Dict[str, Dict[str, Any]] = dict()
+        groups: Dict[Tuple[str, str], List[str]] = dict()
+        for filepath in filepaths:
+            unit_name = get_source_unit_name(filepath)
+            with open(filepath) as fh:
+                bind_result = self.binder.bind_with_imports(fh.read())
+            processed_sources[unit_name] = bind_result.source
+            version_spec, settings = self.project_config.get_compiler_config(filepath, solc_version)
+            try:
+                # Specifiers resolving to the same compiler end up in the same group
+                version = self.solc_registry.resolve(version_spec)
+            except SolcNotInstalledError as e:
+                errors[unit_name] = str(e)
+                continue
+            fingerprint = BuildTarget.get_fingerprint(bind_result.source, bind_result.imports, version, settings)
+            targets[unit_name] = BuildTarget(fingerprint, version, bind_result.imports)
+            cached = self.__get_up_to_date_output(unit_name, fingerprint)
+            if cached is not None:
+                up_to_date[unit_name] = cached
+                continue
+            groups.setdefault((version, json.dumps(settings, sort_keys=True)), list()).append(unit_name)
+        jobs = [
+            CompileJob(version, json.loads(settings), chunk)
+            for (version, settings), unit_names in sorted(groups.items())
+            for chunk in self.__split(sorted(unit_names), max(1, self.max_workers // len(groups)))
+        ]
+        get_solbinder_logger().info(f"Compiling {len(processed_sources) - len(up_to_date)} contract files "
+                                    f"in {len(jobs)} jobs, {len(up_to_date)} up to date")
+        output, job_errors = self.__run(jobs, processed_sources, targets)
+        errors.update(job_errors)
+        for unit_name, contracts in up_to_date.items():
+            output["contracts"][unit_name] = contracts
+        self.__update_build_graph(targets, output, errors, up_to_date)
+        return ProjectCompilation(processed_sources, output, errors, sorted(up_to_date))
+
+    def __get_up_to_date_output(self, unit_name: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        :return: The compiled contracts of `unit_name` if nothing in its import closure changed since it was compiled
+        """
+        if self.build_graph is None or self.artifact_cache is None:
+            return None
+        if not self.build_graph.is_up_to_date(unit_name, fingerprint):
+            return None
+        return self.artifact_cache.get(fingerprint)
+
+    def __update_build_graph(self, targets: Dict[str, BuildTarget], output: Dict[str, Any], errors: Dict[str, str],
+                             up_to_date: Dict[str, Dict[str, Any]]):
+        if self.build_graph is None or self.artifact_cache is None:
+            return
+        compiled = dict()
+        for unit_name, target in targets.items():
+            if unit_name in errors or unit_name in up_to_date:
+                continue
+            # Keep the output of every target on its own, so it can be reused without the rest of its job
+            self.artifact_cache.put(target.fingerprint, output["contracts"].get(unit_name, dict()))
+            compiled[unit_name] = target
+        self.build_graph.update(compiled, removed=errors)
+
+    def __run(self, jobs: List[CompileJob], processed_sources: Dict[str, str],
+              targets: Dict[str, BuildTarget]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        output = {"contracts": dict(), "errors": list()}
+        errors: Dict[str, str] = dict()
+        pending: Dict[Future, Tuple[CompileJob, str]] = dict()
+
+        def collect(job_output: Dict[str, Any]):
+            output["contracts"].update(job_output.get("contracts", dict()))
+            output["errors"].extend(job_output.get("errors", list()))
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            def submit(job: CompileJob):
+                input_data = get_standard_input({name: processed_sources[name] for name in job.unit_names},
+                                                job.settings)
+                key = None
+                if self.artifact_cache is not None:
+                    # solc reads the imports from disk, the input alone doesn't tell if they changed
+                    imports = dict()
+                    for unit_name in job.unit_names:
+                        imports.update(targets[unit_name].imports)
+                    key = self.artifact_cache.get_standard_key(input_data, job.solc_version, imports)
+                    cached = self.artifact_cache.get(key)
+                    if cached is not None:
+                        collect(cached)
+                        return
+                future = executor.submit(_compile_job, input_data, job.solc_version, self.binder.allow_paths)
+                pending[future] = (job, key)
+
+            try:
+                for job in jobs:
+                    submit(job)
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        job, key = pending.pop(future)
+                        job_output, error = future.result()
+                        if job_output is not None:
+                            if key is not None:
+                                self.artifact_cache.put(key, job_output)
+                            collect(job_output)
+                        elif len(job.unit_names) > 1:
+                            # Find out which of the contracts failed
+                            for unit_name in job.unit_names:
+                                submit(CompileJob(job.solc_version, job.settings, [unit_name]))
+                        else:
+                            get_solbinder_logger().error(f"Compiling {job.unit_names[0]} failed")
+                            errors[job.unit_names[0]] = error
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+        return output, errors
+
+    @staticmethod
+    def __split(unit_names: List[str], chunks: int) -> List[List[str]]:
+        chunks = min(chunks, len(unit_names))
+        return [unit_names[i::chunks] for i in range(chunks)]
+
+
+def compile_project(project_config: "ProjectConfig", binder: "SolBinder", solc_version: Optional[str] = None,
+                    filepaths: Optional[Iterable[str]] = None, artifact_cache: Optional[ArtifactCache] = None,
+                    max_workers: Optional[int] = None, build_graph: Optional[BuildGraph] = None) -> ProjectCompilation:
+    """
+    Bind every contract of the project and compile them, with a single standard-JSON solc run per compiler version
+    and settings when `max_workers` is 1
+
+    :param filepaths: Contract files to compile. Defaults to every contract in `contracts_dir`
+    """
+    scheduler = CompileScheduler(project_config, binder, max_workers, artifact_cache, build_graph=build_graph)
+    return scheduler.compile(filepaths, solc_version)
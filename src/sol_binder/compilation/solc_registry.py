@@ -0,0 +1,130 @@
+from threading import Lock
+from typing import *
+
+import os
+
+import solcx
+from semantic_version import NpmSpec, Version
+
+from ..solbinder_logging import get_solbinder_logger
+from .errors import CompilationError, SolcNotInstalledError
+
+LATEST = "latest"
+
+
+class SolcRegistry(object):
+    """
+    Resolves solc version specifiers ("latest", "0.8.6", "^0.8", ">=0.7.0 <0.9.0"...) against the compilers installed
+    locally.
+
+    Resolving never touches the network. Missing compilers are installed ahead of time with `warm_up`.
+    """
+
+    def __init__(self, install_folder: Optional[str] = None):
+        """
+        :param install_folder: Where solc binaries are installed, defaults to the py-solc-x install folder
+        """
+        self.install_folder = install_folder
+        self.__lock = Lock()
+        self.__installed: Optional[List[Version]] = None
+        self.__resolved: Dict[str, str] = dict()
+
+    def get_installed_versions(self) -> List[Version]:
+        """Installed versions, newest first"""
+        with self.__lock:
+            if self.__installed is None:
+                folder = solcx.get_solcx_install_folder(self.install_folder)
+                names = os.listdir(folder) if os.path.isdir(folder) else []
+                versions = [self.parse_version(name[len("solc-v"):]) for name in names if name.startswith("solc-v")]
+                self.__installed = sorted((v for v in versions if v is not None), reverse=True)
+            return self.__installed
+
+    def refresh(self):
+        """Forget the installed versions, e.g. after installing a compiler outside of the registry"""
+        with self.__lock:
+            self.__installed = None
+            self.__resolved.clear()
+
+    def resolve(self, spec: Any) -> str:
+        """
+        :param spec: Version specifier, or a `Version`
+        :return: The newest installed version matching `spec`
+        :raises SolcNotInstalledError: If no installed version matches
+        """
+        spec = str(spec).strip()
+        with self.__lock:
+            if spec in self.__resolved:
+                return self.__resolved[spec]
+        version = self.select(spec, self.get_installed_versions())
+        if version is None:
+            raise SolcNotInstalledError(f"No installed solc matches '{spec}', run `sol-binder warmup` to install it")
+        with self.__lock:
+            self.__resolved[spec] = str(version)
+        return str(version)
+
+    def get_executable(self, spec: Any) -> str:
+        return str(solcx.install.get_executable(self.resolve(spec), self.install_folder))
+
+    def warm_up(self, specs: Iterable[Any]) -> List[str]:
+        """
+        Install the newest version matching every specifier that doesn't match an installed version yet.
+        This is the only method that uses the network, and only if something is missing.
+
+        :return: The installed versions
+        """
+        missing = []
+        for spec in specs:
+            spec = str(spec).strip()
+            if self.select(spec, self.get_installed_versions()) is None:
+                missing.append(spec)
+        if not missing:
+            return []
+        installable = [self.parse_version(str(v)) for v in solcx.get_installable_solc_versions()]
+        installable = sorted((v for v in installable if v is not None), reverse=True)
+        installed = []
+        for spec in missing:
+            version = self.select(spec, installable)
+            if version is None:
+                raise SolcNotInstalledError(f"No solc release matches '{spec}'")
+            if str(version) not in installed:
+                get_solbinder_logger().info(f"Installing solc {version}")
+                solcx.install_solc(str(version), solcx_binary_path=self.install_folder)
+                installed.append(str(version))
+        self.refresh()
+        return installed
+
+    @classmethod
+    def select(cls, spec: str, versions: List[Version]) -> Optional[Version]:
+        """
+        :param versions: Candidate versions, newest first
+        :return: The newest of `versions` matching `spec`
+        """
+        if spec == LATEST:
+            return versions[0] if versions else None
+        exact = cls.parse_version(spec)
+        if exact is not None:
+            return exact if exact in versions else None
+        try:
+            return NpmSpec(spec).select(versions)
+        except ValueError:
+            raise CompilationError(f"Invalid solc version specifier: '{spec}'")
+
+    @staticmethod
+    def parse_version(version: str) -> Optional[Version]:
+        try:
+            return Version(version.lstrip("v"))
+        except ValueError:
+            return None
+
+
+_shared_registry: Optional[SolcRegistry] = None
+_shared_registry_lock = Lock()
+
+
+def get_solc_registry() -> SolcRegistry:
+    """The registry of the default py-solc-x install folder, shared by the whole process"""
+    global _shared_registry
+    with _shared_registry_lock:
+        if _shared_registry is None:
+            _shared_registry = SolcRegistry()
+        return _shared_registry
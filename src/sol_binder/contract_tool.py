@@ -8,8 +8,13 @@ import os
 
 from web3 import Web3
 from solcx import compile_source
-from web3.types import TxReceipt
+from hexbytes import HexBytes
+from web3.types import TxParams, TxReceipt
 
+from .compilation.artifacts import ArtifactCache
+from .compilation.solc_registry import get_solc_registry
+from .fee_oracle import FeeOracle
+from .receipt_waiter import ReceiptWaiter
 from .project.config import ContractDeploymentData
 
 
@@ -21,20 +26,52 @@ def contract_folder() -> str:
 
 
 class ContractTool(object):
-    def __init__(self, w3: Web3, import_path: str, chain_id: int):
+    def __init__(self, w3: Web3, import_path: str, chain_id: int, artifact_cache: Optional[ArtifactCache] = None,
+                 fee_oracle: Optional[FeeOracle] = None, receipt_waiter: Optional[ReceiptWaiter] = None):
         self.import_path = import_path
         self.w3 = w3
         self.chain_id = chain_id
+        self.artifact_cache = artifact_cache
+        self.fee_oracle = fee_oracle or FeeOracle(w3)
+        self.receipt_waiter = receipt_waiter if receipt_waiter is not None else ReceiptWaiter(w3)
 
     def __get_default_account(self):
         return self.w3.eth.accounts[0]
 
-    def _compiles(self, source, solc_version='latest') -> dict:
+    def _compiles(self, source, solc_version='latest', imports: Optional[Dict[str, str]] = None) -> dict:
+        """
+        :param imports: Hashes of the import graph of `source` (`BindResult.imports`), part of the artifact cache key
+        """
+        solc_version = get_solc_registry().resolve(solc_version)
+        if self.artifact_cache is not None:
+            return self.artifact_cache.compile_source(source, solc_version=solc_version, imports=imports,
+                                                      allow_paths=self.import_path)
         compiled_contract = compile_source(source,
                                            solc_version=solc_version,
                                            allow_paths=self.import_path)
         return compiled_contract
 
+    def build_deployment(self, compiled_contract: dict, account_address: str, args: Sequence = (),
+                         kwargs: Optional[dict] = None, tx_params: Optional[dict] = None) -> TxParams:
+        """
+        Build (but don't send) the transaction deploying the last contract of `compiled_contract`
+
+        :param tx_params: Overrides of the transaction parameters, e.g. the nonce
+        """
+        contract_id, contract_interface = list(compiled_contract.items())[-1]
+        contract_base = self.w3.eth.contract(abi=contract_interface['abi'], bytecode=contract_interface['bin'])
+        trans_data = {'chainId': self.chain_id, 'from': account_address}
+        trans_data.update(tx_params or dict())
+        self.fee_oracle.fill_fee_params(trans_data)
+        return contract_base.constructor(*args, **(kwargs or dict())).buildTransaction(trans_data)
+
+    def send_transaction(self, transaction: TxParams, private_key: Optional[str] = None) -> HexBytes:
+        """Sign `transaction` with `private_key` and broadcast it, or send it from an unlocked account"""
+        if private_key:
+            signed_transaction = self.w3.eth.account.sign_transaction(transaction, private_key=private_key)
+            return self.w3.eth.send_raw_transaction(signed_transaction.rawTransaction)
+        return self.w3.eth.send_transaction(transaction)
+
     def _deploy_compiled(self, compiled_contract: dict, account_address: Optional[str] = None,
                          private_key: Optional[str] = None, nonce: Optional[int] = None,
                          *contructor_args, **kwargs) -> TxReceipt:
@@ -50,21 +87,10 @@ class ContractTool(object):
         if nonce is None:
             nonce = self.w3.eth.get_transaction_count(account_address)
 
-        contract_id, contract_interface = list(compiled_contract.items())[-1]
-        abi = contract_interface['abi']
-        contract_bytecode = contract_interface['bin']
-        contract_base = self.w3.eth.contract(abi=abi, bytecode=contract_bytecode)
-
-        trans_data = {'gasPrice': self.w3.eth.gas_price, 'chainId': self.chain_id, 'from': account_address,
-                      'nonce': nonce}
-        if private_key:
-
-            transaction = contract_base.constructor(*contructor_args, **kwargs).buildTransaction(trans_data)
-            signed_transaction = self.w3.eth.account.sign_transaction(transaction, private_key=private_key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_transaction.rawTransaction)
-        else:
-            tx_hash = contract_base.constructor(*contructor_args, **kwargs).transact(trans_data)
-        tx_receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        transaction = self.build_deployment(compiled_contract, account_address, contructor_args, kwargs,
+                                            {'nonce': nonce})
+        tx_hash = self.send_transaction(transaction, private_key)
+        tx_receipt = self.receipt_waiter.wait_for_receipt(tx_hash)
 
         return tx_receipt
 
@@ -82,27 +108,43 @@ class ContractTool(object):
         return self.deploys(source, account_address, *args, **kwargs)
 
     def deploys(self, source: str, account_address: Optional[str] = None, private_key: Optional[str] = None,
-                solc_version: str = "latest", args: list = None, kwargs: dict = None) -> ContractDeploymentData:
-
+                solc_version: str = "latest", args: list = None, kwargs: dict = None,
+                compiled_contract: Optional[dict] = None,
+                imports: Optional[Dict[str, str]] = None) -> ContractDeploymentData:
+        """
+        :param compiled_contract: Compiler output of `source`, if it was already compiled (e.g. with the whole project)
+        :param imports: Hashes of the import graph of `source`, to tell cached compiler outputs apart when it is
+                        compiled here
+        """
         if kwargs is None:
             kwargs = dict()
         if args is None:
             args = list()
-        compiled_contract = self._compiles(source, solc_version=solc_version)
-        contract_id, contract_interface = list(compiled_contract.items())[-1]
-        abi = contract_interface['abi']
+        if compiled_contract is None:
+            compiled_contract = self._compiles(source, solc_version=solc_version, imports=imports)
         tx_receipt: TxReceipt = self._deploy_compiled(compiled_contract, account_address, private_key, None, *args,
                                                       **kwargs)
+        return self.get_deployment_data(source, compiled_contract, tx_receipt, account_address)
 
+    def get_deployment_data(self, source: str, compiled_contract: dict, tx_receipt: TxReceipt,
+                            account_address: Optional[str] = None,
+                            gas_price: Optional[int] = None) -> ContractDeploymentData:
+        """
+        :param gas_price: Gas price of the deployment transaction, taken from the receipt if None
+        """
+        contract_id, contract_interface = list(compiled_contract.items())[-1]
+        if gas_price is None:
+            gas_price = self.fee_oracle.get_effective_gas_price(tx_receipt)
         return ContractDeploymentData(
-            abi=abi,
+            abi=contract_interface['abi'],
             contract_address=tx_receipt['contractAddress'],
             tx_hash=base64.b64encode(bytes(tx_receipt['transactionHash'])).decode(),
             account=account_address,
             chain_id=self.chain_id,
             w3_url=self.w3.manager.provider.endpoint_uri,
             source_hash=self.hash_source(source),
-            deployment_cost_wei=tx_receipt['gasUsed'] * self.w3.eth.gas_price,
+            deployment_cost_wei=tx_receipt['gasUsed'] * gas_price,
+            deployment_gas_used=tx_receipt['gasUsed'],
         )
 
     @classmethod
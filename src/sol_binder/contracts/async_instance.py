@@ -0,0 +1,165 @@
+import asyncio
+from logging import Logger
+from typing import *
+
+from eth_typing import HexAddress, BlockIdentifier
+from hexbytes import HexBytes
+from web3 import Web3
+from web3._utils.filters import construct_event_filter_params
+from web3.contract import Contract, ContractFunction
+from web3.types import TxParams, EventData, TxReceipt
+
+from ..contracts.codec import encode_function_call, decode_function_result
+from ..contracts.instance import ContractInstancingError, ManualNonceNotSupported, TransactionBuildError, \
+    TransactionExecutionError, ToBlock
+from ..fee_oracle import AsyncFeeOracle
+from ..nonce.async_memory import AsyncMemoryNonceManager
+from ..project.config import ProjectConfig, ContractDeploymentData
+from ..solbinder_logging import get_solbinder_logger
+from ..tx_logging import BaseTransactionLogger
+
+# Only encodes and decodes, it never connects to a node
+_codec_w3 = Web3()
+
+
+class AsyncContractInstance(object):
+    """
+    ContractInstance for asyncio applications, on a web3 instance with the AsyncEth module (see
+    `ProjectConfig.get_async_w3`). Calls, transactions and event queries don't block the event loop, so any number
+    of them can be in flight at once.
+    """
+    CONTRACT_NAME: Optional[str] = None
+
+    def __init__(self, w3: Web3, address: str, abi: List[Dict], chain_id: int, creator_account: HexAddress,
+                 nonce_manager: Optional[AsyncMemoryNonceManager] = None, private_key: str = None,
+                 account: str = None, tx_logger: BaseTransactionLogger = None,
+                 fee_oracle: Optional[AsyncFeeOracle] = None):
+        """
+        :param w3: A web3 instance with the AsyncEth module
+        """
+        self.__w3 = w3
+        self._contract: Contract = _codec_w3.eth.contract(address=Web3.toChecksumAddress(address), abi=abi)
+        self.__chain_id = chain_id
+        self.__creator_account = creator_account
+        self.__nonce_manager = nonce_manager or AsyncMemoryNonceManager(w3)
+        self.__private_key = private_key
+        self.__default_account = account or creator_account
+        self.__tx_logger = tx_logger
+        self.__fee_oracle = fee_oracle or AsyncFeeOracle(w3)
+
+    @classmethod
+    async def from_project(cls, project_config: ProjectConfig = None, contract_name: str = None,
+                           network_name: str = None, private_key: str = None) -> "AsyncContractInstance":
+        """A deployment of the project, sharing the async web3, nonce manager and fee oracle of the network"""
+        if project_config is None:
+            project_config = ProjectConfig.load_project_config()
+        if contract_name is None:
+            if cls.CONTRACT_NAME is None:
+                raise ContractInstancingError("Either specify `contract_name` or override cls.CONTRACT_NAME")
+            contract_name = cls.CONTRACT_NAME
+        deployment_data = project_config.get_deployment_data(contract_name, network_name)
+        return await cls.from_deployment_data(deployment_data, project_config.get_async_w3(network_name),
+                                              project_config.get_async_nonce_manager(network_name),
+                                              project_config.create_tx_logger(contract_name), private_key,
+                                              project_config.get_async_fee_oracle(network_name))
+
+    @classmethod
+    async def from_deployment_data(cls, config: ContractDeploymentData, w3: Web3,
+                                   nonce_manager: Optional[AsyncMemoryNonceManager] = None, tx_logger=None,
+                                   private_key=None,
+                                   fee_oracle: Optional[AsyncFeeOracle] = None) -> "AsyncContractInstance":
+        chain_id = config.chain_id if config.chain_id is not None else await w3.eth.chain_id
+        return cls(w3, config.contract_address, config.abi, chain_id, config.account, nonce_manager, private_key,
+                   tx_logger=tx_logger, fee_oracle=fee_oracle)
+
+    @property
+    def address(self):
+        return self._contract.address
+
+    @property
+    def creator_account(self) -> HexAddress:
+        """Account who ran the transaction that created this contract"""
+        return self.__creator_account
+
+    @property
+    def web3(self):
+        return self.__w3
+
+    @property
+    def fee_oracle(self) -> AsyncFeeOracle:
+        return self.__fee_oracle
+
+    async def call(self, func_name: str, *args, block_identifier: Optional[BlockIdentifier] = None) -> Any:
+        """
+        :param block_identifier: Block to read at, the latest one if None
+        """
+        func: ContractFunction = self._contract.functions[func_name](*args)
+        return_data = await self.__w3.eth.call({"to": self.address, "data": encode_function_call(func)},
+                                               "latest" if block_identifier is None else block_identifier)
+        return decode_function_result(func, return_data)
+
+    async def transact(self, func_name: str, func_args, tx_args: Optional[TxParams] = None) -> HexBytes:
+        """
+        :param tx_args: from=0xaddr, value=1000
+               value is in wei. Fee fields default to the ones of the fee oracle, gas to the node's estimate
+        """
+        tx_args = dict(tx_args or dict())
+        if tx_args.get('nonce'):
+            raise ManualNonceNotSupported("Please read about Nonce-Manager for SolBinder")
+        if not tx_args.get('from'):
+            tx_args['from'] = self.__default_account
+
+        try:
+            func: ContractFunction = self._contract.functions[func_name](*func_args)
+            tx = dict(tx_args, to=self.address, data=encode_function_call(func), chainId=self.__chain_id)
+            await self.__fee_oracle.fill_fee_params(tx)
+            if 'gas' not in tx:
+                tx['gas'] = await self.__w3.eth.estimate_gas(tx)
+        except Exception as e:
+            raise TransactionBuildError(e)
+
+        async with self.__nonce_manager.advance_nonce(tx_args['from']) as nonce:
+            tx['nonce'] = nonce
+            self._get_logger().info(f"Doing transaction {func_name} on contract {self.address}. "
+                                    f"Function arguments: {func_args} Transaction arguments: {tx_args}")
+            try:
+                if self.__private_key is None:
+                    # Assume its an 'unlocked test account' if we don't have a private key
+                    tx_hash = await self.__w3.eth.send_transaction(tx)
+                else:
+                    signed_trans = self.__w3.eth.account.sign_transaction(tx, private_key=self.__private_key)
+                    tx_hash = await self.__w3.eth.send_raw_transaction(signed_trans.rawTransaction)
+            except Exception as e:
+                raise TransactionExecutionError(e)
+        if self.__tx_logger:
+            # Transaction loggers write to files or databases synchronously
+            await asyncio.get_running_loop().run_in_executor(None, self.__tx_logger.log_transaction, tx_hash,
+                                                             func_name, func_args)
+        return HexBytes(tx_hash)
+
+    async def get_receipt_events(self, tx_hash: HexBytes) -> List[EventData]:
+        """
+        Generate a list of all events that have been fired by this transaction
+
+        :raise Exception: If the transaction isn't done (no receipt) or if the transaction isn't from this contract.
+        """
+        receipt: TxReceipt = await self.__w3.eth.get_transaction_receipt(tx_hash)
+        logs: List[EventData] = []
+        for event_class in self._contract.events:
+            logs += list(event_class().processReceipt(receipt))
+        return logs
+
+    async def iter_events(self, event_name: str, from_block: int, to_block: "ToBlock") -> AsyncIterator[EventData]:
+        """Get all log entries for events of the given name fired by this contract."""
+        event = self._contract.events[event_name]()
+        _, filter_params = construct_event_filter_params(event._get_event_abi(), _codec_w3.codec,
+                                                         contract_address=self.address,
+                                                         fromBlock=from_block, toBlock=to_block)
+        for log in sorted(await self.__w3.eth.get_logs(filter_params), key=lambda x: x['blockNumber']):
+            yield event.processLog(log)
+
+    def _get_logger(self) -> Optional[Logger]:
+        return get_solbinder_logger()
+
+
+__all__ = ["AsyncContractInstance"]
@@ -0,0 +1,27 @@
+from typing import *
+
+from eth_typing import HexStr
+from web3._utils.abi import get_abi_output_types, map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+from web3.contract import ContractFunction
+
+
+def encode_function_call(function: ContractFunction) -> HexStr:
+    """
+    :param function: A function with its arguments, e.g. `contract.functions.balanceOf(owner)`
+    :return: The call data of `function`
+    """
+    return function._encode_transaction_data()
+
+
+def decode_function_result(function: ContractFunction, return_data: bytes) -> Any:
+    """
+    Decode the data returned by a call of `function`, the same way `function.call()` would: a single output is
+    returned as is, several outputs as a list
+    """
+    output_types = get_abi_output_types(function.abi)
+    output_data = function.web3.codec.decode_abi(output_types, return_data)
+    normalized_data = map_abi_data(BASE_RETURN_NORMALIZERS, output_types, output_data)
+    if len(normalized_data) == 1:
+        return normalized_data[0]
+    return normalized_data
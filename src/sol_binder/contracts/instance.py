@@ -1,19 +1,23 @@
-from collections import defaultdict
 from contextlib import contextmanager
 from logging import Logger
 from typing import *
 from warnings import warn
 
-from eth_typing import HexAddress
+from eth_typing import HexAddress, BlockIdentifier
 from hexbytes import HexBytes
 from web3 import Web3
 from web3.contract import Contract, ContractEvents, ContractFunction, ContractEvent, ContractFunctions
-from web3.types import Nonce, TxParams, EventData
+from web3.exceptions import TransactionNotFound
+from web3.types import Nonce, TxParams, EventData, TxReceipt
 
+from ..contracts.read_cache import ReadCache
+from ..fee_oracle import FeeOracle
 from ..nonce.naive import NaiveNonceManager
 from ..solbinder_logging import get_solbinder_logger
 from ..nonce.base import AbstractNonceManager
 from ..project.config import ProjectConfig, ContractDeploymentData
+from ..receipt_waiter import ReceiptWaiter
+from ..rpc_batch import JsonRpcBatch, get_transaction_receipts
 from ..contracts.event import BaseEventGroup
 from ..tx_logging import BaseTransactionLogger
 
@@ -42,6 +46,9 @@ class ManualNonceNotSupported(Exception):
     pass
 
 
+if TYPE_CHECKING:
+    from ..contracts.pipeline import PipelineTransaction
+
 E = TypeVar('E', bound=BaseEventGroup)
 
 
@@ -51,7 +58,8 @@ class ContractInstance(Generic[E]):
 
     def __init__(self, nonce_manager: AbstractNonceManager, contract: "Contract", creator_account: HexAddress,
                  private_key: str = None, account: str = None,  # put these in a single arg, call it default_tx_creds
-                 tx_logger: BaseTransactionLogger = None
+                 tx_logger: BaseTransactionLogger = None, fee_oracle: Optional[FeeOracle] = None,
+                 read_cache: Optional[ReadCache] = None, receipt_waiter: Optional[ReceiptWaiter] = None
                  ):
         self.__w3: Web3 = contract.web3
         self.__nonce_manager: AbstractNonceManager = nonce_manager or NaiveNonceManager(self.__w3)
@@ -62,6 +70,9 @@ class ContractInstance(Generic[E]):
         self.__private_key = private_key
         self.__default_account = account or creator_account
         self.__tx_logger = tx_logger
+        self.__fee_oracle = fee_oracle or FeeOracle(self.__w3)
+        self.__read_cache = read_cache
+        self.__receipt_waiter = receipt_waiter if receipt_waiter is not None else ReceiptWaiter(self.__w3)
 
         try:
             event_group_class = self.__get_event_group_class()
@@ -73,25 +84,41 @@ class ContractInstance(Generic[E]):
     @classmethod
     def from_project(cls, project_config: ProjectConfig = None, contract_name: str = None, network_name: str = None,
                      private_key: str = None) -> "ContractInstance":
-        if project_config is None:
-            project_config = ProjectConfig.load_project_config()
+        """
+        :param project_config: Defaults to the project of the working directory, loaded once per process (see
+               `get_contract_registry`)
+        """
         if contract_name is None:
             if cls.CONTRACT_NAME is None:
                 raise ContractInstancingError("Either specify `contract_name` or override cls.CONTRACT_NAME")
             contract_name = cls.CONTRACT_NAME
-        deployment_data = project_config.get_deployment_data(contract_name)
+        if project_config is None:
+            from ..contracts.registry import get_contract_registry
+            return get_contract_registry().get_instance(contract_name, network_name, private_key, cls)
+        deployment_data = project_config.get_deployment_data(contract_name, network_name)
         nonce = project_config.get_nonce_manager(network_name)
         tx_logger = project_config.create_tx_logger(contract_name)
 
-        return cls.from_deployment_data(deployment_data, nonce, tx_logger, private_key)
+        instance = cls.from_deployment_data(deployment_data, nonce, tx_logger, private_key,
+                                            project_config.get_w3(network_name))
+        instance.fee_oracle = project_config.get_fee_oracle(network_name)
+        instance.read_cache = project_config.get_read_cache(network_name)
+        instance.receipt_waiter = project_config.get_receipt_waiter(network_name)
+        return instance
 
     @classmethod
     def from_deployment_data(cls, config: ContractDeploymentData, nonce_manager: AbstractNonceManager = None,
-                             tx_logger=None, private_key=None) -> "ContractInstance":
-
-        w3 = ProjectConfig.load_project_config().get_w3()
-        hashed_address = Web3.toChecksumAddress(config.contract_address)
-        raw_contract = w3.eth.contract(address=hashed_address, abi=config.abi)
+                             tx_logger=None, private_key=None, w3: Optional[Web3] = None,
+                             contract_factory: Optional[Type[Contract]] = None) -> "ContractInstance":
+        """
+        :param w3: Defaults to the one of the project of the working directory, whose config is then loaded
+        :param contract_factory: The web3 contract class of the ABI, built from `w3` if None
+        """
+        if contract_factory is None:
+            if w3 is None:
+                w3 = ProjectConfig.load_project_config().get_w3()
+            contract_factory = w3.eth.contract(abi=config.abi)
+        raw_contract = contract_factory(address=Web3.toChecksumAddress(config.contract_address))
 
         return cls(nonce_manager, raw_contract, config.account, private_key, tx_logger=tx_logger)
 
@@ -99,6 +126,10 @@ class ContractInstance(Generic[E]):
     def address(self):
         return self._contract.address
 
+    @property
+    def abi(self) -> List[Dict]:
+        return self._contract.abi
+
     @property
     def creator_account(self) -> HexAddress:
         """Account who ran the transaction that created this contract"""
@@ -108,6 +139,43 @@ class ContractInstance(Generic[E]):
     def web3(self):
         return self.__w3
 
+    @property
+    def fee_oracle(self) -> FeeOracle:
+        return self.__fee_oracle
+
+    @fee_oracle.setter
+    def fee_oracle(self, fee_oracle: FeeOracle):
+        self.__fee_oracle = fee_oracle
+
+    @property
+    def nonce_manager(self) -> AbstractNonceManager:
+        return self.__nonce_manager
+
+    @property
+    def read_cache(self) -> Optional[ReadCache]:
+        return self.__read_cache
+
+    @read_cache.setter
+    def read_cache(self, read_cache: Optional[ReadCache]):
+        self.__read_cache = read_cache
+
+    @property
+    def receipt_waiter(self) -> ReceiptWaiter:
+        return self.__receipt_waiter
+
+    @receipt_waiter.setter
+    def receipt_waiter(self, receipt_waiter: ReceiptWaiter):
+        self.__receipt_waiter = receipt_waiter
+
+    def wait_for_receipt(self, tx_hash: HexBytes, confirmations: Optional[int] = None,
+                         timeout: Optional[float] = None) -> TxReceipt:
+        """
+        Wait for a transaction through the receipt waiter, shared by all the instances of the network
+
+        :raises TimeExhausted: If the transaction isn't confirmed after `timeout` seconds
+        """
+        return self.__receipt_waiter.wait_for_receipt(tx_hash, confirmations, timeout)
+
     def get_receipt_events(self, tx_hash: HexBytes) -> List[EventData]:
         """
         Generate a list of all events that have been fired by this transaction
@@ -115,6 +183,21 @@ class ContractInstance(Generic[E]):
         :raise Exception: If the transaction isn't done (no receipt) or if the transaction isn't from this contract.
         """
         receipt = self.__w3.eth.get_transaction_receipt(tx_hash)
+        return self.__process_receipt(receipt)
+
+    def get_receipts_events(self, tx_hashes: Iterable[HexBytes]) -> Dict[HexBytes, List[EventData]]:
+        """
+        Like `get_receipt_events` for several transactions, with all the receipts fetched in a single batch request
+
+        :raise Exception: If one of the transactions isn't done (no receipt)
+        """
+        receipts = get_transaction_receipts(self.__w3, tx_hashes)
+        missing = [tx_hash.hex() for tx_hash, receipt in receipts.items() if receipt is None]
+        if missing:
+            raise TransactionNotFound(f"No receipt for transactions {', '.join(missing)}")
+        return {tx_hash: self.__process_receipt(receipt) for tx_hash, receipt in receipts.items()}
+
+    def __process_receipt(self, receipt: TxReceipt) -> List[EventData]:
         logs: List[EventData] = []
         for event_class in self._contract.events:
             event: ContractEvent = event_class()
@@ -130,52 +213,114 @@ class ContractInstance(Generic[E]):
         for event_data in sorted(event_filter.get_all_entries(), key=lambda x: x['blockNumber']):
             yield event_data
 
-    def call(self, func_name, *args) -> Any:
+    def call(self, func_name, *args, block_identifier: Optional[BlockIdentifier] = None) -> Any:
+        """
+        :param block_identifier: Block to read at, the latest one if None. With a read cache, reads pinned to a block
+               number or hash are cached for good, reads of the latest block until a new block is observed
+        """
         # not clear why casting is required. Without the cast, Pycharm thinks func is of type ABIFunction
         func: ContractFunction = cast(ContractFunction, self._contract.functions[func_name])
-        return func(*args).call()
+        if self.__read_cache is not None:
+            return self.__read_cache.call(func(*args), block_identifier)
+        if block_identifier is None:
+            return func(*args).call()
+        return func(*args).call(block_identifier=block_identifier)
 
-    def transact(self, func_name: str, func_args, tx_args: TxParams = defaultdict()) -> Optional[HexBytes]:
+    def call_many(self, calls: Iterable[Tuple[str, Sequence]]) -> List[Any]:
+        """
+        Call several functions in a single batch request
+
+        :param calls: (function name, arguments) of every call
+        :return: The result of every call, in the same order
+        """
+        with JsonRpcBatch(self.__w3) as batch:
+            results = [batch.call(self, func_name, *args) for func_name, args in calls]
+        return [result.value for result in results]
+
+    def transact(self, func_name: str, func_args, tx_args: Optional[TxParams] = None) -> Optional[HexBytes]:
         """
         :param func_name:
         :param func_args:
         :param tx_args: from=0xaddr, to=0xaddr, value=1000
-               value is in wei
+               value is in wei. Fee fields default to the ones of the fee oracle
         :return:
         """
+        # Built before taking the nonce, so that the nonce lock is only held while signing and sending
+        tx = self.build_transaction(func_name, func_args, tx_args)
+
+        with self.__nonce_manager.advance_nonce(tx["from"]) as nonce:
+            tx["nonce"] = nonce
+            logger: Optional[Logger] = self._get_logger()
+            msg = f"Doing transaction {func_name} on contract {self.address}. Function arguments: {func_args}" \
+                  f"Transaction arguments: {tx_args}"
+            logger.info(msg)
+            tx_hash = self.send_transaction(tx)
+        self._log_transaction(tx_hash, func_name, func_args)
+        return tx_hash
+
+    def transact_many(self, transactions: Iterable[Tuple[str, Sequence, Optional[TxParams]]],
+                      **pipeline_kwargs) -> List["PipelineTransaction"]:
+        """
+        Send many transactions through a TransactionPipeline, without waiting for each other
+
+        :param transactions: (function name, function arguments, transaction arguments) of every transaction
+        :param pipeline_kwargs: Arguments of the TransactionPipeline, e.g. max_in_flight
+        :return: The futures of the tx hash and receipt of every transaction, in the same order
+        """
+        from ..contracts.pipeline import TransactionPipeline
+        pipeline = TransactionPipeline(self, **pipeline_kwargs)
+        try:
+            return [pipeline.submit(func_name, func_args, tx_args) for func_name, func_args, tx_args in transactions]
+        finally:
+            # The pipeline stops by itself once every transaction is done
+            pipeline.close(wait=False)
+
+    def build_transaction(self, func_name: str, func_args, tx_args: Optional[TxParams] = None) -> TxParams:
+        """
+        Build a transaction of this contract, without its nonce
+
+        :raises TransactionBuildError: If the transaction can't be built, e.g. because it would revert
+        """
+        tx_args = dict(tx_args or dict())
         if tx_args.get('nonce'):
             raise ManualNonceNotSupported("Please read about Nonce-Manager for SolBinder")
 
         if not tx_args.get('from'):
             tx_args['from'] = self.__default_account
+        self.__fee_oracle.fill_fee_params(tx_args)
 
         func: ContractFunction = cast(ContractFunction, self._contract.functions[func_name])
+        try:
+            return func(*func_args).buildTransaction(tx_args)
+        except Exception as e:
+            raise TransactionBuildError(e)
 
-        with self.__nonce_manager.advance_nonce(tx_args.get("from")) as nonce:
-            tx_args.update({"nonce": nonce, })
-
-            try:
-                tx = func(*func_args).buildTransaction(tx_args)
-            except Exception as e:
-                raise TransactionBuildError(e)
-
-            logger: Optional[Logger] = self._get_logger()
-            msg = f"Doing transaction {func_name} on contract {self.address}. Function arguments: {func_args}" \
-                  f"Transaction arguments: {tx_args}"
-            logger.info(msg)
+    def sign_transaction(self, tx: TxParams) -> Optional[HexBytes]:
+        """
+        :return: The raw signed transaction, None without a private key
+        """
+        if self.__private_key is None:
+            return None
+        return self.__w3.eth.account.sign_transaction(tx, private_key=self.__private_key).rawTransaction
 
-            try:
-                if self.__private_key is None:
-                    # Assume its an 'unlocked test account' if we don't have a private key
-                    tx_hash = self.__w3.eth.send_transaction(tx)
-                else:
-                    signed_trans = self.__w3.eth.account.sign_transaction(tx, private_key=self.__private_key)
-                    tx_hash = self.__w3.eth.send_raw_transaction(signed_trans.rawTransaction)
-            except Exception as e:
-                raise TransactionExecutionError(e)
+    def send_transaction(self, tx: TxParams, raw_transaction: Optional[HexBytes] = None) -> HexBytes:
+        """
+        :param raw_transaction: `tx` already signed, it is signed here if None
+        :raises TransactionExecutionError: If the node refused the transaction
+        """
+        try:
+            if raw_transaction is None:
+                raw_transaction = self.sign_transaction(tx)
+            if raw_transaction is None:
+                # Assume its an 'unlocked test account' if we don't have a private key
+                return self.__w3.eth.send_transaction(tx)
+            return self.__w3.eth.send_raw_transaction(raw_transaction)
+        except Exception as e:
+            raise TransactionExecutionError(e)
+
+    def _log_transaction(self, tx_hash: HexBytes, func_name: str, func_args):
         if self.__tx_logger:
             self.__tx_logger.log_transaction(tx_hash, func_name, func_args)
-        return tx_hash
 
     def _get_logger(self) -> Optional[Logger]:
         return get_solbinder_logger()
@@ -0,0 +1,218 @@
+from typing import *
+
+import os
+
+from eth_account import Account
+from eth_typing import BlockIdentifier
+from web3 import Web3
+from web3.contract import Contract, ContractFunction
+
+from ..contract_tool import ContractTool, contract_folder
+from ..contracts.codec import encode_function_call, decode_function_result
+from ..project.config import ProjectConfig, ContractDeploymentData
+
+if TYPE_CHECKING:
+    from ..contracts.instance import ContractInstance
+
+MULTICALL_SOURCE_PATH = os.path.join(contract_folder(), "Multicall.sol")
+MULTICALL_DEPLOYMENT = "Multicall"  # Name the aggregator is saved under in the deployment manifest
+DEFAULT_BATCH_SIZE = 500  # Calls per aggregate3 call, so that large batches stay under the node's gas cap
+
+# ABI of Multicall.sol, so that reading doesn't need a compiler
+MULTICALL_ABI = [
+    {
+        "type": "function",
+        "name": "aggregate3",
+        "stateMutability": "payable",
+        "inputs": [{
+            "name": "calls",
+            "type": "tuple[]",
+            "components": [
+                {"name": "target", "type": "address"},
+                {"name": "allowFailure", "type": "bool"},
+                {"name": "callData", "type": "bytes"},
+            ],
+        }],
+        "outputs": [{
+            "name": "returnData",
+            "type": "tuple[]",
+            "components": [
+                {"name": "success", "type": "bool"},
+                {"name": "returnData", "type": "bytes"},
+            ],
+        }],
+    },
+    {
+        "type": "function",
+        "name": "getBlockNumber",
+        "stateMutability": "view",
+        "inputs": [],
+        "outputs": [{"name": "blockNumber", "type": "uint256"}],
+    },
+]
+
+
+class MulticallError(Exception):
+    pass
+
+
+class MulticallCallError(MulticallError):
+    pass
+
+
+class MulticallResult(object):
+    """Result of one call of a multicall, available once the multicall was executed"""
+
+    def __init__(self, function: ContractFunction, allow_failure: bool):
+        self.function = function
+        self.allow_failure = allow_failure
+        self.success: Optional[bool] = None
+        self.__value: Any = None
+        self.__error: Optional[Exception] = None
+
+    @property
+    def value(self) -> Any:
+        """
+        :raises MulticallCallError: If the call failed or the multicall wasn't executed yet
+        """
+        if self.success is None:
+            raise MulticallCallError(f"{self.function.fn_name} wasn't executed yet")
+        if not self.success:
+            raise MulticallCallError(f"{self.function.fn_name} failed: {self.__error}")
+        return self.__value
+
+    @property
+    def error(self) -> Optional[Exception]:
+        return self.__error
+
+    def _set(self, success: bool, return_data: bytes):
+        if success:
+            try:
+                self.__value = decode_function_result(self.function, return_data)
+            except Exception as e:
+                # e.g. calling a function on an address without code returns no data
+                success, self.__error = False, e
+        else:
+            self.__error = MulticallCallError(f"reverted with data {return_data.hex() or '(none)'}")
+        self.success = success
+
+
+class Multicall(object):
+    """
+    Batches read calls to any number of contracts into a few `eth_call`s of a Multicall aggregator contract.
+
+        with Multicall(w3, multicall_address) as mc:
+            balance = mc.add(token, "balanceOf", owner)
+        balance.value
+
+    All the calls are read at the same block. A call that isn't allowed to fail makes the whole batch fail,
+    the others report their failure on their result.
+    """
+
+    def __init__(self, w3: Web3, address: str, block_identifier: Optional[BlockIdentifier] = None,
+                 allow_failure: bool = False, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        :param address: Address of a contract with the aggregate3 function of Multicall.sol (or Multicall3)
+        :param block_identifier: Block to read at, the latest one if None. The aggregator must exist at that block
+        :param allow_failure: Default failure tolerance of the calls
+        """
+        self.w3 = w3
+        self.block_identifier = block_identifier
+        self.allow_failure = allow_failure
+        self.batch_size = batch_size
+        self.__contract: Contract = w3.eth.contract(address=Web3.toChecksumAddress(address), abi=MULTICALL_ABI)
+        self.__pending: List[MulticallResult] = []
+
+    @classmethod
+    def from_project(cls, project_config: Optional[ProjectConfig] = None, network_name: Optional[str] = None,
+                     **kwargs) -> "Multicall":
+        """
+        Use the aggregator of a network: the `multicall_address` of the network config, e.g. the canonical Multicall3
+        address, or the one deployed with `deploy_multicall`
+        """
+        if project_config is None:
+            project_config = ProjectConfig.load_project_config()
+        address = project_config.get_network_info(network_name).get("multicall_address")
+        if address is None:
+            try:
+                address = project_config.get_deployment_data(MULTICALL_DEPLOYMENT, network_name).contract_address
+            except FileNotFoundError:
+                raise MulticallError("No multicall contract on the network, set its `multicall_address` or deploy "
+                                     "one with `sol-binder deploy-multicall`")
+        return cls(project_config.get_w3(network_name), address, **kwargs)
+
+    def __enter__(self) -> "Multicall":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.execute()
+
+    @property
+    def address(self) -> str:
+        return self.__contract.address
+
+    def add(self, contract: Union["ContractInstance", Contract], func_name: str, *args,
+            allow_failure: Optional[bool] = None) -> MulticallResult:
+        """
+        Queue a call of a view function
+
+        :param contract: A ContractInstance or a web3 contract
+        :param allow_failure: Overrides the failure tolerance of the multicall for this call
+        """
+        raw_contract: Contract = getattr(contract, "_contract", contract)
+        function: ContractFunction = raw_contract.functions[func_name](*args)
+        result = MulticallResult(function, self.allow_failure if allow_failure is None else allow_failure)
+        self.__pending.append(result)
+        return result
+
+    def execute(self) -> List[MulticallResult]:
+        """
+        Run the queued calls
+
+        :raises MulticallError: If a call that isn't allowed to fail failed
+        """
+        results, self.__pending = self.__pending, []
+        block_identifier = self.block_identifier
+        if block_identifier is None:
+            # Every batch reads the same block
+            block_identifier = self.w3.eth.block_number if len(results) > self.batch_size else "latest"
+        for start in range(0, len(results), self.batch_size):
+            batch = results[start:start + self.batch_size]
+            calls = [(result.function.address, result.allow_failure, encode_function_call(result.function))
+                     for result in batch]
+            try:
+                outputs = self.__contract.functions.aggregate3(calls).call(block_identifier=block_identifier)
+            except Exception as e:
+                raise MulticallError(f"Multicall failed: {e}")
+            for result, (success, return_data) in zip(batch, outputs):
+                result._set(success, return_data)
+                if not result.success and not result.allow_failure:
+                    # Can only be an undecodable result, reverts make aggregate3 revert
+                    raise MulticallError(f"{result.function.fn_name} failed: {result.error}")
+        return results
+
+
+def deploy_multicall(project_config: Optional[ProjectConfig] = None, network_name: Optional[str] = None,
+                     account: Optional[str] = None, private_key: Optional[str] = None,
+                     solc_version: Optional[str] = None) -> ContractDeploymentData:
+    """
+    Deploy the Multicall.sol aggregator shipped with sol-binder and save it under MULTICALL_DEPLOYMENT
+
+    :param solc_version: Defaults to the one of the project, which must be 0.8.0 or later
+    """
+    if project_config is None:
+        project_config = ProjectConfig.load_project_config()
+    w3 = project_config.get_w3(network_name)
+    chain_id = project_config.get_network_info(network_name)["network_id"]
+    contract_tool = ContractTool(w3, contract_folder(), chain_id, project_config.get_artifact_cache(),
+                                 project_config.get_fee_oracle(network_name),
+                                 project_config.get_receipt_waiter(network_name))
+    with open(MULTICALL_SOURCE_PATH) as fh:
+        source = fh.read()
+    if account is None:
+        account = Account.from_key(private_key).address if private_key else w3.eth.accounts[0]
+    deployment_data = contract_tool.deploys(source, account, private_key,
+                                            solc_version=solc_version or project_config.solc_version)
+    project_config.save_deployment_data({MULTICALL_DEPLOYMENT: deployment_data}, network_name)
+    return deployment_data
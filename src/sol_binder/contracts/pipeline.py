@@ -0,0 +1,225 @@
+from collections import deque, defaultdict, Counter
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
+from functools import partial
+from threading import Thread, Condition, BoundedSemaphore
+from typing import *
+
+from hexbytes import HexBytes
+from web3.types import TxParams, TxReceipt
+
+if TYPE_CHECKING:
+    from ..contracts.instance import ContractInstance
+
+DEFAULT_MAX_IN_FLIGHT = 64
+DEFAULT_WORKERS = 8
+DEFAULT_RECEIPT_TIMEOUT = 600
+
+
+class TransactionPipelineClosedError(Exception):
+    pass
+
+
+class PipelineTransaction(object):
+    """A transaction submitted to a TransactionPipeline"""
+
+    def __init__(self, func_name: str, func_args: Sequence, tx_args: Optional[TxParams]):
+        self.func_name = func_name
+        self.func_args = func_args
+        self.tx_args = tx_args
+        self.tx_hash: "Future[HexBytes]" = Future()  # Set once the transaction is broadcast
+        self.receipt: "Future[TxReceipt]" = Future()  # Set once it is mined, whatever its status
+        self._build: Optional[Future] = None
+        self._tx: Optional[TxParams] = None
+
+    def _fail(self, e: Exception):
+        if not self.tx_hash.done():
+            self.tx_hash.set_exception(e)
+        self.receipt.set_exception(e)
+
+
+class TransactionPipeline(object):
+    """
+    Sends many transactions of a contract without waiting for each other.
+
+    Transactions are built (gas estimated) and signed by a pool of threads, get consecutive nonces from the nonce
+    manager of the contract instance in the order they were submitted, and are broadcast in that order by a single
+    thread. At most `max_in_flight` transactions are broadcast and not mined yet, their receipts are awaited by the
+    receipt waiter of the contract instance. A transaction that fails to be built fails alone; if one fails to be
+    sent, the nonces reserved for the next ones of the same account are re-synced from the chain once its pending
+    transactions are mined. If the nonces of an account can't be reserved or re-synced, the transactions of that
+    account in the batch being sent fail, and the next ones try again.
+
+    The nonce manager must keep track of the nonces it gives, which the "naive" one only does on dev chains that mine
+    every transaction immediately.
+
+        with TransactionPipeline(token) as pipeline:
+            transactions = [pipeline.submit("transfer", [recipient, 100]) for recipient in recipients]
+        receipts = [transaction.receipt.result() for transaction in transactions]
+    """
+
+    def __init__(self, instance: "ContractInstance", max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 workers: int = DEFAULT_WORKERS, max_queued: Optional[int] = None,
+                 receipt_timeout: float = DEFAULT_RECEIPT_TIMEOUT):
+        """
+        :param workers: Threads building and signing transactions
+        :param max_queued: Submitted transactions not broadcast yet, `submit` blocks beyond that. 4 * max_in_flight
+               if None
+        :param receipt_timeout: Seconds after which a broadcast transaction that isn't mined fails with TimeExhausted
+        """
+        self.instance = instance
+        self.max_in_flight = max_in_flight
+        self.receipt_timeout = receipt_timeout
+        self.__executor = ThreadPoolExecutor(max_workers=workers)
+        self.__condition = Condition()
+        self.__queue: Deque[PipelineTransaction] = deque()
+        self.__queued = BoundedSemaphore(max_queued or 4 * max_in_flight)
+        self.__in_flight = BoundedSemaphore(max_in_flight)
+        self.__in_flight_by_account: Dict[str, int] = defaultdict(int)
+        self.__needs_sync: Set[str] = set()
+        self.__closed = False
+        self.__sender = Thread(target=self.__send_loop, name="transaction-pipeline-sender", daemon=True)
+        self.__sender.start()
+
+    def __enter__(self) -> "TransactionPipeline":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def submit(self, func_name: str, func_args: Sequence = (),
+               tx_args: Optional[TxParams] = None) -> PipelineTransaction:
+        """
+        Queue a transaction, blocking while too many are queued
+
+        :param tx_args: Transaction arguments, as in `ContractInstance.transact`
+        """
+        if self.__closed:
+            raise TransactionPipelineClosedError("The pipeline is closed")
+        self.__queued.acquire()
+        transaction = PipelineTransaction(func_name, func_args, tx_args)
+        transaction._build = self.__executor.submit(self.instance.build_transaction, func_name, func_args, tx_args)
+        with self.__condition:
+            self.__queue.append(transaction)
+            self.__condition.notify_all()
+        return transaction
+
+    def close(self, wait: bool = True):
+        """
+        Stop accepting transactions, the pipeline stops once all of them are done
+
+        :param wait: Wait until every transaction is mined or failed
+        """
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify_all()
+        if wait:
+            self.__sender.join()
+            with self.__condition:
+                while any(self.__in_flight_by_account.values()):
+                    self.__condition.wait()
+
+    def __send_loop(self):
+        while True:
+            with self.__condition:
+                while not self.__queue and not self.__closed:
+                    self.__condition.wait()
+                if not self.__queue:
+                    break
+                head = self.__queue[0]
+            wait_futures([head._build])
+            # Along with every following transaction that is already built
+            with self.__condition:
+                batch = []
+                while self.__queue and self.__queue[0]._build.done() and len(batch) < self.max_in_flight:
+                    batch.append(self.__queue.popleft())
+            try:
+                self.__send_batch(batch)
+            except Exception as e:
+                # Keep sending the next batches, and free the slots of the transactions that weren't sent
+                for transaction in batch:
+                    if not transaction.tx_hash.done():
+                        self.__fail(transaction, e)
+        self.__executor.shutdown(wait=False)
+
+    def __send_batch(self, batch: List[PipelineTransaction]):
+        built = []
+        for transaction in batch:
+            try:
+                transaction._tx = transaction._build.result()
+            except Exception as e:
+                self.__fail(transaction, e)
+            else:
+                built.append(transaction)
+
+        nonces = dict()
+        for account, count in Counter(transaction._tx["from"] for transaction in built).items():
+            try:
+                self.__sync_if_needed(account)
+                nonces[account] = iter(self.instance.nonce_manager.reserve_nonces(account, count))
+            except Exception as e:
+                # Some of the nonces may have been reserved, get them from the chain again before the next batch
+                for transaction in built:
+                    if transaction._tx["from"] == account:
+                        self.__fail(transaction, e)
+                with self.__condition:
+                    self.__needs_sync.add(account)
+        built = [transaction for transaction in built if transaction._tx["from"] in nonces]
+        for transaction in built:
+            transaction._tx = dict(transaction._tx, nonce=next(nonces[transaction._tx["from"]]))
+        signed = [self.__executor.submit(self.instance.sign_transaction, transaction._tx) for transaction in built]
+
+        retry = []
+        for transaction, signing in zip(built, signed):
+            account = transaction._tx["from"]
+            if account in self.__needs_sync:
+                # Its nonce comes after the one of a transaction that wasn't sent
+                retry.append(transaction)
+                continue
+            try:
+                raw_transaction = signing.result()
+                self.__in_flight.acquire()
+                try:
+                    tx_hash = self.instance.send_transaction(transaction._tx, raw_transaction)
+                except Exception:
+                    self.__in_flight.release()
+                    raise
+            except Exception as e:
+                self.__fail(transaction, e)
+                with self.__condition:
+                    self.__needs_sync.add(account)
+                continue
+            self.__queued.release()
+            transaction.tx_hash.set_result(tx_hash)
+            with self.__condition:
+                self.__in_flight_by_account[account] += 1
+            self.instance.receipt_waiter.wait(tx_hash, timeout=self.receipt_timeout,
+                                              callback=partial(self.__on_receipt, transaction, account))
+            self.instance._log_transaction(tx_hash, transaction.func_name, transaction.func_args)
+        if retry:
+            with self.__condition:
+                self.__queue.extendleft(reversed(retry))
+
+    def __sync_if_needed(self, account: str):
+        """Re-sync the nonce of an account whose transactions failed to be sent, once the others are mined"""
+        with self.__condition:
+            if account not in self.__needs_sync:
+                return
+            while self.__in_flight_by_account[account]:
+                self.__condition.wait()
+        self.instance.nonce_manager.sync_from_chain([account])
+        with self.__condition:
+            self.__needs_sync.discard(account)
+
+    def __fail(self, transaction: PipelineTransaction, e: Exception):
+        transaction._fail(e)
+        self.__queued.release()
+
+    def __on_receipt(self, transaction: PipelineTransaction, account: str, receipt: "Future[TxReceipt]"):
+        if receipt.exception() is not None:
+            transaction.receipt.set_exception(receipt.exception())
+        else:
+            transaction.receipt.set_result(receipt.result())
+        with self.__condition:
+            self.__in_flight_by_account[account] -= 1
+            self.__condition.notify_all()
+        self.__in_flight.release()
@@ -0,0 +1,113 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import *
+
+import json
+
+from eth_typing import BlockIdentifier
+from hexbytes import HexBytes
+from web3 import Web3
+from web3._utils.abi import abi_to_signature
+from web3.contract import ContractFunction
+
+DEFAULT_MAX_READ_CACHE_SIZE = 1024
+DEFAULT_BLOCK_POLL_INTERVAL = 1.0  # Seconds the latest block number is trusted for before asking the node again
+
+_LATEST_BLOCK_IDENTIFIERS = (None, "latest")
+
+
+class ReadCache(object):
+    """
+    In-memory cache of the results of view function calls, keyed by contract address, function, arguments and block.
+
+    Reads of the latest block are made at the latest block number the cache observed, and are dropped as soon as it
+    observes a newer block. Reads pinned to a block (by number or hash) never change, and are kept until evicted.
+    The cache is bounded by number of entries, least recently used entries are evicted first. Results are shared
+    between the callers and must not be modified.
+    """
+
+    def __init__(self, w3: Web3, max_size: int = DEFAULT_MAX_READ_CACHE_SIZE,
+                 block_poll_interval: float = DEFAULT_BLOCK_POLL_INTERVAL):
+        """
+        :param block_poll_interval: How often to check for a new block, in seconds. 0 checks before every read
+        """
+        self.w3 = w3
+        self.max_size = max_size
+        self.block_poll_interval = block_poll_interval
+        self.hits = 0
+        self.misses = 0
+        self.__lock = Lock()
+        self.__entries: "OrderedDict[Tuple, Tuple[Any, bool]]" = OrderedDict()  # key -> (result, pinned)
+        self.__block_number: Optional[int] = None
+        self.__block_checked_at: Optional[float] = None
+
+    def call(self, function: ContractFunction, block_identifier: Optional[BlockIdentifier] = None) -> Any:
+        """
+        Cached `function.call()`
+
+        :param function: A function with its arguments, e.g. `contract.functions.owner()`
+        :param block_identifier: Block to read at, the latest one if None. "pending" and "earliest" aren't cached
+        """
+        pinned = block_identifier not in _LATEST_BLOCK_IDENTIFIERS
+        if pinned and not self.__is_immutable(block_identifier):
+            return function.call(block_identifier=block_identifier)
+        if not pinned:
+            block_identifier = self.get_block_number()
+        key = self.get_key(function, block_identifier)
+        with self.__lock:
+            if key in self.__entries:
+                self.__entries.move_to_end(key)
+                self.hits += 1
+                return self.__entries[key][0]
+            self.misses += 1
+        result = function.call(block_identifier=block_identifier)
+        with self.__lock:
+            if pinned or block_identifier == self.__block_number:
+                pinned = pinned or self.__entries.get(key, (None, False))[1]
+                self.__entries[key] = (result, pinned)
+                self.__entries.move_to_end(key)
+                while len(self.__entries) > self.max_size:
+                    self.__entries.popitem(last=False)
+        return result
+
+    @staticmethod
+    def get_key(function: ContractFunction, block_identifier: BlockIdentifier) -> Tuple:
+        arguments = json.dumps([function.args, function.kwargs], sort_keys=True, default=str)
+        if isinstance(block_identifier, (bytes, str)):
+            block_identifier = HexBytes(block_identifier)
+        return function.address, abi_to_signature(function.abi), arguments, block_identifier
+
+    def get_block_number(self) -> int:
+        """The latest block number, observing a new block drops the reads of the previous ones"""
+        with self.__lock:
+            if self.__block_checked_at is not None and monotonic() - self.__block_checked_at < self.block_poll_interval:
+                return self.__block_number
+        block_number = self.w3.eth.block_number
+        with self.__lock:
+            self.__block_checked_at = monotonic()
+            if self.__block_number is None or block_number > self.__block_number:
+                self.__block_number = block_number
+                self.__entries = OrderedDict((key, entry) for key, entry in self.__entries.items() if entry[1])
+            return self.__block_number
+
+    def invalidate(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__block_number = None
+            self.__block_checked_at = None
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get_stats(self) -> str:
+        return f"read cache: {self.hits} hits, {self.misses} misses, {len(self)} entries"
+
+    @staticmethod
+    def __is_immutable(block_identifier: BlockIdentifier) -> bool:
+        """Whether reads at this block can be cached forever: a block number or a block hash"""
+        if isinstance(block_identifier, int):
+            return True
+        if isinstance(block_identifier, bytes):
+            return len(block_identifier) == 32
+        return isinstance(block_identifier, str) and block_identifier.startswith("0x") and len(block_identifier) == 66
@@ -0,0 +1,141 @@
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import *
+
+from web3 import Web3
+from web3.contract import Contract
+
+from ..contracts.instance import ContractInstance
+from ..project.config import ProjectConfig
+from ..project.manifest import hash_abi
+from ..tx_logging import BaseTransactionLogger
+
+I = TypeVar("I", bound=ContractInstance)
+
+MAX_HASHED_ABIS = 1024
+DEFAULT_MAX_BOUND_CONTRACTS = 4096
+
+
+class ContractRegistry(object):
+    """
+    Hands out ContractInstances of a project without reloading anything.
+
+    The project config is loaded once. The instances of a network share its web3, nonce manager, fee oracle, read cache
+    and receipt waiter, and the instances of a contract share its transaction logger. The web3 contract factory of an
+    ABI is built once per network, keyed by ABI hash, and the web3 contracts bound to an address are kept in a
+    bounded cache: instances of the same contract share them, as they have no state of their own.
+    """
+
+    def __init__(self, project_config: Optional[ProjectConfig] = None,
+                 max_bound_contracts: int = DEFAULT_MAX_BOUND_CONTRACTS):
+        """
+        :param project_config: Defaults to the project of the working directory
+        :param max_bound_contracts: Web3 contracts bound to an address kept, least recently used ones are evicted
+        """
+        self.project_config = project_config or ProjectConfig.load_project_config()
+        self.max_bound_contracts = max_bound_contracts
+        self.__lock = Lock()
+        self.__factories: Dict[Tuple[Optional[str], str], Type[Contract]] = dict()  # (network, ABI hash) -> factory
+        self.__contracts: "OrderedDict[Tuple[Optional[str], str, str], Contract]" = OrderedDict()
+        self.__abi_hashes: Dict[int, Tuple[List[Dict], str]] = dict()  # id(ABI) -> (ABI, hash)
+        self.__tx_loggers: Dict[str, Optional[BaseTransactionLogger]] = dict()
+
+    def get_instance(self, contract_name: str, network_name: Optional[str] = None, private_key: Optional[str] = None,
+                     instance_class: Type[I] = ContractInstance, account: Optional[str] = None) -> I:
+        """
+        A deployment of the project, like `ContractInstance.from_project`
+
+        :param instance_class: ContractInstance subclass to create
+        :param account: Default account of the transactions, the creator of the contract if None
+        """
+        deployment_data = self.project_config.get_deployment_data(contract_name, network_name)
+        return self.get_instance_at(deployment_data.contract_address, deployment_data.abi, network_name, private_key,
+                                    instance_class, account, deployment_data.account,
+                                    self.get_tx_logger(contract_name))
+
+    def get_instance_at(self, address: str, abi: List[Dict], network_name: Optional[str] = None,
+                        private_key: Optional[str] = None, instance_class: Type[I] = ContractInstance,
+                        account: Optional[str] = None, creator_account: Optional[str] = None,
+                        tx_logger: Optional[BaseTransactionLogger] = None) -> I:
+        """
+        A contract at any address, e.g. one of many clones of a deployed contract
+
+        :param abi: Instances of the same ABI share its contract factory, pass the same list to skip hashing it
+        :param creator_account: Account who created the contract, also the default account if `account` is None
+        """
+        project_config = self.project_config
+        contract = self.get_contract(address, abi, network_name)
+        return instance_class(project_config.get_nonce_manager(network_name), contract, creator_account, private_key,
+                              account, tx_logger=tx_logger, fee_oracle=project_config.get_fee_oracle(network_name),
+                              read_cache=project_config.get_read_cache(network_name),
+                              receipt_waiter=project_config.get_receipt_waiter(network_name))
+
+    def get_contract(self, address: str, abi: List[Dict], network_name: Optional[str] = None) -> Contract:
+        """The web3 contract of `abi` at `address` on a network"""
+        key = (network_name, self.__get_abi_hash(abi), address.lower())
+        with self.__lock:
+            contract = self.__contracts.get(key)
+            if contract is not None:
+                self.__contracts.move_to_end(key)
+                return contract
+        contract = self.get_contract_factory(abi, network_name)(address=Web3.toChecksumAddress(address))
+        with self.__lock:
+            self.__contracts[key] = contract
+            while len(self.__contracts) > self.max_bound_contracts:
+                self.__contracts.popitem(last=False)
+        return contract
+
+    def get_contract_factory(self, abi: List[Dict], network_name: Optional[str] = None) -> Type[Contract]:
+        """The web3 contract class of `abi` on a network, built once"""
+        key = (network_name, self.__get_abi_hash(abi))
+        with self.__lock:
+            factory = self.__factories.get(key)
+        if factory is None:
+            factory = self.project_config.get_w3(network_name).eth.contract(abi=abi)
+            with self.__lock:
+                factory = self.__factories.setdefault(key, factory)
+        return factory
+
+    def get_tx_logger(self, contract_name: str) -> Optional[BaseTransactionLogger]:
+        """The transaction logger of a contract, created once"""
+        with self.__lock:
+            if contract_name in self.__tx_loggers:
+                return self.__tx_loggers[contract_name]
+        tx_logger = self.project_config.create_tx_logger(contract_name)
+        with self.__lock:
+            return self.__tx_loggers.setdefault(contract_name, tx_logger)
+
+    def __get_abi_hash(self, abi: List[Dict]) -> str:
+        # The deployment manifest returns the same ABI list for every deployment data of an ABI, hash it only once
+        with self.__lock:
+            cached_abi, abi_hash = self.__abi_hashes.get(id(abi), (None, None))
+        if cached_abi is abi:
+            return abi_hash
+        abi_hash = hash_abi(abi)
+        with self.__lock:
+            if len(self.__abi_hashes) >= MAX_HASHED_ABIS:
+                self.__abi_hashes.clear()
+            # Keeping the ABI alive keeps its id from being reused by another list
+            self.__abi_hashes[id(abi)] = (abi, abi_hash)
+        return abi_hash
+
+
+_shared_registries: Dict[Optional[str], ContractRegistry] = dict()
+_shared_registries_lock = Lock()
+
+
+def get_contract_registry(start_path: Union[str, Path, None] = None) -> ContractRegistry:
+    """
+    The registry of a project, shared by the whole process
+
+    :param start_path: Where to look for the project config, the working directory of the first call if None
+    """
+    key = None if start_path is None else str(start_path)
+    with _shared_registries_lock:
+        if key not in _shared_registries:
+            _shared_registries[key] = ContractRegistry(ProjectConfig.load_project_config(start_path))
+        return _shared_registries[key]
+
+
+__all__ = ["ContractRegistry", "get_contract_registry"]
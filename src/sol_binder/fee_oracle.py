@@ -0,0 +1,184 @@
+import asyncio
+from threading import Lock
+from time import monotonic
+from typing import *
+
+from web3 import Web3
+from web3.types import TxParams, TxReceipt
+
+DEFAULT_FEE_TTL_SECONDS = 12.0  # About one block on mainnet
+DEFAULT_BASE_FEE_MULTIPLIER = 2  # Room for the base fee to grow over the next few blocks
+
+LEGACY = "legacy"
+EIP1559 = "eip1559"
+AUTO = "auto"
+
+
+class BaseFeeOracle(object):
+    """Configuration and fee computations shared by the synchronous and asynchronous fee oracles"""
+
+    def __init__(self, strategy: str = AUTO, ttl: float = DEFAULT_FEE_TTL_SECONDS,
+                 priority_fee: Optional[int] = None, base_fee_multiplier: float = DEFAULT_BASE_FEE_MULTIPLIER):
+        """
+        :param strategy: "legacy", "eip1559" or "auto"
+        :param ttl: How long fetched fees are used, in seconds
+        :param priority_fee: Priority fee in wei, defaults to the one suggested by the node
+        :param base_fee_multiplier: maxFeePerGas is the base fee times this, plus the priority fee
+        """
+        if strategy not in (LEGACY, EIP1559, AUTO):
+            raise ValueError(f"Unknown fee strategy: {strategy}")
+        self.strategy = strategy
+        self.ttl = ttl
+        self.priority_fee = priority_fee
+        self.base_fee_multiplier = base_fee_multiplier
+
+    def _get_eip1559_fee_params(self, base_fee: int, priority_fee: int) -> TxParams:
+        return {
+            "maxFeePerGas": int(base_fee * self.base_fee_multiplier) + priority_fee,
+            "maxPriorityFeePerGas": priority_fee,
+        }
+
+    @staticmethod
+    def _has_fee_params(tx_params: TxParams) -> bool:
+        return any(key in tx_params for key in ("gasPrice", "maxFeePerGas", "maxPriorityFeePerGas"))
+
+    def _is_fresh(self, fetched_at: Optional[float]) -> bool:
+        return fetched_at is not None and monotonic() - fetched_at < self.ttl
+
+
+class FeeOracle(BaseFeeOracle):
+    """
+    Transaction fee parameters of a network.
+
+    Fees are fetched at most once every `ttl` seconds, so the transactions sent in the meantime cost no extra
+    round-trips. With the EIP-1559 strategy transactions get `maxFeePerGas`/`maxPriorityFeePerGas` computed from the
+    base fee of the latest block, otherwise a legacy `gasPrice`. The "auto" strategy uses EIP-1559 on networks whose
+    blocks have a base fee.
+    """
+
+    def __init__(self, w3: Web3, *args, **kwargs):
+        """
+        :param w3: The other arguments are the ones of BaseFeeOracle
+        """
+        super().__init__(*args, **kwargs)
+        self.w3 = w3
+        self.__lock = Lock()
+        self.__cache: Dict[str, Tuple[float, Any]] = dict()
+
+    def get_gas_price(self) -> int:
+        return self.__get_cached("gas_price", lambda: self.w3.eth.gas_price)
+
+    def get_base_fee(self) -> Optional[int]:
+        """Base fee of the latest block, None before EIP-1559"""
+        return self.__get_cached("base_fee", lambda: self.w3.eth.get_block("latest").get("baseFeePerGas"))
+
+    def get_priority_fee(self) -> int:
+        if self.priority_fee is not None:
+            return self.priority_fee
+        return self.__get_cached("priority_fee", lambda: self.w3.eth.max_priority_fee)
+
+    def is_eip1559(self) -> bool:
+        if self.strategy == AUTO:
+            return self.get_base_fee() is not None
+        return self.strategy == EIP1559
+
+    def get_fee_params(self) -> TxParams:
+        """The fee fields of a transaction"""
+        if not self.is_eip1559():
+            return {"gasPrice": self.get_gas_price()}
+        return self._get_eip1559_fee_params(self.get_base_fee(), self.get_priority_fee())
+
+    def get_expected_gas_price(self) -> int:
+        """Price per gas a transaction sent now is expected to pay, lower than maxFeePerGas with EIP-1559"""
+        if not self.is_eip1559():
+            return self.get_gas_price()
+        return self.get_base_fee() + self.get_priority_fee()
+
+    def fill_fee_params(self, tx_params: TxParams) -> TxParams:
+        """Add the fee fields to `tx_params`, unless it already has some"""
+        if not self._has_fee_params(tx_params):
+            tx_params.update(self.get_fee_params())
+        return tx_params
+
+    def get_effective_gas_price(self, tx_receipt: TxReceipt) -> int:
+        """Price paid per gas by a mined transaction"""
+        return tx_receipt.get("effectiveGasPrice") or self.get_gas_price()
+
+    def invalidate(self):
+        with self.__lock:
+            self.__cache.clear()
+
+    def __get_cached(self, key: str, fetch: Callable[[], Any]) -> Any:
+        with self.__lock:
+            fetched_at, value = self.__cache.get(key, (None, None))
+            if self._is_fresh(fetched_at):
+                return value
+        value = fetch()
+        with self.__lock:
+            self.__cache[key] = (monotonic(), value)
+        return value
+
+
+class AsyncFeeOracle(BaseFeeOracle):
+    """
+    FeeOracle for asynchronous web3 instances. Concurrent requests for the same fee share a single fetch.
+    """
+
+    def __init__(self, w3: Web3, *args, **kwargs):
+        """
+        :param w3: A web3 instance with the AsyncEth module. The other arguments are the ones of BaseFeeOracle
+        """
+        super().__init__(*args, **kwargs)
+        self.w3 = w3
+        self.__cache: Dict[str, Tuple[float, "asyncio.Future"]] = dict()
+
+    async def get_gas_price(self) -> int:
+        return await self.__get_cached("gas_price", lambda: self.w3.eth.gas_price)
+
+    async def get_base_fee(self) -> Optional[int]:
+        """Base fee of the latest block, None before EIP-1559"""
+        return await self.__get_cached("base_fee", self.__fetch_base_fee)
+
+    async def get_priority_fee(self) -> int:
+        if self.priority_fee is not None:
+            return self.priority_fee
+        return await self.__get_cached("priority_fee", lambda: self.w3.eth.max_priority_fee)
+
+    async def is_eip1559(self) -> bool:
+        if self.strategy == AUTO:
+            return await self.get_base_fee() is not None
+        return self.strategy == EIP1559
+
+    async def get_fee_params(self) -> TxParams:
+        """The fee fields of a transaction"""
+        if not await self.is_eip1559():
+            return {"gasPrice": await self.get_gas_price()}
+        return self._get_eip1559_fee_params(await self.get_base_fee(), await self.get_priority_fee())
+
+    async def get_expected_gas_price(self) -> int:
+        if not await self.is_eip1559():
+            return await self.get_gas_price()
+        return await self.get_base_fee() + await self.get_priority_fee()
+
+    async def fill_fee_params(self, tx_params: TxParams) -> TxParams:
+        """Add the fee fields to `tx_params`, unless it already has some"""
+        if not self._has_fee_params(tx_params):
+            tx_params.update(await self.get_fee_params())
+        return tx_params
+
+    async def get_effective_gas_price(self, tx_receipt: TxReceipt) -> int:
+        """Price paid per gas by a mined transaction"""
+        return tx_receipt.get("effectiveGasPrice") or await self.get_gas_price()
+
+    def invalidate(self):
+        self.__cache.clear()
+
+    async def __fetch_base_fee(self) -> Optional[int]:
+        return (await self.w3.eth.get_block("latest")).get("baseFeePerGas")
+
+    async def __get_cached(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        fetched_at, future = self.__cache.get(key, (None, None))
+        if not self._is_fresh(fetched_at) or (future.done() and (future.cancelled() or future.exception())):
+            future = asyncio.ensure_future(fetch())
+            self.__cache[key] = (monotonic(), future)
+        return await asyncio.shield(future)
@@ -0,0 +1,62 @@
+from dataclasses import dataclass, field, asdict
+from typing import *
+
+import json
+import os
+
+from .store import hash_source
+
+BIND_CACHE_VERSION = 2
+
+
+@dataclass
+class BindResult:
+    source: str  # The processed source
+    imports: Dict[str, str] = field(default_factory=dict)  # Hash of every file in the import graph by url
+    files: Dict[str, Tuple[int, int]] = field(default_factory=dict)  # (size, mtime) of every local file read
+
+
+class BindCache(object):
+    """
+    On-disk cache of bind results.
+
+    Results are stored by the hash of the bound source and are valid for as long as none of the local files of its
+    import graph changed. Checking that takes a `stat` per file, so cached binds don't read or scan any imports.
+    """
+
+    def __init__(self, root: str, salt: str = ""):
+        self.root = root
+        self.__salt = f"{BIND_CACHE_VERSION}:{salt}:"
+
+    def get_key(self, source: str) -> str:
+        return hash_source(self.__salt + source)
+
+    def get(self, key: str) -> Optional[BindResult]:
+        try:
+            with open(self.__get_entry_path(key)) as fh:
+                data = json.load(fh)
+        except (FileNotFoundError, ValueError):
+            return None
+        result = BindResult(data["source"], data["imports"], {p: tuple(f) for p, f in data["files"].items()})
+        if any(self.stat(path) != stat for path, stat in result.files.items()):
+            return None
+        return result
+
+    def put(self, key: str, result: BindResult):
+        os.makedirs(self.root, exist_ok=True)
+        entry_path = self.__get_entry_path(key)
+        tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as fh:
+            json.dump(asdict(result), fh)
+        os.replace(tmp_path, entry_path)
+
+    @staticmethod
+    def stat(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def __get_entry_path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.json")
@@ -0,0 +1,10 @@
+class SolImportError(Exception):
+    pass
+
+
+class ImportIntegrityError(SolImportError):
+    pass
+
+
+class InvalidRemappingError(SolImportError):
+    pass
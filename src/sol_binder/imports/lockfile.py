@@ -0,0 +1,72 @@
+from dataclasses import dataclass, field, asdict
+from typing import *
+
+import json
+import os
+
+from filelock import FileLock
+
+DEFAULT_LOCK_FILENAME = "solbinder.lock"
+LOCK_VERSION = 2
+
+
+@dataclass
+class LockEntry:
+    hash: str  # sha256 of the import source
+    size: int  # Length of the source file in bytes, rejects a changed local copy before hashing it
+    # (import path as written, absolute url) of every import, None if it has to be scanned again
+    imports: Optional[List[Tuple[str, str]]] = field(default_factory=list)
+    mtime_ns: Optional[int] = None  # Of the local copy once checked against `hash`, it is hashed again if it differs
+
+
+class ImportLock(object):
+    """
+    The `solbinder.lock` manifest. Maps every import url to the hash of its content and to the imports it makes,
+    which pins the sources and allows resolving a fully cached import graph without scanning any of its files.
+    """
+
+    def __init__(self, path: str, remappings: str = ""):
+        """
+        :param remappings: Fingerprint of the import remappings the imports are resolved with
+        """
+        self.path = path
+        self.remappings = remappings
+        self.entries: Dict[str, LockEntry] = self.__read()
+
+    def get(self, url: str) -> Optional[LockEntry]:
+        return self.entries.get(url)
+
+    def update(self, entries: Dict[str, LockEntry]):
+        """Merge `entries` into the lockfile, keeping entries written by other processes in the meantime"""
+        if all(self.entries.get(url) == entry for url, entry in entries.items()):
+            return
+        with FileLock(f"{self.path}.filelock"):
+            self.entries = self.__read()
+            self.entries.update(entries)
+            self.__write()
+
+    def __read(self) -> Dict[str, LockEntry]:
+        if not os.path.isfile(self.path):
+            return dict()
+        with open(self.path) as fh:
+            data = json.load(fh)
+        # Older versions were scanned with a different scanner, and imports may resolve differently with other
+        # remappings. Keep the pins of such entries but scan them again
+        current = data.get("version") == LOCK_VERSION and data.get("remappings", "") == self.remappings
+        return {
+            url: LockEntry(entry["hash"], entry["size"],
+                           [tuple(imp) for imp in entry["imports"]] if current and entry["imports"] is not None else None,
+                           entry.get("mtime_ns"))
+            for url, entry in data["imports"].items()
+        }
+
+    def __write(self):
+        data = {
+            "version": LOCK_VERSION,
+            "remappings": self.remappings,
+            "imports": {url: asdict(entry) for url, entry in self.entries.items()},
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as fh:
+            json.dump(data, fh, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
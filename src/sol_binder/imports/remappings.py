@@ -0,0 +1,79 @@
+from typing import *
+
+import os
+
+from ..utils import PrefixTrie
+from .errors import InvalidRemappingError
+
+
+class Remapping(NamedTuple):
+    context: str
+    prefix: str
+    target: str
+
+    @classmethod
+    def parse(cls, remapping: str) -> "Remapping":
+        """Parse a solc-style remapping: `[context:]prefix=target`"""
+        key, separator, target = remapping.partition("=")
+        context, _, prefix = key.rpartition(":")
+        if not separator or not prefix:
+            raise InvalidRemappingError(f"Invalid import remapping '{remapping}', expected '[context:]prefix=target'")
+        return cls(context, prefix, target)
+
+    def __str__(self):
+        return f"{self.context}:{self.prefix}={self.target}" if self.context else f"{self.prefix}={self.target}"
+
+    def is_local(self) -> bool:
+        """Whether the target is a path rather than a url"""
+        return "://" not in self.target
+
+
+class Remappings(object):
+    """
+    solc-style import remappings.
+
+    Like solc, the remapping with the longest prefix wins, and a remapping with a context only applies to the imports
+    of files under that context. Targets and contexts that are relative paths are resolved against `base_path`, like
+    solc and Foundry resolve them against the project root.
+    """
+
+    def __init__(self, remappings: Iterable[Union[str, Remapping]] = (), base_path: Optional[str] = None):
+        """
+        :param base_path: Directory the relative path targets are resolved against, itself relative to the import
+               path so that the resolved imports (and the lockfile) don't depend on where the project is. Targets are
+               relative to the import path if None
+        """
+        self.base_path = base_path
+        self.remappings: List[Remapping] = [
+            r if isinstance(r, Remapping) else Remapping.parse(r) for r in remappings
+        ]
+        self.__trie: PrefixTrie[Remapping] = PrefixTrie()
+        # Within the same prefix, prefer the longest context
+        for remapping in sorted(self.remappings, key=lambda r: len(r.context), reverse=True):
+            self.__trie.add(remapping.prefix, remapping)
+
+    def __bool__(self):
+        return bool(self.remappings)
+
+    def apply(self, import_path: str, importer_url: Optional[str] = None) -> str:
+        """
+        :param importer_url: Url of the file that makes the import, None for the source being bound
+        """
+        for prefix, remapping in self.__trie.iter_matches(import_path):
+            if remapping.context and not (importer_url or "").startswith(self.__resolve(remapping.context)):
+                continue
+            return self.__resolve(remapping.target) + import_path[len(prefix):]
+        return import_path
+
+    def get_local_targets(self) -> List[str]:
+        """The targets that are paths, resolved against `base_path`"""
+        return [self.__resolve(r.target) for r in self.remappings if r.is_local()]
+
+    def get_fingerprint(self) -> str:
+        fingerprint = ",".join(str(r) for r in self.remappings)
+        return f"{fingerprint}@{self.base_path}" if self.base_path else fingerprint
+
+    def __resolve(self, path: str) -> str:
+        if self.base_path and "://" not in path and not os.path.isabs(path):
+            return os.path.join(self.base_path, path)
+        return path
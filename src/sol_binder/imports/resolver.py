@@ -0,0 +1,255 @@
+from concurrent.futures import ThreadPoolExecutor, Future, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import *
+
+import os
+
+from ..solbinder_logging import get_solbinder_logger
+from ..utils import normalize_url_path
+from .errors import ImportIntegrityError
+from .lockfile import ImportLock, LockEntry
+from .remappings import Remappings
+from .scanner import iter_import_urls
+from .store import ContentStore, hash_source
+from .validators import ValidatorCache
+
+if TYPE_CHECKING:
+    from ..retrievers.base import BaseRetriever
+
+DEFAULT_MAX_WORKERS = 8
+
+ImportEdge = Tuple[str, str]  # (import path as written in the source, absolute import url)
+
+
+@dataclass
+class ImportNode:
+    """A single file in the import graph"""
+    url: str
+    local_path: str
+    hash: str
+    size: int
+    edges: List[ImportEdge] = field(default_factory=list)
+    mtime_ns: Optional[int] = None  # Of the local copy, when it was last checked against `hash`
+
+
+class ImportResolver(object):
+    """
+    Retrieves the whole import graph of a solidity source using a bounded pool of workers.
+
+    Every file is retrieved once, no matter how many files import it. Retrieved sources are kept in a content
+    addressed store and pinned in the lockfile. Remote files that are locked and whose local copy matches the pinned
+    hash are resolved from the lockfile without being scanned, so only the parts of the graph that are missing or
+    changed are retrieved and scanned again. Local copies are only hashed again when their size or mtime changed
+    since they were last checked.
+
+    In refresh mode every remote file is revalidated with its retriever, and the pins of files that changed are
+    updated. Files that did not change cost a single conditional request.
+    """
+
+    def __init__(self, import_path: str, detect_retriever: Callable[[str], "BaseRetriever"],
+                 store: ContentStore, lock: ImportLock, validators: ValidatorCache,
+                 max_workers: int = DEFAULT_MAX_WORKERS, refresh: bool = False,
+                 remappings: Optional[Remappings] = None):
+        self.import_path = import_path
+        self.remappings = remappings or Remappings()
+        self.store = store
+        self.lock = lock
+        self.validators = validators
+        self.max_workers = max_workers
+        self.refresh = refresh
+        self.__detect_retriever = detect_retriever
+
+    def resolve(self, import_paths: Iterable[str]) -> Tuple[Dict[str, str], Dict[str, ImportNode]]:
+        """
+        :param import_paths: The imports of the source being bound
+        :return: Translations of every import path (as written in the sources) to the local path of the file,
+                 and every file in the import graph by url
+        """
+        root_edges = self.get_edges(import_paths, None, None)
+        nodes = self.resolve_graph(root_edges)
+        self.validators.save()
+        self.lock.update({url: LockEntry(node.hash, node.size, node.edges, node.mtime_ns)
+                          for url, node in nodes.items()})
+        return self.__collect_translations(root_edges, nodes, dict(), list()), nodes
+
+    def resolve_graph(self, root_edges: List[ImportEdge]) -> Dict[str, ImportNode]:
+        nodes: Dict[str, ImportNode] = dict()
+        scheduled: Set[str] = set()
+        pending: Set[Future] = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            def schedule(edges: List[ImportEdge]):
+                stack = [url for _, url in edges]
+                while stack:
+                    url = stack.pop()
+                    if url in scheduled:
+                        continue
+                    scheduled.add(url)
+                    node = self._load_from_lock(url)
+                    if node is None:
+                        pending.add(executor.submit(self._load, url))
+                    else:
+                        nodes[url] = node
+                        stack.extend(sub_url for _, sub_url in node.edges)
+
+            try:
+                schedule(root_edges)
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.discard(future)
+                        node: ImportNode = future.result()
+                        nodes[node.url] = node
+                        schedule(node.edges)
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+        return nodes
+
+    def get_edges(self, import_paths: Iterable[str], context_url: Optional[str],
+                  importer_url: Optional[str]) -> List[ImportEdge]:
+        """
+        :param context_url: The url relative imports are resolved against
+        :param importer_url: Url of the file that makes the imports, None for the source being bound
+        """
+        edges = []
+        for imp_path in import_paths:
+            if context_url is not None and imp_path.startswith("."):
+                url = normalize_url_path(os.path.join(context_url, imp_path))
+            else:
+                url = normalize_url_path(self.remappings.apply(imp_path, importer_url))
+            edges.append((imp_path, url))
+        return edges
+
+    def get_local_path(self, url: str) -> str:
+        retriever = self.__detect_retriever(url)
+        return os.path.normpath(os.path.join(self.import_path, retriever.get_local_path(url)))
+
+    def get_context_url(self, url: str) -> str:
+        """The url relative imports of `url` are resolved against"""
+        return self.__detect_retriever(url).get_dep_context(url) or os.path.dirname(url)
+
+    def _load_from_lock(self, url: str) -> Optional[ImportNode]:
+        """
+        :return: The node of a remote file as pinned by the lockfile, or None if it isn't locked, or its local copy
+                 is missing or does not match the pinned hash
+        """
+        if self.refresh or self.__detect_retriever(url).is_local():
+            return None
+        entry = self.lock.get(url)
+        if entry is None or entry.imports is None:
+            return None
+        local_path = self.get_local_path(url)
+        try:
+            stat = os.stat(local_path)
+            if stat.st_size != entry.size:
+                return None
+            if stat.st_mtime_ns != entry.mtime_ns:
+                with open(local_path, newline="") as fh:
+                    if hash_source(fh.read()) != entry.hash:
+                        return None
+        except FileNotFoundError:
+            return None
+        return ImportNode(url, local_path, entry.hash, entry.size, list(entry.imports), stat.st_mtime_ns)
+
+    def _load(self, url: str) -> ImportNode:
+        retriever = self.__detect_retriever(url)
+        if retriever is None:
+            raise NotImplementedError(f"No suitable retriever for {url}")
+        local_path = self.get_local_path(url)
+        entry = self.lock.get(url)
+        if os.path.exists(local_path):
+            get_solbinder_logger().info(f"Cached {local_path}")
+            with open(local_path, newline="") as fh:
+                source = fh.read()
+            digest = hash_source(source)
+            if entry is not None and entry.hash != digest and not retriever.is_local():
+                source, digest = self.__restore(url, entry.hash), entry.hash
+                self._write(local_path, source)
+            if self.refresh and not retriever.is_local():
+                source, digest = self.__revalidate(url, retriever, local_path, source, digest)
+        elif entry is not None and self.store.has(entry.hash) and not retriever.is_local() and not self.refresh:
+            source, digest = self.__restore(url, entry.hash), entry.hash
+            self._write(local_path, source)
+        else:
+            get_solbinder_logger().info(f"Downloading {local_path}")
+            result = retriever.fetch(url)
+            source, digest = result.source, hash_source(result.source)
+            if entry is not None and entry.hash != digest and not self.refresh:
+                raise ImportIntegrityError(f"Content of '{url}' does not match the hash pinned in {self.lock.path}")
+            if result.validators:
+                self.validators.set(url, result.validators)
+            self._write(local_path, source)
+        self.store.put(source, digest)
+        return ImportNode(url, local_path, digest, len(source.encode()),
+                          self.get_edges(iter_import_urls(source), self.get_context_url(url), url),
+                          os.stat(local_path).st_mtime_ns)
+
+    def __revalidate(self, url: str, retriever: "BaseRetriever", local_path: str,
+                     source: str, digest: str) -> Tuple[str, str]:
+        """Fetch `url` again, unless it did not change since the local copy was fetched"""
+        result = retriever.fetch(url, self.validators.get(url))
+        if result.source is None:
+            return source, digest
+        self.validators.set(url, result.validators)
+        new_digest = hash_source(result.source)
+        if new_digest == digest:
+            return source, digest
+        get_solbinder_logger().info(f"Updating {local_path}")
+        self._write(local_path, result.source)
+        return result.source, new_digest
+
+    def __restore(self, url: str, digest: str) -> str:
+        """Get the pinned source of `url` from the store"""
+        if not self.store.has(digest):
+            raise ImportIntegrityError(f"Local copy of '{url}' does not match the hash pinned in {self.lock.path}")
+        get_solbinder_logger().info(f"Restoring {url} from the import store")
+        source = self.store.get(digest)
+        if hash_source(source) != digest:
+            raise ImportIntegrityError(f"Stored object {digest} of '{url}' is corrupted")
+        return source
+
+    @staticmethod
+    def _write(local_path: str, source: str):
+        get_solbinder_logger().info(f"Writing {local_path}")
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        # Several urls may map to the same local file, so never expose a partially written one
+        tmp_path = f"{local_path}.{os.getpid()}.{id(source)}.tmp"
+        with open(tmp_path, "w", newline="") as fh:
+            fh.write(source)
+        os.replace(tmp_path, local_path)
+
+    def verify(self) -> List[str]:
+        """
+        Check every locked import against its pinned hash, reading all of them.
+
+        :return: Urls of the imports whose stored object or local copy does not match the lockfile
+        """
+        mismatched = []
+        for url, entry in self.lock.entries.items():
+            if self.__detect_retriever(url).is_local():
+                continue
+            local_path = self.get_local_path(url)
+            if not self.store.verify(entry.hash):
+                mismatched.append(url)
+            elif os.path.exists(local_path):
+                with open(local_path, newline="") as fh:
+                    if hash_source(fh.read()) != entry.hash:
+                        mismatched.append(url)
+        return mismatched
+
+    def __collect_translations(self, edges: List[ImportEdge], nodes: Dict[str, ImportNode],
+                               memo: Dict[str, Dict[str, str]], visiting: List[str]) -> Dict[str, str]:
+        translations = dict()
+        for imp_path, url in edges:
+            node = nodes[url]
+            translations[imp_path] = node.local_path
+            if url in visiting:
+                cycle = " -> ".join(visiting[visiting.index(url):] + [url])
+                get_solbinder_logger().warning(f"Import cycle detected: {cycle}")
+                continue
+            if url not in memo:
+                visiting.append(url)
+                memo[url] = self.__collect_translations(node.edges, nodes, memo, visiting)
+                visiting.pop()
+            translations.update(memo[url])
+        return translations
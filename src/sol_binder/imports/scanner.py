@@ -0,0 +1,87 @@
+from typing import *
+
+import re
+
+# Tokens that can hide or contain an import statement. Everything in between is skipped by the regex engine.
+TOKEN_RE = re.compile(r"""
+      /(?: /[^\n]*                       # line comment
+         | \*[^*]*\*+(?:[^/*][^*]*\*+)*/  # block comment
+       )
+    | "[^"\\\n]*(?:\\.[^"\\\n]*)*"     # string literals
+    | '[^'\\\n]*(?:\\.[^'\\\n]*)*'
+    | (?P<import>import)\b
+""", re.VERBOSE)
+
+_IDENTIFIER_CHAR_RE = re.compile(r"[\w$]")
+
+_PATH = r"""(?:"(?P<{0}_dq>[^"\n]*)"|'(?P<{0}_sq>[^'\n]*)')"""
+
+# Everything following the `import` keyword, in any of the forms:
+#   import "path";
+#   import "path" as Name;
+#   import * as Name from "path";
+#   import {A, B as C} from "path";
+DIRECTIVE_RE = re.compile(r"""
+    \s*
+    (?:
+        {direct} (?:\s*as\s+\w+)?
+      | (?:\*\s*as\s+\w+ | \{{[^}}]*\}} | \w+(?:\s+as\s+\w+)?) \s*from\s* {from_}
+    )
+    \s*;
+""".format(direct=_PATH.format("direct"), from_=_PATH.format("from")), re.VERBOSE)
+
+
+class ImportDirective(NamedTuple):
+    path: str
+    start: int  # Offset of the import path in the source, without the quotes
+    end: int
+
+
+def iter_import_directives(source: str) -> Iterator[ImportDirective]:
+    """Yield every import statement of a solidity source in a single pass, ignoring comments and string literals"""
+    # Nothing after the last occurrence of the keyword can be an import, so don't tokenize past it
+    last_candidate = source.rfind("import")
+    pos = 0
+    while pos <= last_candidate:
+        token = TOKEN_RE.search(source, pos)
+        if token is None:
+            return
+        pos = token.end()
+        if token.group("import") is None:
+            continue
+        if token.start() > 0 and _IDENTIFIER_CHAR_RE.match(source, token.start() - 1):
+            # Not the keyword but the end of a longer identifier, e.g. `reimport`
+            continue
+        directive = DIRECTIVE_RE.match(source, pos)
+        if directive is None:
+            continue
+        for group in ("direct_dq", "direct_sq", "from_dq", "from_sq"):
+            if directive.group(group) is not None:
+                yield ImportDirective(directive.group(group), directive.start(group), directive.end(group))
+                break
+        pos = directive.end()
+
+
+def iter_import_urls(source: str) -> Iterator[str]:
+    """Yield the path of every import statement in a solidity source, in order of appearance"""
+    for directive in iter_import_directives(source):
+        yield directive.path
+
+
+def rewrite_imports(source: str, translations: Dict[str, str],
+                    directives: Optional[Iterable[ImportDirective]] = None) -> str:
+    """
+    Replace the path of every import statement with its translation, leaving the rest of the source untouched
+
+    :param directives: The import directives of `source`, if it has already been scanned
+    """
+    if directives is None:
+        directives = iter_import_directives(source)
+    chunks = []
+    pos = 0
+    for directive in directives:
+        chunks.append(source[pos:directive.start])
+        chunks.append(translations[directive.path])
+        pos = directive.end
+    chunks.append(source[pos:])
+    return "".join(chunks)
@@ -0,0 +1,39 @@
+from typing import *
+
+import hashlib
+import os
+
+
+def hash_source(source: str) -> str:
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+class ContentStore(object):
+    """Immutable store of import sources, addressed by the sha256 of their content"""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def get_object_path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:])
+
+    def has(self, digest: str) -> bool:
+        return os.path.isfile(self.get_object_path(digest))
+
+    def get(self, digest: str) -> str:
+        with open(self.get_object_path(digest), newline="") as fh:
+            return fh.read()
+
+    def put(self, source: str, digest: Optional[str] = None) -> str:
+        digest = digest or hash_source(source)
+        object_path = self.get_object_path(digest)
+        if not os.path.isfile(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            tmp_path = f"{object_path}.{os.getpid()}.{id(source)}.tmp"
+            with open(tmp_path, "w", newline="") as fh:
+                fh.write(source)
+            os.replace(tmp_path, object_path)
+        return digest
+
+    def verify(self, digest: str) -> bool:
+        return self.has(digest) and hash_source(self.get(digest)) == digest
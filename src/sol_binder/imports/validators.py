@@ -0,0 +1,39 @@
+from threading import Lock
+from typing import *
+
+import json
+import os
+
+
+class ValidatorCache(object):
+    """The http validators (ETag, Last-Modified) of every fetched import, used to revalidate the local copies"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.__lock = Lock()
+        self.__dirty = False
+        try:
+            with open(path) as fh:
+                self.__validators: Dict[str, Dict[str, str]] = json.load(fh)
+        except (FileNotFoundError, ValueError):
+            self.__validators = dict()
+
+    def get(self, url: str) -> Optional[Dict[str, str]]:
+        return self.__validators.get(url)
+
+    def set(self, url: str, validators: Dict[str, str]):
+        with self.__lock:
+            if self.__validators.get(url) != validators:
+                self.__validators[url] = validators
+                self.__dirty = True
+
+    def save(self):
+        with self.__lock:
+            if not self.__dirty:
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as fh:
+                json.dump(self.__validators, fh)
+            os.replace(tmp_path, self.path)
+            self.__dirty = False
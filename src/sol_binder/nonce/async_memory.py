@@ -0,0 +1,76 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import *
+
+from eth_typing import HexAddress
+from web3 import Web3
+from web3.types import Nonce
+
+from ..solbinder_logging import get_solbinder_logger
+from ..utils import expand
+
+
+class AsyncMemoryNonceManager(object):
+    """
+    In-memory nonce manager for asynchronous web3 instances, see AbstractNonceManager.
+
+    Every account has its own asyncio lock, so transactions of different accounts never wait for each other. It only
+    coordinates the coroutines of one process, like the "local" nonce manager does for threads.
+    """
+
+    def __init__(self, w3: Web3):
+        """
+        :param w3: A web3 instance with the AsyncEth module
+        """
+        self.w3 = w3
+        self._nonces: Dict[HexAddress, Nonce] = dict()
+        self._suspected_desync: Set[HexAddress] = set()
+        self.__locks: Dict[HexAddress, asyncio.Lock] = dict()
+
+    def _tracked_accounts(self) -> List[HexAddress]:
+        return list(self._nonces.keys())
+
+    async def sync_from_chain(self, new_accounts: Iterable[HexAddress] = tuple()):
+        accounts = list(dict.fromkeys(self._tracked_accounts() + list(new_accounts)))
+        counts = await asyncio.gather(*(self.w3.eth.get_transaction_count(account) for account in accounts))
+        self._nonces.update(zip(accounts, counts))
+
+    async def _sync_from_chain(self, account: HexAddress):
+        self._nonces[account] = await self.w3.eth.get_transaction_count(account)
+
+    @asynccontextmanager
+    async def advance_nonce(self, account: HexAddress) -> AsyncIterator[Nonce]:
+        async with self.__get_lock(account):
+            if account not in self._nonces or account in self._suspected_desync:
+                await self._sync_from_chain(account)
+            current_nonce = self._nonces[account]
+            try:
+                yield current_nonce
+            except Exception as e:
+                exception_types = [type(e)] + [type(exc) for exc in expand(lambda exc: exc.__context__, e)]
+                if asyncio.TimeoutError in exception_types:
+                    # The transaction may have been sent anyway
+                    get_solbinder_logger().warning(f"Nonce of {account} may be out of sync, it will be re-synced")
+                    self._suspected_desync.add(account)
+                raise e
+            else:
+                self._nonces[account] = Nonce(current_nonce + 1)
+                self._suspected_desync.discard(account)
+
+    async def reserve_nonces(self, account: HexAddress, count: int) -> List[Nonce]:
+        """
+        Reserve `count` consecutive nonces at once, so that several transactions can be broadcast without waiting
+        for each other. If some of them end up not being sent, call `sync_from_chain` to release the rest.
+        """
+        async with self.__get_lock(account):
+            if account not in self._nonces or account in self._suspected_desync:
+                await self._sync_from_chain(account)
+            first_nonce = self._nonces[account]
+            self._nonces[account] = Nonce(first_nonce + count)
+            self._suspected_desync.discard(account)
+        return [Nonce(first_nonce + i) for i in range(count)]
+
+    def __get_lock(self, account: HexAddress) -> asyncio.Lock:
+        if account not in self.__locks:
+            self.__locks[account] = asyncio.Lock()
+        return self.__locks[account]
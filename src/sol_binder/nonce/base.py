@@ -8,6 +8,7 @@ from web3 import Web3
 from web3.types import Nonce
 from requests.exceptions import ReadTimeout
 
+from ..rpc_batch import get_transaction_counts
 from ..solbinder_logging import get_solbinder_logger
 from ..utils import expand
 
@@ -58,8 +59,10 @@ class AbstractNonceManager(object):
         raise NotImplementedError
 
     def sync_from_chain(self, new_accounts: List[HexAddress] = tuple()):
-        for account in self._tracked_accounts() + list(new_accounts):
-            self._sync_from_chain(account)
+        accounts = list(dict.fromkeys(self._tracked_accounts() + list(new_accounts)))
+        # The transaction counts of all the accounts in a single batch request
+        for account, transaction_count in get_transaction_counts(self.__w3, accounts).items():
+            self._set(account, transaction_count)
 
     def _sync_from_chain(self, account: HexAddress):
         return self._set(account, self.__w3.eth.get_transaction_count(account))
@@ -95,6 +98,19 @@ class AbstractNonceManager(object):
                 self._set(account, current_nonce + 1)
                 self._suspected_desync.discard(account)
 
+    def reserve_nonces(self, account: HexAddress, count: int) -> List[Nonce]:
+        """
+        Reserve `count` consecutive nonces at once, so that several transactions can be broadcast without waiting
+        for each other. If some of them end up not being sent, call `sync_from_chain` to release the rest.
+        """
+        with self._lock_context():
+            if account in self._suspected_desync:
+                self._sync_from_chain(account)
+            first_nonce = self._get(account)
+            self._set(account, first_nonce + count)
+            self._suspected_desync.discard(account)
+        return [Nonce(first_nonce + i) for i in range(count)]
+
     def _get(self, account: HexAddress):
         """Get the next nonce to use"""
         raise NotImplementedError
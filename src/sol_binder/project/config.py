@@ -9,13 +9,24 @@ from dataclasses import asdict
 
 import click
 import yaml
+from ens import ENS
 from eth_typing import HexAddress
-from web3 import Web3
+from web3 import Web3, AsyncHTTPProvider
+from web3.eth import AsyncEth
 from web3.contract import Contract
 
+from ..compilation.artifacts import ArtifactCache, DEFAULT_MAX_CACHE_BYTES
+from ..compilation.build_graph import BuildGraph
+from ..contracts.read_cache import ReadCache
+from ..fee_oracle import FeeOracle, AsyncFeeOracle
+from ..nonce.async_memory import AsyncMemoryNonceManager
 from ..nonce.base import AbstractNonceManager
 from ..project.errors import NoContractsFoundError, ProjectConfigLocationError, ProjectConfigLoadError, \
-    UnknownNonceManagerType, ProjectConfigAlreadyExistsError
+    UnknownNonceManagerType, ProjectConfigAlreadyExistsError, DeploymentNotFoundError
+from ..project.manifest import DeploymentManifest
+from ..receipt_waiter import ReceiptWaiter
+from ..rpc_batch import BatchHTTPProvider
+from ..solbinder_logging import get_solbinder_logger
 from ..tx_logging import BaseTransactionLogger, FileTransactionLogger, MongoTransactionLog
 from ..utils import basename_without_ext
 
@@ -38,6 +49,7 @@ if TYPE_CHECKING:
         url: str
         network_id: int
         account_address: str
+        multicall_address: str  # Optional, a Multicall aggregator to batch reads with
 
 
 class UnknownDeploymentPlanError(Exception):
@@ -61,6 +73,7 @@ class ContractDeploymentData:
     w3_url: str
     source_hash: str  # Hashed source-code of the contract
     deployment_cost_wei: int  # How much we paid when we deployed this contract
+    deployment_gas_used: Optional[int] = None  # Gas used by the deployment transaction
 
     def _get_raw_instance(self, w3: "Web3" = None) -> "Contract":
         """TODO: This is for testing only, we should move this to some test_util class later on"""
@@ -82,11 +95,18 @@ class ProjectConfig(object):
     deploy_cache_dir: str = ".solbinder/deployments"
     transaction_cache_dir: str = ".solbinder/transactions"
     imports_cache_dir: str = ".solbinder/import_cache"
+    artifacts_cache_dir: str = ".solbinder/artifacts"
+    artifacts_cache_max_bytes: int = DEFAULT_MAX_CACHE_BYTES
+    build_graph_file: str = ".solbinder/build_graph.json"
     default_network: str = "dev"
     solc_version: str = "0.8.6"
     tx_logger: Dict = None
     deployments: Optional[Dict[str, Union[str, List[Any], Dict[str, List[Any]]]]] = None
     nonce: Optional[Dict[str, Union[List, Dict, str]]] = None
+    import_archives: Optional[Dict[str, str]] = None  # Import prefix -> path or url of a release archive serving it
+    remappings: Optional[List[str]] = None  # solc-style import remappings: "[context:]prefix=target"
+    # Contract filename -> {"solc_version": ..., "settings": {...}} for contracts that don't use the project defaults
+    compiler_overrides: Optional[Dict[str, Dict[str, Any]]] = None
     __nonce_manager_types = dict()
     __nonce_manager_by_network = dict()
     __cached_w3_instances = dict()
@@ -94,6 +114,15 @@ class ProjectConfig(object):
     def __post_init__(self, *args, **kwargs):
         self.__ensure_abs_paths(self.project_root)
         self.__register_default_nonce_managers()
+        self.__artifact_cache: Optional[ArtifactCache] = None
+        self.__build_graph: Optional[BuildGraph] = None
+        self.__manifests: Dict[str, DeploymentManifest] = dict()
+        self.__fee_oracles: Dict[str, FeeOracle] = dict()
+        self.__read_caches: Dict[str, Optional[ReadCache]] = dict()
+        self.__receipt_waiters: Dict[str, ReceiptWaiter] = dict()
+        self.__async_w3_instances: Dict[str, Web3] = dict()
+        self.__async_fee_oracles: Dict[str, AsyncFeeOracle] = dict()
+        self.__async_nonce_managers: Dict[str, AsyncMemoryNonceManager] = dict()
 
     @classmethod
     def register_nonce_manager_type(cls, nonce_manager_class: Type[AbstractNonceManager]):
@@ -114,7 +143,8 @@ class ProjectConfig(object):
 
     def __ensure_abs_paths(self, project_root: Union[Path, str]):
         project_root = str(project_root)
-        for attr_name in ["contracts_dir", "deploy_cache_dir", "imports_cache_dir"]:
+        for attr_name in ["contracts_dir", "deploy_cache_dir", "imports_cache_dir", "artifacts_cache_dir",
+                          "build_graph_file"]:
             current_value = getattr(self, attr_name)
             if not os.path.isabs(current_value):
                 setattr(self, attr_name, os.path.join(project_root, current_value))
@@ -129,9 +159,117 @@ class ProjectConfig(object):
             network = self.default_network
         if network not in self.__cached_w3_instances:
             web3url = self.get_w3_url(network)
-            self.__cached_w3_instances[network] = Web3(Web3.HTTPProvider(web3url))
+            w3 = Web3(BatchHTTPProvider(web3url))
+            # Web3 builds a new ENS instance every time a contract address is normalized unless one is set
+            w3.ens = ENS.from_web3(w3)
+            self.__cached_w3_instances[network] = w3
         return self.__cached_w3_instances[network]
 
+    def get_fee_oracle(self, network: Optional[str] = None) -> FeeOracle:
+        """
+        The fee oracle of a network, configured by the optional `fees` section of the network:
+        strategy ("legacy", "eip1559" or "auto"), ttl (seconds), priority_fee_gwei and base_fee_multiplier
+        """
+        if network is None:
+            network = self.default_network
+        if network not in self.__fee_oracles:
+            self.__fee_oracles[network] = FeeOracle(self.get_w3(network), **self.__get_fee_config(network))
+        return self.__fee_oracles[network]
+
+    def get_async_w3(self, network: Optional[str] = None) -> Web3:
+        """A web3 instance of the network for asyncio code, whose `eth` methods are coroutines"""
+        if network is None:
+            network = self.default_network
+        if network not in self.__async_w3_instances:
+            self.__async_w3_instances[network] = Web3(AsyncHTTPProvider(self.get_w3_url(network)),
+                                                      modules={"eth": (AsyncEth,)}, middlewares=[])
+        return self.__async_w3_instances[network]
+
+    def get_async_fee_oracle(self, network: Optional[str] = None) -> AsyncFeeOracle:
+        """Same as `get_fee_oracle`, for `get_async_w3`"""
+        if network is None:
+            network = self.default_network
+        if network not in self.__async_fee_oracles:
+            self.__async_fee_oracles[network] = AsyncFeeOracle(self.get_async_w3(network),
+                                                               **self.__get_fee_config(network))
+        return self.__async_fee_oracles[network]
+
+    def get_async_nonce_manager(self, network: Optional[str] = None) -> AsyncMemoryNonceManager:
+        """
+        The nonce manager of the network for `get_async_w3`. It is in-memory, whatever the nonce config: the
+        instances sending transactions from the same account must share it
+        """
+        if network is None:
+            network = self.default_network
+        if network not in self.__async_nonce_managers:
+            self.__async_nonce_managers[network] = AsyncMemoryNonceManager(self.get_async_w3(network))
+        return self.__async_nonce_managers[network]
+
+    def __get_fee_config(self, network: str) -> Dict[str, Any]:
+        fees = dict(self.get_network_info(network).get("fees") or dict())
+        if "priority_fee_gwei" in fees:
+            fees["priority_fee"] = Web3.toWei(fees.pop("priority_fee_gwei"), "gwei")
+        return fees
+
+    def get_read_cache(self, network: Optional[str] = None) -> Optional[ReadCache]:
+        """
+        The cache of contract reads of a network, None unless enabled by the optional `read_cache` section of the
+        network: `true`, or max_size and block_poll_interval (seconds)
+        """
+        if network is None:
+            network = self.default_network
+        if network not in self.__read_caches:
+            read_cache = self.get_network_info(network).get("read_cache")
+            if read_cache is True:
+                read_cache = dict()
+            self.__read_caches[network] = ReadCache(self.get_w3(network), **read_cache) if read_cache else None
+        return self.__read_caches[network]
+
+    def get_receipt_waiter(self, network: Optional[str] = None) -> ReceiptWaiter:
+        """
+        The receipt waiter of a network, configured by the optional `receipts` section of the network:
+        confirmations, timeout (seconds) and block_poll_interval (seconds)
+        """
+        if network is None:
+            network = self.default_network
+        if network not in self.__receipt_waiters:
+            self.__receipt_waiters[network] = ReceiptWaiter(self.get_w3(network),
+                                                            **(self.get_network_info(network).get("receipts") or {}))
+        return self.__receipt_waiters[network]
+
+    def get_artifact_cache(self) -> ArtifactCache:
+        if self.__artifact_cache is None:
+            self.__artifact_cache = ArtifactCache(self.artifacts_cache_dir, self.artifacts_cache_max_bytes)
+        return self.__artifact_cache
+
+    def get_build_graph(self) -> BuildGraph:
+        if self.__build_graph is None:
+            self.__build_graph = BuildGraph(self.build_graph_file)
+        return self.__build_graph
+
+    def get_compiler_config(self, filepath: str, default_solc_version: Optional[str] = None) -> Tuple[str, Dict]:
+        """
+        :param default_solc_version: Version to use if the contract doesn't override it, defaults to `solc_version`.
+               The `compiler_overrides` of a contract take precedence over it
+        :return: solc version and standard-JSON settings to compile the contract at `filepath` with
+        """
+        override = (self.compiler_overrides or dict()).get(os.path.basename(filepath), dict())
+        if override.get("solc_version") and default_solc_version is not None and \
+                str(default_solc_version) not in (str(self.solc_version), str(override["solc_version"])):
+            get_solbinder_logger().warning(f"{os.path.basename(filepath)} is compiled with solc "
+                                           f"{override['solc_version']} from compiler_overrides, "
+                                           f"not {default_solc_version}")
+        solc_version = override.get("solc_version") or default_solc_version or self.solc_version
+        return str(solc_version), dict(override.get("settings") or dict())
+
+    def get_solc_versions(self) -> Set[str]:
+        """Every solc version (or version specifier) the project's contracts are compiled with"""
+        versions = {str(self.solc_version)}
+        for override in (self.compiler_overrides or dict()).values():
+            if override.get("solc_version"):
+                versions.add(str(override["solc_version"]))
+        return versions
+
     def get_nonce_manager_args(self) -> Union[list, dict]:
         return self.nonce['args'] if self.nonce else None
 
@@ -165,6 +303,9 @@ class ProjectConfig(object):
                 raise RuntimeError(f"Unrecognized transaction logger: {type_}")
 
     def get_nonce_manager(self, network: Optional[str] = None) -> AbstractNonceManager:
+        if network is None:
+            # Nonce managers are shared by network name, the default network must not get one of its own
+            network = self.default_network
         nonce_config = self.get_nonce_config(network)
         return self.__get_nonce_manager(network, nonce_config)
 
@@ -203,9 +344,31 @@ class ProjectConfig(object):
     def get_deployment_filepath(self, contract_name: str) -> str:
         return os.path.normpath(os.path.join(self.deploy_cache_dir, f"{contract_name}.json"))
 
-    def get_deployment_data(self, contract_name: str) -> ContractDeploymentData:
-        with open(self.get_deployment_filepath(contract_name)) as fh:
-            return ContractDeploymentData(**json.load(fh))
+    def get_deployment_manifest(self, network: Optional[str] = None) -> DeploymentManifest:
+        if network is None:
+            network = self.default_network
+        if network not in self.__manifests:
+            path = os.path.normpath(os.path.join(self.deploy_cache_dir, f"{network}.manifest.json"))
+            self.__manifests[network] = DeploymentManifest(path)
+        return self.__manifests[network]
+
+    def get_deployment_data(self, contract_name: str, network: Optional[str] = None) -> ContractDeploymentData:
+        """
+        :raises DeploymentNotFoundError: If the contract wasn't deployed on the network
+        """
+        deployment_data = self.get_deployment_manifest(network).get(contract_name)
+        if deployment_data is not None:
+            return deployment_data
+        # Deployments made before the manifest are in a file of their own
+        try:
+            with open(self.get_deployment_filepath(contract_name)) as fh:
+                return ContractDeploymentData(**json.load(fh))
+        except FileNotFoundError:
+            raise DeploymentNotFoundError(f"Contract '{contract_name}' is not deployed")
+
+    def save_deployment_data(self, deployments: Dict[str, ContractDeploymentData], network: Optional[str] = None):
+        """Save deployments by contract name to the deployment manifest of the network"""
+        self.get_deployment_manifest(network).update(deployments)
 
     def get_network_info(self, network_name: Optional[str] = None) -> "NetworkInfo":
         if network_name is None:
@@ -223,8 +386,8 @@ class ProjectConfig(object):
 
     def iter_deployment_plans(self) -> Iterator[ProjectContractDeployment]:
         if not self.deployments:
-            for name, filepath in self.get_contract_filepath_by_name():
-                yield ProjectContractDeployment(filepath, name, [])
+            for name, filepath in self.get_contract_filepath_by_name().items():
+                yield ProjectContractDeployment(name, filepath, [])
             return
         instances: List[ProjectContractDeployment] = []
         for filename, deployment_plan in self.deployments.items():
@@ -24,3 +24,7 @@ class NoContractsFoundError(ProjectConfigError):
 
 class UnknownNonceManagerType(ProjectConfigError):
     pass
+
+
+class DeploymentNotFoundError(ProjectError, FileNotFoundError):
+    pass
@@ -0,0 +1,100 @@
+from dataclasses import asdict
+from threading import Lock
+from typing import *
+
+import hashlib
+import json
+import os
+
+from filelock import FileLock
+
+if TYPE_CHECKING:
+    from .config import ContractDeploymentData
+
+MANIFEST_VERSION = 1
+
+
+def hash_abi(abi: List[Dict]) -> str:
+    return hashlib.sha256(json.dumps(abi, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+class DeploymentManifest(object):
+    """
+    Every deployment of a project on one network, in a single file.
+
+    ABIs are stored once, by hash, and deployments refer to them, so instances of the same contract share one ABI.
+    The file is loaded on first use and kept in memory for as long as its mtime doesn't change. Parsed ABIs are shared
+    between the deployment data returned, and must not be modified.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.__lock = Lock()
+        self.__stat: Optional[Tuple[int, int]] = None
+        self.__abis: Dict[str, List[Dict]] = dict()
+        self.__deployments: Dict[str, Dict[str, Any]] = dict()
+
+    def get(self, name: str) -> Optional["ContractDeploymentData"]:
+        from .config import ContractDeploymentData
+        with self.__lock:
+            self.__refresh()
+            entry = self.__deployments.get(name)
+            if entry is None:
+                return None
+            fields = dict(entry)
+            abi = self.__abis[fields.pop("abi_hash")]
+        return ContractDeploymentData(abi=abi, **fields)
+
+    def get_names(self) -> List[str]:
+        with self.__lock:
+            self.__refresh()
+            return sorted(self.__deployments)
+
+    def update(self, deployments: Dict[str, "ContractDeploymentData"]):
+        """Add or replace deployments, keeping the ones written by other processes in the meantime"""
+        if not deployments:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with FileLock(f"{self.path}.filelock"), self.__lock:
+            self.__refresh()
+            for name, deployment_data in deployments.items():
+                fields = asdict(deployment_data)
+                abi = fields.pop("abi")
+                abi_hash = hash_abi(abi)
+                self.__abis.setdefault(abi_hash, abi)
+                self.__deployments[name] = dict(fields, abi_hash=abi_hash)
+            # Drop the ABIs of replaced deployments
+            used = {entry["abi_hash"] for entry in self.__deployments.values()}
+            self.__abis = {abi_hash: abi for abi_hash, abi in self.__abis.items() if abi_hash in used}
+            self.__write()
+
+    def __refresh(self):
+        stat = self.__get_stat()
+        if stat == self.__stat:
+            return
+        if stat is None:
+            self.__abis, self.__deployments = dict(), dict()
+        else:
+            with open(self.path) as fh:
+                data = json.load(fh)
+            self.__abis, self.__deployments = data["abis"], data["deployments"]
+        self.__stat = stat
+
+    def __write(self):
+        data = {
+            "version": MANIFEST_VERSION,
+            "abis": self.__abis,
+            "deployments": self.__deployments,
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as fh:
+            json.dump(data, fh, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.__stat = self.__get_stat()
+
+    def __get_stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
@@ -0,0 +1,170 @@
+from concurrent.futures import Future
+from threading import Thread, Condition
+from time import monotonic, sleep
+from typing import *
+
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.exceptions import TimeExhausted
+from web3.types import TxReceipt
+
+from .rpc_batch import get_transaction_receipts
+from .solbinder_logging import get_solbinder_logger
+
+DEFAULT_RECEIPT_TIMEOUT = 120
+DEFAULT_BLOCK_POLL_INTERVAL = 1.0  # Seconds between two checks of the latest block number
+
+
+class _Waiter(NamedTuple):
+    future: "Future[TxReceipt]"
+    confirmations: int
+    timeout: float
+    added_at: float
+
+
+class ReceiptWaiter(object):
+    """
+    Waits for the receipts of any number of transactions of a network, from a single background thread.
+
+    The thread asks for the latest block number every `block_poll_interval` seconds, and fetches the receipts of all
+    the pending transactions at once, in one batch request, when a new block is mined. The transactions added in the
+    meantime get their receipts fetched at the next check, in case they are already mined. The number of requests thus
+    grows with the number of blocks, not with the number of transactions waited for.
+
+    The thread stops when no transaction is pending, and is started again by the next one.
+    """
+
+    def __init__(self, w3: Web3, confirmations: int = 0, timeout: float = DEFAULT_RECEIPT_TIMEOUT,
+                 block_poll_interval: float = DEFAULT_BLOCK_POLL_INTERVAL):
+        """
+        :param confirmations: Default number of blocks mined on top of the one of a transaction before its receipt
+               is returned. 0 returns it as soon as the transaction is mined
+        :param timeout: Default seconds after which a transaction that isn't confirmed fails with TimeExhausted
+        """
+        self.w3 = w3
+        self.confirmations = confirmations
+        self.timeout = timeout
+        self.block_poll_interval = block_poll_interval
+        self.__condition = Condition()
+        self.__waiters: Dict[HexBytes, List[_Waiter]] = dict()
+        self.__unchecked: Set[HexBytes] = set()  # Added since the last check
+        self.__block_number: Optional[int] = None
+        self.__thread: Optional[Thread] = None
+
+    def wait(self, tx_hash: Union[HexBytes, str], confirmations: Optional[int] = None, timeout: Optional[float] = None,
+             callback: Optional[Callable[["Future[TxReceipt]"], Any]] = None) -> "Future[TxReceipt]":
+        """
+        Wait for a transaction in the background
+
+        :param confirmations: Defaults to the one of the waiter
+        :param timeout: Defaults to the one of the waiter
+        :param callback: Called with the future once it is done, from the thread of the waiter. It must not block
+        :return: A future of the receipt, which fails with TimeExhausted after `timeout` seconds
+        """
+        tx_hash = HexBytes(tx_hash)
+        confirmations = self.confirmations if confirmations is None else confirmations
+        timeout = self.timeout if timeout is None else timeout
+        future: "Future[TxReceipt]" = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+        with self.__condition:
+            self.__waiters.setdefault(tx_hash, []).append(_Waiter(future, confirmations, timeout, monotonic()))
+            self.__unchecked.add(tx_hash)
+            if self.__thread is None:
+                self.__thread = Thread(target=self.__poll, name="receipt-waiter", daemon=True)
+                self.__thread.start()
+        return future
+
+    def wait_for_receipt(self, tx_hash: Union[HexBytes, str], confirmations: Optional[int] = None,
+                         timeout: Optional[float] = None) -> TxReceipt:
+        """
+        Blocking version of `wait`, a drop-in for `w3.eth.wait_for_transaction_receipt`
+
+        :raises TimeExhausted: If the transaction isn't confirmed after `timeout` seconds
+        """
+        return self.wait(tx_hash, confirmations, timeout).result()
+
+    def wait_for_receipts(self, tx_hashes: Iterable[Union[HexBytes, str]], confirmations: Optional[int] = None,
+                          timeout: Optional[float] = None) -> Dict[HexBytes, TxReceipt]:
+        """
+        Wait for several transactions
+
+        :return: The receipts by transaction hash, without the transactions that weren't confirmed in time
+        """
+        futures = {HexBytes(tx_hash): self.wait(tx_hash, confirmations, timeout) for tx_hash in tx_hashes}
+        receipts = dict()
+        for tx_hash, future in futures.items():
+            try:
+                receipts[tx_hash] = future.result()
+            except TimeExhausted:
+                pass
+        return receipts
+
+    def __len__(self) -> int:
+        """Number of transactions waited for"""
+        with self.__condition:
+            return len(self.__waiters)
+
+    def __poll(self):
+        while True:
+            try:
+                self.__check()
+            except Exception as e:
+                get_solbinder_logger().warning(f"Failed to poll transaction receipts, retrying: {e}")
+            self.__expire()
+            with self.__condition:
+                if not self.__waiters:
+                    self.__thread = None
+                    return
+            sleep(self.block_poll_interval)
+
+    def __check(self):
+        block_number = self.w3.eth.block_number
+        with self.__condition:
+            previous_block_number = self.__block_number
+            if block_number != previous_block_number:
+                # Every pending receipt, a reorganization may have moved or dropped the ones already fetched
+                tx_hashes = list(self.__waiters.keys())
+            else:
+                tx_hashes = [tx_hash for tx_hash in self.__unchecked if tx_hash in self.__waiters]
+            self.__unchecked.clear()
+            self.__block_number = block_number
+        if not tx_hashes:
+            return
+        try:
+            receipts = get_transaction_receipts(self.w3, tx_hashes)
+        except Exception:
+            # Fetch them again at the next check instead of the next block
+            with self.__condition:
+                self.__unchecked.update(tx_hashes)
+                self.__block_number = previous_block_number
+            raise
+        with self.__condition:
+            confirmed = self.__pop_waiters(lambda tx_hash, waiter: receipts.get(tx_hash) is not None and
+                                           block_number - receipts[tx_hash]["blockNumber"] >= waiter.confirmations)
+        for tx_hash, waiter in confirmed:
+            waiter.future.set_result(receipts[tx_hash])
+
+    def __expire(self):
+        now = monotonic()
+        with self.__condition:
+            expired = self.__pop_waiters(lambda tx_hash, waiter: now - waiter.added_at > waiter.timeout)
+        for tx_hash, waiter in expired:
+            waiter.future.set_exception(TimeExhausted(
+                f"Transaction {tx_hash.hex()} is not confirmed after {waiter.timeout} seconds"))
+
+    def __pop_waiters(self, predicate: Callable[[HexBytes, _Waiter], bool]) -> List[Tuple[HexBytes, _Waiter]]:
+        """Remove the waiters matching `predicate`, their futures are resolved outside of the lock"""
+        popped = []
+        for tx_hash, waiters in list(self.__waiters.items()):
+            waiting = []
+            for waiter in waiters:
+                (popped if predicate(tx_hash, waiter) else waiting).append((tx_hash, waiter))
+            if waiting:
+                self.__waiters[tx_hash] = [waiter for _, waiter in waiting]
+            else:
+                del self.__waiters[tx_hash]
+        return popped
+
+
+__all__ = ["ReceiptWaiter"]
@@ -0,0 +1,175 @@
+from threading import Lock
+from typing import *
+
+import bz2
+import gzip
+import hashlib
+import lzma
+import mmap
+import os
+import posixpath
+import shutil
+import struct
+import tarfile
+import zipfile
+import zlib
+
+from ..solbinder_logging import get_solbinder_logger
+from .base import BaseRetriever
+from .errors import RetrieverError
+from .http import get_shared_http_client
+
+_DECOMPRESSORS = [
+    (b"\x1f\x8b", gzip.open),
+    (b"BZh", bz2.open),
+    (b"\xfd7zXZ\x00", lzma.open),
+]
+
+
+class ArchiveRetriever(BaseRetriever):
+    """
+    Serves every import under `prefix` from a single release archive (tar, compressed tar or zip).
+
+    The archive is downloaded once (if given as a url) and memory-mapped. Compressed tars are decompressed once next
+    to it so that every file can be sliced straight out of the mapping. After that no import under `prefix` needs
+    any network access.
+    """
+
+    def __init__(self, prefix: str, archive: str, cache_dir: str, root: Optional[str] = None,
+                 local_dir: Optional[str] = None):
+        """
+        :param prefix: Import path prefix served by this retriever, e.g. "@openzeppelin/"
+        :param archive: Path or http(s) url of the archive
+        :param cache_dir: Where downloaded and decompressed archives are kept
+        :param root: Directory inside the archive that `prefix` maps to. Defaults to the single top-level directory of
+                     the archive, if there is one
+        :param local_dir: Directory under the import path where the files are stored. Defaults to the archive name
+        """
+        self.prefix = prefix
+        self.archive = archive
+        self.cache_dir = cache_dir
+        self.root = root
+        self.local_dir = local_dir or self.__get_archive_name(archive)
+        self.__lock = Lock()
+        self.__mmap: Optional[mmap.mmap] = None
+        self.__tar_index: Optional[Dict[str, Tuple[int, int]]] = None
+        self.__zip_index: Optional[Dict[str, zipfile.ZipInfo]] = None
+
+    def can_supply(self, import_path: str) -> bool:
+        return import_path.startswith(self.prefix)
+
+    def get_prefixes(self) -> Optional[List[str]]:
+        return [self.prefix]
+
+    def get_fingerprint(self) -> str:
+        return f"{super().get_fingerprint()}:{self.archive}:{self.root}:{self.local_dir}"
+
+    def get_source(self, import_path: str) -> str:
+        with self.__lock:
+            self.__open()
+        member = self.__get_member_name(import_path)
+        if self.__zip_index is not None and member in self.__zip_index:
+            return self.__read_zip_member(self.__zip_index[member]).decode()
+        if self.__tar_index is not None and member in self.__tar_index:
+            offset, size = self.__tar_index[member]
+            return self.__mmap[offset:offset + size].decode()
+        raise RetrieverError(f"'{import_path}' not found in {self.archive}")
+
+    def get_dep_context(self, import_path: str) -> str:
+        return posixpath.dirname(import_path)
+
+    def get_local_path(self, import_path: str) -> str:
+        return posixpath.join(self.local_dir, import_path[len(self.prefix):])
+
+    def __get_member_name(self, import_path: str) -> str:
+        relative_path = import_path[len(self.prefix):]
+        return posixpath.join(self.root, relative_path) if self.root else relative_path
+
+    def __open(self):
+        if self.__mmap is not None:
+            return
+        path = self.__get_uncompressed_path(self.__get_archive_path())
+        with open(path, "rb") as fh:
+            self.__mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as zip_file:
+                self.__zip_index = {info.filename: info for info in zip_file.infolist() if not info.is_dir()}
+            names = list(self.__zip_index)
+        else:
+            with tarfile.open(path) as tar:
+                self.__tar_index = {
+                    member.name: (member.offset_data, member.size) for member in tar if member.isfile()
+                }
+            names = list(self.__tar_index)
+        if self.root is None:
+            self.root = self.__get_single_top_level_dir(names)
+
+    def __read_zip_member(self, info: zipfile.ZipInfo) -> bytes:
+        # The data follows the local file header, whose name and extra fields may differ from the central directory
+        name_length, extra_length = struct.unpack("<HH", self.__mmap[info.header_offset + 26:info.header_offset + 30])
+        start = info.header_offset + 30 + name_length + extra_length
+        data = self.__mmap[start:start + info.compress_size]
+        if info.compress_type == zipfile.ZIP_STORED:
+            return data
+        if info.compress_type == zipfile.ZIP_DEFLATED:
+            return zlib.decompress(data, -zlib.MAX_WBITS)
+        raise RetrieverError(f"Unsupported compression of '{info.filename}' in {self.archive}")
+
+    def __get_archive_path(self) -> str:
+        if not self.archive.startswith(("http://", "https://")):
+            return self.archive
+        url_hash = hashlib.sha256(self.archive.encode()).hexdigest()[:16]
+        path = os.path.join(self.cache_dir, f"{url_hash}-{posixpath.basename(self.archive)}")
+        if not os.path.isfile(path):
+            get_solbinder_logger().info(f"Downloading {self.archive}")
+            content = get_shared_http_client().get(self.archive).content
+            self.__write_atomic(path, lambda fh: fh.write(content))
+        return path
+
+    def __get_uncompressed_path(self, path: str) -> str:
+        with open(path, "rb") as fh:
+            magic = fh.read(6)
+        for signature, open_compressed in _DECOMPRESSORS:
+            if magic.startswith(signature):
+                break
+        else:
+            return path
+        uncompressed_path = os.path.join(self.cache_dir, f"{os.path.basename(path)}.tar")
+        if not os.path.isfile(uncompressed_path):
+            get_solbinder_logger().info(f"Decompressing {path}")
+            with open_compressed(path, "rb") as compressed_fh:
+                self.__write_atomic(uncompressed_path, lambda fh: shutil.copyfileobj(compressed_fh, fh))
+        return uncompressed_path
+
+    @staticmethod
+    def __write_atomic(path: str, write: Callable[[BinaryIO], Any]):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            write(fh)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def __get_single_top_level_dir(names: List[str]) -> Optional[str]:
+        top_level = {name.split("/", 1)[0] for name in names}
+        if len(top_level) == 1 and all("/" in name for name in names):
+            return top_level.pop()
+        return None
+
+    @staticmethod
+    def __get_archive_name(archive: str) -> str:
+        name = posixpath.basename(archive)
+        for ext in (".tar.gz", ".tar.bz2", ".tar.xz", ".tgz", ".tar", ".zip"):
+            if name.endswith(ext):
+                return name[:-len(ext)]
+        return name
+
+
+class OpenZeppelinArchiveRetriever(ArchiveRetriever):
+    """Serves `@openzeppelin/` imports from the release archive of a given OpenZeppelin version"""
+    RELEASE_URL = "https://github.com/OpenZeppelin/openzeppelin-contracts/archive/refs/tags/{version}.tar.gz"
+
+    def __init__(self, cache_dir: str, version: str = "v4.0.0", archive: Optional[str] = None):
+        # Same local paths as OpenZeppelinRetriever, so both can be used on the same import cache
+        super().__init__("@openzeppelin/", archive or self.RELEASE_URL.format(version=version), cache_dir,
+                         local_dir=version)
@@ -1,7 +1,9 @@
-from typing import Union
+from typing import Union, Dict, List, Optional
 
 import abc
 
+from .http import FetchResult
+
 
 class BaseRetriever(abc.ABC):
     def can_supply(self, import_path: str) -> bool:
@@ -10,6 +12,25 @@ class BaseRetriever(abc.ABC):
     def get_source(self, import_path: str) -> str:
         raise NotImplementedError()
 
+    def fetch(self, import_path: str, validators: Optional[Dict[str, str]] = None) -> FetchResult:
+        """
+        Get the source, unless it did not change since it was fetched with `validators`.
+        Retrievers that can't tell if a source changed always return it.
+        """
+        return FetchResult(self.get_source(import_path))
+
+    def get_prefixes(self) -> Optional[List[str]]:
+        """
+        :return: Prefixes of all the import paths this retriever can supply, or None to be asked with `can_supply`
+        """
+        return None
+
+    def get_fingerprint(self) -> str:
+        """
+        :return: What decides the sources this retriever supplies, binds are cached for a given set of fingerprints
+        """
+        return f"{type(self).__name__}:{','.join(self.get_prefixes() or ())}"
+
     def get_dep_context(self, import_path: str) -> Union[str, None]:
         """
 
@@ -20,3 +41,7 @@ class BaseRetriever(abc.ABC):
 
     def get_local_path(self, import_path: str) -> str:
         raise NotImplementedError()
+
+    def is_local(self) -> bool:
+        """Local files are the source itself rather than a copy, so they are never pinned or restored"""
+        return False
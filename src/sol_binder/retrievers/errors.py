@@ -0,0 +1,6 @@
+class RetrieverError(Exception):
+    pass
+
+
+class RetrievalFailedError(RetrieverError):
+    pass
@@ -1,8 +1,10 @@
+from typing import Dict, List, Optional
+
 import os
 import re
-import requests
 
 from .base import BaseRetriever
+from .http import FetchResult, get_shared_http_client
 
 
 class GitHubRetriever(BaseRetriever):
@@ -12,9 +14,15 @@ class GitHubRetriever(BaseRetriever):
     def can_supply(self, import_path: str) -> bool:
         return self.__is_non_raw_url(import_path)
 
+    def get_prefixes(self) -> Optional[List[str]]:
+        return ["https://github.com/", "http://github.com/"]
+
     def get_source(self, import_path: str) -> str:
+        return self.fetch(import_path).source
+
+    def fetch(self, import_path: str, validators: Optional[Dict[str, str]] = None) -> FetchResult:
         raw_url = self.__get_raw_url(import_path)
-        return requests.get(raw_url).content.decode()
+        return get_shared_http_client().fetch(raw_url, validators)
 
     def get_local_path(self, import_path: str) -> str:
         m = re.search(self.GITHUB_NON_RAW_URL_RE, import_path)
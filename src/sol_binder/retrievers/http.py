@@ -0,0 +1,95 @@
+from dataclasses import dataclass, field
+from threading import Lock
+from time import sleep
+from typing import *
+
+import random
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..solbinder_logging import get_solbinder_logger
+from .errors import RetrievalFailedError
+
+DEFAULT_TIMEOUT_SECONDS = 30
+DEFAULT_RETRIES = 4
+DEFAULT_BACKOFF_SECONDS = 0.5
+MAX_BACKOFF_SECONDS = 30
+DEFAULT_POOL_SIZE = 16
+RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+
+
+@dataclass
+class FetchResult:
+    source: Optional[str]  # None if the source did not change since it was fetched with the given validators
+    validators: Dict[str, str] = field(default_factory=dict)  # ETag / Last-Modified to revalidate the source with
+
+
+class HttpClient(object):
+    """Pooled, keep-alive http client that retries failed requests with jittered exponential backoff"""
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT_SECONDS, retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF_SECONDS, pool_size: int = DEFAULT_POOL_SIZE):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def fetch(self, url: str, validators: Optional[Dict[str, str]] = None) -> FetchResult:
+        """
+        :param validators: Validators of a previous fetch of `url`. If the content did not change since, the result
+                           has no source.
+        """
+        headers = dict()
+        if validators:
+            if "etag" in validators:
+                headers["If-None-Match"] = validators["etag"]
+            if "last_modified" in validators:
+                headers["If-Modified-Since"] = validators["last_modified"]
+        response = self.get(url, headers)
+        if response.status_code == 304:
+            return FetchResult(None, dict(validators))
+        new_validators = dict()
+        if "ETag" in response.headers:
+            new_validators["etag"] = response.headers["ETag"]
+        if "Last-Modified" in response.headers:
+            new_validators["last_modified"] = response.headers["Last-Modified"]
+        return FetchResult(response.content.decode(), new_validators)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = f"{type(e).__name__}: {e}"
+            else:
+                if response.status_code not in RETRY_STATUS_CODES:
+                    if response.status_code >= 400:
+                        raise RetrievalFailedError(f"GET {url} failed with status {response.status_code}")
+                    return response
+                error = f"status {response.status_code}"
+            if attempt < self.retries:
+                delay = self.__get_backoff(attempt)
+                get_solbinder_logger().warning(f"GET {url} failed ({error}), retrying in {delay:.2f} seconds")
+                sleep(delay)
+        raise RetrievalFailedError(f"GET {url} failed after {self.retries + 1} attempts: {error}")
+
+    def __get_backoff(self, attempt: int) -> float:
+        # "Full jitter": spreads the retries of concurrent requests instead of having them all retry together
+        return random.uniform(0, min(MAX_BACKOFF_SECONDS, self.backoff * 2 ** attempt))
+
+
+_shared_client: Optional[HttpClient] = None
+_shared_client_lock = Lock()
+
+
+def get_shared_http_client() -> HttpClient:
+    """The http client shared by all the retrievers of the process"""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
@@ -22,3 +22,6 @@ class LocalFileRetriever(BaseRetriever):
 
     def get_local_path(self, import_path: str) -> str:
         return import_path
+
+    def is_local(self) -> bool:
+        return True
@@ -1,4 +1,7 @@
+from typing import Dict, List, Optional
+
 from .github import GitHubRetriever
+from .http import FetchResult
 
 
 class OpenZeppelinRetriever(GitHubRetriever):
@@ -7,9 +10,12 @@ class OpenZeppelinRetriever(GitHubRetriever):
     def can_supply(self, import_path: str) -> bool:
         return import_path.startswith("@openzeppelin/")
 
-    def get_source(self, import_path: str) -> str:
+    def get_prefixes(self) -> Optional[List[str]]:
+        return ["@openzeppelin/"]
+
+    def fetch(self, import_path: str, validators: Optional[Dict[str, str]] = None) -> FetchResult:
         github_path = import_path.replace("@openzeppelin/", self.BASE_URL)
-        return super().get_source(github_path)
+        return super().fetch(github_path, validators)
 
     def get_dep_context(self, import_path: str) -> str:
         github_path = import_path.replace("@openzeppelin/", self.BASE_URL)
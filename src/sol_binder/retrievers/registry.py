@@ -0,0 +1,67 @@
+from threading import Lock
+from typing import *
+
+from ..utils import PrefixTrie
+from .base import BaseRetriever
+
+DEFAULT_CACHE_SIZE = 4096
+
+
+class RetrieverRegistry(object):
+    """
+    Chooses the retriever of an import url.
+
+    Retrievers that declare their prefixes are dispatched by longest matching prefix through a trie, the others are
+    asked with `can_supply` in order of registration. The retriever chosen for each url is cached.
+    """
+
+    def __init__(self, fallback: BaseRetriever, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.fallback = fallback
+        self.cache_size = cache_size
+        self.__retrievers: List[BaseRetriever] = list()
+        self.__trie: PrefixTrie[BaseRetriever] = PrefixTrie()
+        self.__unprefixed: List[BaseRetriever] = list()
+        self.__cache: Dict[str, BaseRetriever] = dict()
+        self.__lock = Lock()
+
+    def __iter__(self) -> Iterator[BaseRetriever]:
+        return iter(list(self.__retrievers))
+
+    def register(self, retriever: BaseRetriever, prepend: bool = False):
+        """
+        :param prepend: Take precedence over the retrievers already registered for the same prefix
+        """
+        with self.__lock:
+            prefixes = retriever.get_prefixes()
+            if prefixes:
+                for prefix in prefixes:
+                    self.__trie.add(prefix, retriever, prepend)
+            elif prepend:
+                self.__unprefixed.insert(0, retriever)
+            else:
+                self.__unprefixed.append(retriever)
+            if prepend:
+                self.__retrievers.insert(0, retriever)
+            else:
+                self.__retrievers.append(retriever)
+            self.__cache.clear()
+
+    def get(self, url: str) -> BaseRetriever:
+        retriever = self.__cache.get(url)
+        if retriever is None:
+            retriever = self.__find(url)
+            with self.__lock:
+                if len(self.__cache) >= self.cache_size:
+                    # Evict the oldest entry
+                    self.__cache.pop(next(iter(self.__cache)))
+                self.__cache[url] = retriever
+        return retriever
+
+    def __find(self, url: str) -> BaseRetriever:
+        for _, retriever in self.__trie.iter_matches(url):
+            if retriever.can_supply(url):
+                return retriever
+        for retriever in self.__unprefixed:
+            if retriever.can_supply(url):
+                return retriever
+        return self.fallback
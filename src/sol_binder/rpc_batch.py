@@ -0,0 +1,188 @@
+from typing import *
+
+import json
+
+from eth_typing import BlockIdentifier
+from hexbytes import HexBytes
+from web3 import Web3, HTTPProvider
+from web3._utils.method_formatters import PYTHONIC_RESULT_FORMATTERS
+from web3._utils.request import make_post_request
+from web3.contract import Contract, ContractFunction
+from web3.datastructures import AttributeDict
+from web3.types import RPCEndpoint, RPCResponse, TxReceipt
+
+from .contracts.codec import encode_function_call, decode_function_result
+
+if TYPE_CHECKING:
+    from .contracts.instance import ContractInstance
+
+DEFAULT_MAX_BATCH_SIZE = 100  # Many nodes and providers refuse larger batches
+
+
+class JsonRpcError(Exception):
+    def __init__(self, method: str, error: Any):
+        super().__init__(f"{method} failed: {error}")
+        self.method = method
+        self.error = error
+
+
+class BatchHTTPProvider(HTTPProvider):
+    """HTTP provider that can also send several requests in a single JSON-RPC batch"""
+
+    def __init__(self, *args, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_batch_size = max_batch_size
+
+    def make_batch_request(self, requests: Sequence[Tuple[RPCEndpoint, Any]]) -> List[RPCResponse]:
+        """
+        :param requests: (method, params) of every request
+        :return: The response of every request, in the same order
+        """
+        responses = []
+        for start in range(0, len(requests), self.max_batch_size):
+            batch = requests[start:start + self.max_batch_size]
+            # encode_rpc_request numbers every request, which is how the responses are matched
+            encoded = [json.loads(self.encode_rpc_request(method, params)) for method, params in batch]
+            raw_response = make_post_request(self.endpoint_uri, json.dumps(encoded).encode(),
+                                             **self.get_request_kwargs())
+            decoded = self.decode_rpc_response(raw_response)
+            if not isinstance(decoded, list):
+                # The node rejected the batch as a whole
+                raise JsonRpcError("batch", decoded.get("error", decoded))
+            by_id = {response.get("id"): response for response in decoded}
+            responses.extend(by_id.get(request["id"], {"error": "missing response"}) for request in encoded)
+        return responses
+
+
+class BatchResult(object):
+    """Result of one request of a JsonRpcBatch, available once the batch was executed"""
+
+    def __init__(self, method: RPCEndpoint, params: Any, formatter: Optional[Callable[[Any], Any]] = None):
+        self.method = method
+        self.params = params
+        self.formatter = formatter
+        self.done = False
+        self.__value: Any = None
+        self.__error: Optional[Exception] = None
+
+    @property
+    def value(self) -> Any:
+        """
+        :raises JsonRpcError: If the request failed or the batch wasn't executed yet
+        """
+        if not self.done:
+            raise JsonRpcError(self.method, "not executed yet")
+        if self.__error is not None:
+            raise self.__error
+        return self.__value
+
+    @property
+    def error(self) -> Optional[Exception]:
+        return self.__error
+
+    def _set(self, response: RPCResponse):
+        self.done = True
+        if "error" in response:
+            self.__error = JsonRpcError(self.method, response["error"])
+            return
+        try:
+            value = response.get("result")
+            if self.method in PYTHONIC_RESULT_FORMATTERS:
+                value = PYTHONIC_RESULT_FORMATTERS[self.method](value)
+            if isinstance(value, dict):
+                value = AttributeDict.recursive(value)
+            self.__value = self.formatter(value) if self.formatter else value
+        except Exception as e:
+            self.__error = e
+
+
+class JsonRpcBatch(object):
+    """
+    Collects JSON-RPC requests and sends them in a single batch, instead of one HTTP request each.
+
+        with JsonRpcBatch(w3) as batch:
+            nonces = {account: batch.get_transaction_count(account) for account in accounts}
+        nonces[account].value
+
+    With providers other than BatchHTTPProvider, the requests are sent one by one.
+    """
+
+    def __init__(self, w3: Web3):
+        self.w3 = w3
+        self.__pending: List[BatchResult] = []
+
+    def __enter__(self) -> "JsonRpcBatch":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.execute()
+
+    def add(self, method: str, params: Any, formatter: Optional[Callable[[Any], Any]] = None) -> BatchResult:
+        """
+        Queue a raw request, the result gets the same formatting as through `w3.eth`
+
+        :param formatter: Applied to the formatted result
+        """
+        result = BatchResult(RPCEndpoint(method), params, formatter)
+        self.__pending.append(result)
+        return result
+
+    def get_transaction_count(self, account: str, block_identifier: BlockIdentifier = "latest") -> BatchResult:
+        return self.add("eth_getTransactionCount", [account, _encode_block_identifier(block_identifier)])
+
+    def get_transaction_receipt(self, tx_hash: Union[HexBytes, str]) -> BatchResult:
+        """The result is None until the transaction is mined"""
+        return self.add("eth_getTransactionReceipt", [HexBytes(tx_hash).hex()])
+
+    def get_block_number(self) -> BatchResult:
+        return self.add("eth_blockNumber", [])
+
+    def call(self, contract: Union["ContractInstance", Contract], func_name: str, *args,
+             block_identifier: BlockIdentifier = "latest") -> BatchResult:
+        """Queue a call of a view function, the result is decoded like `ContractInstance.call` does"""
+        raw_contract: Contract = getattr(contract, "_contract", contract)
+        function: ContractFunction = raw_contract.functions[func_name](*args)
+        transaction = {"to": function.address, "data": encode_function_call(function)}
+        return self.add("eth_call", [transaction, _encode_block_identifier(block_identifier)],
+                        lambda return_data: decode_function_result(function, return_data))
+
+    def execute(self) -> List[BatchResult]:
+        results, self.__pending = self.__pending, []
+        if not results:
+            return results
+        provider = self.w3.provider
+        if isinstance(provider, BatchHTTPProvider):
+            responses = provider.make_batch_request([(result.method, result.params) for result in results])
+        else:
+            responses = [provider.make_request(result.method, result.params) for result in results]
+        for result, response in zip(results, responses):
+            result._set(response)
+        return results
+
+
+def get_transaction_counts(w3: Web3, accounts: Iterable[str]) -> Dict[str, int]:
+    """Transaction count of every account, in a single batch"""
+    with JsonRpcBatch(w3) as batch:
+        counts = {account: batch.get_transaction_count(account) for account in accounts}
+    return {account: count.value for account, count in counts.items()}
+
+
+def get_transaction_receipts(w3: Web3,
+                             tx_hashes: Iterable[Union[HexBytes, str]]) -> Dict[HexBytes, Optional[TxReceipt]]:
+    """
+    Receipt of every transaction, in a single batch
+
+    :return: The receipts by transaction hash, None for the transactions that aren't mined yet
+    """
+    with JsonRpcBatch(w3) as batch:
+        receipts = {HexBytes(tx_hash): batch.get_transaction_receipt(tx_hash) for tx_hash in tx_hashes}
+    return {tx_hash: receipt.value for tx_hash, receipt in receipts.items()}
+
+
+def _encode_block_identifier(block_identifier: BlockIdentifier) -> Any:
+    if isinstance(block_identifier, int):
+        return hex(block_identifier)
+    if isinstance(block_identifier, bytes):
+        return HexBytes(block_identifier).hex()
+    return block_identifier
@@ -10,6 +10,9 @@ from pathlib import Path
 
 from solcx import compile_source
 
+if TYPE_CHECKING:
+    from .compilation.artifacts import ArtifactCache
+
 
 def expand(function, seed):
     """opposite of functools.reduce. Stops when function return None"""
@@ -27,9 +30,8 @@ def basename_without_ext(filepath: str) -> str:
 
 def normalize_url_path(url):
     parsed = urllib.parse.urlparse(url)
-    path = os.path.normpath(parsed.path)
-    parsed._replace(path=path)
-    return parsed.geturl()
+    path = os.path.normpath(parsed.path) if parsed.path else parsed.path
+    return parsed._replace(path=path).geturl()
 
 
 def extract_abi_from_compiled_contract(compiled_contract: dict):
@@ -39,9 +41,51 @@ def extract_abi_from_compiled_contract(compiled_contract: dict):
 
 def compile_contract_and_save_abi(*args, **kwargs):
     abi_path = kwargs.pop("abi_path")
-    compiled = compile_source(*args, **kwargs)
+    artifact_cache: Optional["ArtifactCache"] = kwargs.pop("artifact_cache", None)
+    # Hashes of the import graph of the source (BindResult.imports), only used to key the artifact cache
+    imports: Optional[Dict[str, str]] = kwargs.pop("imports", None)
+    if artifact_cache is not None:
+        compiled = artifact_cache.compile_source(*args, imports=imports, **kwargs)
+    else:
+        compiled = compile_source(*args, **kwargs)
     abi = extract_abi_from_compiled_contract(compiled)
     with open(abi_path, "w") as abi_fh:
         json.dump(abi, abi_fh)
     return compiled
 
+
+T = TypeVar("T")
+
+
+class PrefixTrie(Generic[T]):
+    """Maps string prefixes to values, looking up all the prefixes of a key in a single walk"""
+
+    def __init__(self):
+        self.__root: Dict[str, Any] = dict()
+        self.__values_key = object()  # Never collides with a character
+
+    def add(self, prefix: str, value: T, prepend: bool = False):
+        node = self.__root
+        for char in prefix:
+            node = node.setdefault(char, dict())
+        values = node.setdefault(self.__values_key, list())
+        if prepend:
+            values.insert(0, value)
+        else:
+            values.append(value)
+
+    def iter_matches(self, key: str) -> Iterator[Tuple[str, T]]:
+        """Yield (prefix, value) of every prefix of `key`, longest prefix first"""
+        matches = []
+        node = self.__root
+        if self.__values_key in node:
+            matches.append((0, node[self.__values_key]))
+        for index, char in enumerate(key):
+            node = node.get(char)
+            if node is None:
+                break
+            if self.__values_key in node:
+                matches.append((index + 1, node[self.__values_key]))
+        for length, values in reversed(matches):
+            for value in values:
+                yield key[:length], value
@@ -0,0 +1,42 @@
+import itertools
+
+import pytest
+import yaml
+
+from fake_node import FakeNode
+from fake_solc import FakeSolc
+from sol_binder.compilation.solc_registry import get_solc_registry
+from sol_binder.project.config import ProjectConfig
+
+_network_ids = itertools.count()
+
+
+@pytest.fixture
+def node():
+    node = FakeNode().start()
+    yield node
+    node.stop()
+
+
+@pytest.fixture
+def fake_solc(tmp_path, monkeypatch):
+    fake_solc = FakeSolc(str(tmp_path / "solcx"))
+    fake_solc.install(monkeypatch)
+    yield fake_solc
+    monkeypatch.undo()
+    get_solc_registry().refresh()
+
+
+@pytest.fixture
+def project_config(tmp_path, node) -> ProjectConfig:
+    """A project whose default network is `node`"""
+    # web3 instances are cached by network name for the whole process, so every test gets a network of its own
+    network = f"fake{next(_network_ids)}"
+    config = {
+        "networks": {network: {"url": node.url, "network_id": node.chain_id}},
+        "default_network": network,
+    }
+    (tmp_path / "contracts").mkdir()
+    with open(tmp_path / "solbinder.yaml", "w") as fh:
+        yaml.safe_dump(config, fh)
+    return ProjectConfig.load(tmp_path)
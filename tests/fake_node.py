@@ -0,0 +1,210 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread, Lock
+from typing import *
+
+import json
+
+import rlp
+from eth_account import Account
+from eth_utils import keccak, to_checksum_address
+
+ACCOUNTS = [to_checksum_address("0x" + f"{i:02x}" * 20) for i in range(1, 4)]
+PRIVATE_KEY = "0x" + "42" * 32
+KEY_ACCOUNT = Account.from_key(PRIVATE_KEY).address
+GAS_USED = 21000
+
+
+class RpcError(Exception):
+    pass
+
+
+def get_create_address(sender: str, nonce: int) -> str:
+    return to_checksum_address(keccak(rlp.encode([bytes.fromhex(sender[2:]), nonce]))[12:])
+
+
+class FakeNode(object):
+    """
+    A minimal Ethereum JSON-RPC node, served over http from a thread.
+
+    Transactions are mined in a block of their own as soon as they are sent, unless `auto_mine` is off. Calls are
+    answered by `call_handler(transaction, block_identifier) -> bytes`. Batches are answered in reverse order, like
+    nodes are allowed to.
+    """
+
+    def __init__(self, chain_id: int = 1337, eip1559: bool = False):
+        self.chain_id = chain_id
+        self.eip1559 = eip1559
+        self.gas_price = 10 ** 9
+        self.block_number = 1
+        self.auto_mine = True
+        self.call_handler: Optional[Callable[[Dict[str, Any], Any], bytes]] = None
+        self.nonces: Dict[str, int] = dict()
+        self.transactions: List[Dict[str, Any]] = []  # Every transaction sent, with its "hash" and "raw" flag
+        self.receipts: Dict[str, Dict[str, Any]] = dict()
+        self.pending: List[str] = []
+        self.estimates: List[Dict[str, Any]] = []  # Every transaction whose gas was estimated
+        self.requests: List[str] = []  # Method of every request
+        self.batches: List[List[str]] = []  # Methods of every batch
+        self.failures: Dict[str, int] = dict()  # Method -> number of the next requests that fail
+        self.lock = Lock()
+        self.__server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.__server.node = self
+        self.__thread = Thread(target=self.__server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.__server.server_address[1]}"
+
+    def start(self) -> "FakeNode":
+        self.__thread.start()
+        return self
+
+    def stop(self):
+        self.__server.shutdown()
+        self.__server.server_close()
+        self.__thread.join()
+
+    def mine(self, blocks: int = 1):
+        with self.lock:
+            self.__mine(blocks)
+
+    def fail(self, method: str, times: int = 1):
+        with self.lock:
+            self.failures[method] = self.failures.get(method, 0) + times
+
+    def respond(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        method, params = request["method"], request.get("params") or []
+        try:
+            with self.lock:
+                self.requests.append(method)
+                if self.failures.get(method):
+                    self.failures[method] -= 1
+                    raise RpcError(f"{method} is unavailable")
+                result = getattr(self, f"_{method}")(*params)
+        except RpcError as e:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": -32000, "message": str(e)}}
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+    def __mine(self, blocks: int = 1):
+        for _ in range(blocks):
+            self.block_number += 1
+            for tx_hash in self.pending:
+                self.receipts[tx_hash]["blockNumber"] = hex(self.block_number)
+            self.pending = []
+
+    def __add_transaction(self, transaction: Dict[str, Any]) -> str:
+        sender = transaction["from"]
+        expected_nonce = self.nonces.get(sender.lower(), 0)
+        if transaction["nonce"] < expected_nonce:
+            raise RpcError("nonce too low")
+        self.nonces[sender.lower()] = transaction["nonce"] + 1
+        tx_hash = "0x" + keccak(json.dumps(transaction, sort_keys=True).encode()).hex()
+        self.transactions.append(dict(transaction, hash=tx_hash))
+        contract_address = None if transaction["to"] else get_create_address(sender, transaction["nonce"])
+        self.receipts[tx_hash] = {
+            "transactionHash": tx_hash, "transactionIndex": "0x0", "blockHash": "0x" + "00" * 32,
+            "blockNumber": None, "from": sender, "to": transaction["to"], "contractAddress": contract_address,
+            "gasUsed": hex(GAS_USED), "cumulativeGasUsed": hex(GAS_USED), "effectiveGasPrice": hex(self.gas_price),
+            "status": "0x1", "logs": [], "logsBloom": "0x" + "00" * 256, "type": "0x0",
+        }
+        self.pending.append(tx_hash)
+        if self.auto_mine:
+            self.__mine()
+        return tx_hash
+
+    # JSON-RPC methods
+
+    def _eth_chainId(self):
+        return hex(self.chain_id)
+
+    def _web3_clientVersion(self):
+        return "FakeNode/v0.1.0"
+
+    def _net_version(self):
+        return str(self.chain_id)
+
+    def _eth_accounts(self):
+        return ACCOUNTS
+
+    def _eth_blockNumber(self):
+        return hex(self.block_number)
+
+    def _eth_gasPrice(self):
+        return hex(self.gas_price)
+
+    def _eth_maxPriorityFeePerGas(self):
+        return hex(10 ** 9)
+
+    def _eth_getBlockByNumber(self, block_identifier, full_transactions=False):
+        number = self.block_number if block_identifier in ("latest", "pending") else int(block_identifier, 16)
+        block = {"number": hex(number), "hash": "0x" + f"{number:064x}", "timestamp": hex(number),
+                 "gasLimit": hex(30000000), "transactions": []}
+        if self.eip1559:
+            block["baseFeePerGas"] = hex(self.gas_price)
+        return block
+
+    def _eth_getBlockByHash(self, block_hash, full_transactions=False):
+        # Block hashes are the block numbers, see _eth_getBlockByNumber
+        return self._eth_getBlockByNumber(hex(int(block_hash, 16)), full_transactions)
+
+    def _eth_getTransactionCount(self, account, block_identifier="latest"):
+        return hex(self.nonces.get(account.lower(), 0))
+
+    def _eth_getCode(self, address, block_identifier="latest"):
+        return "0x"
+
+    def _eth_estimateGas(self, transaction, block_identifier=None):
+        self.estimates.append(transaction)
+        return hex(GAS_USED)
+
+    def _eth_call(self, transaction, block_identifier="latest"):
+        if self.call_handler is None:
+            raise RpcError("execution reverted")
+        return "0x" + self.call_handler(transaction, block_identifier).hex()
+
+    def _eth_sendTransaction(self, transaction):
+        sender = to_checksum_address(transaction["from"])
+        nonce = int(transaction["nonce"], 16) if "nonce" in transaction else self.nonces.get(sender.lower(), 0)
+        return self.__add_transaction({
+            "from": sender, "to": transaction.get("to"), "nonce": nonce, "data": transaction.get("data", "0x"),
+            "value": int(transaction.get("value", "0x0"), 16), "raw": False,
+        })
+
+    def _eth_sendRawTransaction(self, raw_transaction):
+        raw = bytes.fromhex(raw_transaction[2:])
+        sender = Account.recover_transaction(raw)
+        if raw[0] == 2:
+            _, nonce, _, _, _, to, value, data = rlp.decode(raw[1:])[:8]
+        else:
+            nonce, _, _, to, value, data = rlp.decode(raw)[:6]
+        return self.__add_transaction({
+            "from": sender, "to": to_checksum_address(to) if to else None, "nonce": int.from_bytes(nonce, "big"),
+            "data": "0x" + data.hex(), "value": int.from_bytes(value, "big"), "raw": True,
+        })
+
+    def _eth_getTransactionReceipt(self, tx_hash):
+        receipt = self.receipts.get(tx_hash)
+        if receipt is None or receipt["blockNumber"] is None:
+            return None
+        return receipt
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        node: FakeNode = self.server.node
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if isinstance(request, list):
+            with node.lock:
+                node.batches.append([r["method"] for r in request])
+            response = list(reversed([node.respond(r) for r in request]))
+        else:
+            response = node.respond(request)
+        body = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
@@ -0,0 +1,38 @@
+from typing import *
+
+import os
+
+import solcx
+
+from sol_binder.compilation.solc_registry import get_solc_registry
+
+SOLC_VERSION = "0.8.6"
+
+
+class FakeSolc(object):
+    """
+    Stands in for the solc binary: `compile_standard` returns the contracts registered for the file name of every
+    source, and the shared solc registry sees SOLC_VERSION as installed
+    """
+
+    def __init__(self, install_folder: str):
+        self.install_folder = install_folder
+        self.contracts: Dict[str, Dict[str, Dict[str, Any]]] = dict()  # File name -> name -> {"abi", "bin"}
+        os.makedirs(os.path.join(install_folder, f"solc-v{SOLC_VERSION}"), exist_ok=True)
+
+    def add(self, filename: str, name: str, abi: List[Dict[str, Any]], bytecode: str = "6000"):
+        self.contracts.setdefault(filename, dict())[name] = {"abi": abi, "bin": bytecode}
+
+    def compile_standard(self, input_data, solc_version=None, allow_paths=None, **kwargs):
+        return {"contracts": {
+            unit_name: {
+                name: {"abi": contract["abi"], "evm": {"bytecode": {"object": contract["bin"]}}}
+                for name, contract in self.contracts.get(os.path.basename(unit_name), dict()).items()
+            }
+            for unit_name in input_data["sources"]
+        }}
+
+    def install(self, monkeypatch):
+        monkeypatch.setattr(solcx, "compile_standard", self.compile_standard)
+        monkeypatch.setenv("SOLCX_BINARY_PATH", self.install_folder)
+        get_solc_registry().refresh()
@@ -0,0 +1,74 @@
+import json
+import os
+
+import solcx
+
+from sol_binder.binder import SolBinder
+from sol_binder.compilation.artifacts import ArtifactCache
+
+SOURCE = 'pragma solidity ^0.8.0;\nimport "Lib.sol";\ncontract A is Lib {}\n'
+
+
+def _write(path: str, content: str):
+    with open(path, "w") as fh:
+        fh.write(content)
+
+
+def _fake_compile_source(import_path: str, calls: list):
+    """Compiles like solc would: the output depends on the imported file, read from disk"""
+    def compile_source(source, solc_version=None, **kwargs):
+        with open(os.path.join(import_path, "Lib.sol")) as fh:
+            calls.append(fh.read())
+        return {"<stdin>:A": {"abi": [], "bin": f"{len(calls):02x}"}}
+    return compile_source
+
+
+def test_compile_source_misses_after_an_import_changes(tmp_path, monkeypatch):
+    import_path = str(tmp_path / "imports")
+    os.makedirs(import_path)
+    _write(os.path.join(import_path, "Lib.sol"), "contract Lib {}\n")
+    calls = []
+    monkeypatch.setattr(solcx, "compile_source", _fake_compile_source(import_path, calls))
+    binder = SolBinder(import_path, lock_path=str(tmp_path / "solbinder.lock"))
+    cache = ArtifactCache(str(tmp_path / "artifacts"))
+
+    bind_result = binder.bind_with_imports(SOURCE)
+    first = cache.compile_source(bind_result.source, "0.8.6", imports=bind_result.imports)
+    assert cache.compile_source(bind_result.source, "0.8.6", imports=bind_result.imports) == first
+    assert (cache.hits, len(calls)) == (1, 1)
+
+    _write(os.path.join(import_path, "Lib.sol"), "contract Lib { uint256 x; }\n")
+    bind_result = binder.bind_with_imports(SOURCE)
+    second = cache.compile_source(bind_result.source, "0.8.6", imports=bind_result.imports)
+    assert len(calls) == 2
+    assert second != first
+
+
+def test_standard_key_covers_the_imports():
+    input_data = {"language": "Solidity", "sources": {"A.sol": {"content": SOURCE}}}
+    key = ArtifactCache.get_standard_key(input_data, "0.8.6", {"Lib.sol": "aa"})
+    assert key == ArtifactCache.get_standard_key(input_data, "0.8.6", {"Lib.sol": "aa"})
+    assert key != ArtifactCache.get_standard_key(input_data, "0.8.6", {"Lib.sol": "bb"})
+    assert key != ArtifactCache.get_standard_key(input_data, "0.8.7", {"Lib.sol": "aa"})
+
+
+def test_eviction_only_scans_the_cache_when_it_is_full(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "artifacts")
+    entry = {"<stdin>:A": {"abi": [], "bin": "00" * 100}}
+    entry_size = len(json.dumps(entry))
+    cache = ArtifactCache(cache_dir, max_bytes=entry_size * 5)
+    scans = []
+    original_scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: scans.append(path) or original_scandir(path))
+
+    for i in range(5):
+        cache.put(f"key{i}", entry)
+        os.utime(os.path.join(cache_dir, f"key{i}.json"), (i, i))
+    cache.put("key0", entry)  # Replaced, the cache doesn't grow
+    assert scans == [cache_dir]
+
+    os.utime(os.path.join(cache_dir, "key0.json"), (10, 10))  # Recently used
+    cache.put("key5", entry)
+    assert len(scans) == 2
+    assert sorted(os.listdir(cache_dir)) == [f"key{i}.json" for i in (0, 2, 3, 4, 5)]
+    assert cache.get("key1") is None and cache.get("key0") == entry
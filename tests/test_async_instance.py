@@ -0,0 +1,36 @@
+import asyncio
+from types import SimpleNamespace
+
+from eth_abi import encode_abi
+
+from sol_binder.contracts.async_instance import AsyncContractInstance
+
+ADDRESS = "0x" + "11" * 20
+ABI = [{"type": "function", "name": "value", "stateMutability": "view", "inputs": [],
+        "outputs": [{"name": "", "type": "uint256"}]}]
+
+
+class FakeAsyncEth(object):
+    def __init__(self):
+        self.block_identifiers = []
+
+    async def call(self, transaction, block_identifier):
+        self.block_identifiers.append(block_identifier)
+        return encode_abi(["uint256"], [42])
+
+
+def _create_instance():
+    w3 = SimpleNamespace(eth=FakeAsyncEth())
+    return w3, AsyncContractInstance(w3, ADDRESS, ABI, 1337, ADDRESS)
+
+
+def test_call_reads_the_latest_block_by_default():
+    w3, instance = _create_instance()
+    assert asyncio.run(instance.call("value")) == 42
+    assert w3.eth.block_identifiers == ["latest"]
+
+
+def test_call_at_genesis_block():
+    w3, instance = _create_instance()
+    assert asyncio.run(instance.call("value", block_identifier=0)) == 42
+    assert w3.eth.block_identifiers == [0]
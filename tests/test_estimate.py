@@ -0,0 +1,57 @@
+from eth_abi import decode_abi
+
+from eth_utils import to_checksum_address
+
+from fake_node import ACCOUNTS, GAS_USED
+from sol_binder.commands.estimate import estimate_all
+from sol_binder.commands.planner import get_create_address
+from sol_binder.project.config import ContractDeploymentData
+
+TOKEN_ABI = []
+VAULT_ABI = [{"type": "constructor", "stateMutability": "nonpayable",
+              "inputs": [{"name": "token", "type": "address"}, {"name": "cap", "type": "uint256"}]}]
+
+
+def _create_project(project_config, fake_solc):
+    for filename in ("Token.sol", "Vault.sol"):
+        with open(f"{project_config.contracts_dir}/{filename}", "w") as fh:
+            fh.write(f"contract {filename[:-4]} {{}}\n")
+    fake_solc.add("Token.sol", "Token", TOKEN_ABI)
+    fake_solc.add("Vault.sol", "Vault", VAULT_ABI)
+    project_config.deployments = {"Token.sol": "Token", "Vault.sol": {"Vault": ["${Token.address}", 100]}}
+
+
+def _get_estimated_arguments(node) -> tuple:
+    data = bytes.fromhex(node.estimates[-1]["data"][2:])
+    return decode_abi(["address", "uint256"], data[len(bytes.fromhex("6000")):])
+
+
+def test_estimate_a_fresh_deployment_with_placeholder_addresses(project_config, node, fake_solc):
+    _create_project(project_config, fake_solc)
+    node.nonces[ACCOUNTS[0].lower()] = 7
+    estimate = estimate_all(solbinder_config=project_config, max_workers=1)
+    assert estimate.failed == {}
+    assert estimate.gas == {"Token": GAS_USED, "Vault": GAS_USED}
+    token, cap = _get_estimated_arguments(node)
+    assert (token.lower(), cap) == (get_create_address(ACCOUNTS[0], 7).lower(), 100)
+    assert node.transactions == []
+
+
+def test_estimate_with_the_address_of_a_deployed_dependency(project_config, node, fake_solc):
+    _create_project(project_config, fake_solc)
+    token_address = to_checksum_address("0x" + "ab" * 20)
+    project_config.save_deployment_data({"Token": ContractDeploymentData(
+        abi=TOKEN_ABI, contract_address=token_address, tx_hash="", account=ACCOUNTS[0], chain_id=node.chain_id,
+        w3_url=node.url, source_hash="", deployment_cost_wei=0)})
+    estimate = estimate_all(solbinder_config=project_config, contract_names=["Vault"], max_workers=1)
+    assert estimate.failed == {}
+    assert list(estimate.gas) == ["Vault"]
+    assert _get_estimated_arguments(node)[0].lower() == token_address.lower()
+
+
+def test_only_the_plans_that_cannot_be_estimated_fail(project_config, node, fake_solc):
+    _create_project(project_config, fake_solc)
+    fake_solc.contracts.pop("Token.sol")
+    estimate = estimate_all(solbinder_config=project_config, max_workers=1)
+    assert list(estimate.failed) == ["Token"]
+    assert estimate.gas == {"Vault": GAS_USED}
@@ -0,0 +1,68 @@
+import json
+import math
+
+import yaml
+from click.testing import CliRunner
+
+from fake_node import GAS_USED
+from sol_binder.bin.solbinder import cli
+from sol_binder.commands.gas_report import DEPLOYMENT, GasReport, GasStats
+
+COUNTER_ABI = [{"type": "function", "name": "increment", "stateMutability": "nonpayable",
+                "inputs": [{"name": "by", "type": "uint256"}], "outputs": []}]
+
+
+def _report(**averages) -> GasReport:
+    return GasReport({"Counter": {function: GasStats(1, avg, avg, avg, None) for function, avg in averages.items()}})
+
+
+def test_diff_tells_new_removed_and_zero_baseline_functions_apart():
+    diffs = _report(increment=110, reset=10, decrement=5).diff(_report(increment=100, reset=0, burn=7))
+    assert [(diff.function, diff.status, diff.change) for diff in diffs] == [
+        ("burn", "removed", None), ("decrement", "new", None), ("increment", "changed", 0.1),
+        ("reset", "changed", math.inf)]
+
+
+def _gas_report(project_config, *args):
+    return CliRunner().invoke(cli, ["-P", project_config.project_root, "gas-report", *args])
+
+
+def _create_project(project_config, fake_solc):
+    with open(f"{project_config.contracts_dir}/Counter.sol", "w") as fh:
+        fh.write("contract Counter {}\n")
+    fake_solc.add("Counter.sol", "Counter", COUNTER_ABI)
+    scenario_path = f"{project_config.project_root}/scenario.yaml"
+    with open(scenario_path, "w") as fh:
+        yaml.safe_dump({"calls": [{"contract": "Counter", "function": "increment", "args": [1], "repeat": 2}]}, fh)
+    return scenario_path
+
+
+def test_report_is_compared_with_the_baseline(project_config, node, fake_solc):
+    scenario_path = _create_project(project_config, fake_solc)
+    baseline_path = f"{project_config.project_root}/baseline.json"
+    result = _gas_report(project_config, "--save", baseline_path, scenario_path)
+    assert result.exit_code == 0, result.output
+    with open(baseline_path) as fh:
+        baseline = json.load(fh)
+    assert baseline["Counter"]["increment"] == {"calls": 2, "min": GAS_USED, "avg": GAS_USED, "max": GAS_USED,
+                                                "estimate": GAS_USED}
+
+    baseline["Counter"][DEPLOYMENT]["avg"] = 0
+    baseline["Counter"]["reset"] = dict(baseline["Counter"]["increment"])
+    with open(baseline_path, "w") as fh:
+        json.dump(baseline, fh)
+    result = _gas_report(project_config, "--baseline", baseline_path, scenario_path)
+    assert result.exit_code == 1
+    assert f"Counter.{DEPLOYMENT}: 0 -> {GAS_USED} (from zero)" in result.output
+    assert "Counter.reset: removed" in result.output
+    assert "1 functions use more gas than the baseline" in result.output
+
+
+def test_failures_are_reported(project_config, node, fake_solc):
+    _create_project(project_config, fake_solc)
+    scenario_path = f"{project_config.project_root}/unknown.yaml"
+    with open(scenario_path, "w") as fh:
+        yaml.safe_dump({"calls": [{"contract": "Vault", "function": "deposit"}]}, fh)
+    result = _gas_report(project_config, scenario_path)
+    assert result.exit_code == 1
+    assert "Gas report failed: Scenario calls unknown contract 'Vault'" in result.output
@@ -0,0 +1,114 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+import pytest
+
+from sol_binder.imports.lockfile import ImportLock
+from sol_binder.imports.resolver import ImportResolver
+from sol_binder.imports.store import ContentStore
+from sol_binder.imports.validators import ValidatorCache
+from sol_binder.retrievers.base import BaseRetriever
+from sol_binder.retrievers.errors import RetrievalFailedError
+from sol_binder.retrievers.http import HttpClient, FetchResult
+
+SOURCE = "pragma solidity ^0.8.0;\ncontract A {}\n"
+ETAG = '"v1"'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        if status == 200 and self.headers.get("If-None-Match") == ETAG:
+            status = 304
+        self.send_response(status)
+        if status == 200:
+            body = SOURCE.encode()
+            self.send_header("ETag", ETAG)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.requests = []
+    server.statuses = []  # Statuses of the next responses, then 200 or 304
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def _get_url(server, path: str = "/A.sol") -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+class _HttpRetriever(BaseRetriever):
+    def __init__(self, base_url: str, client: HttpClient):
+        self.base_url = base_url
+        self.client = client
+
+    def get_local_path(self, import_path: str) -> str:
+        return import_path
+
+    def get_dep_context(self, import_path: str):
+        return None
+
+    def is_local(self) -> bool:
+        return False
+
+    def fetch(self, import_path: str, validators=None) -> FetchResult:
+        return self.client.fetch(f"{self.base_url}/{import_path}", validators)
+
+
+def test_fetch_revalidates_with_the_etag(server):
+    client = HttpClient(retries=0)
+    first = client.fetch(_get_url(server))
+    assert first.source == SOURCE
+    assert first.validators == {"etag": ETAG}
+    second = client.fetch(_get_url(server), first.validators)
+    assert second.source is None
+    assert second.validators == first.validators
+    assert server.requests[1]["If-None-Match"] == ETAG
+
+
+def test_not_modified_reuses_the_local_copy(server, tmp_path):
+    client = HttpClient(retries=0)
+    retriever = _HttpRetriever(_get_url(server, ""), client)
+
+    def create_resolver(refresh: bool) -> ImportResolver:
+        return ImportResolver(str(tmp_path / "imports"), lambda url: retriever,
+                              ContentStore(str(tmp_path / "store")), ImportLock(str(tmp_path / "solbinder.lock")),
+                              ValidatorCache(str(tmp_path / "validators")), max_workers=1, refresh=refresh)
+
+    translations, _ = create_resolver(False).resolve(["A.sol"])
+    translations, nodes = create_resolver(True).resolve(["A.sol"])
+    assert [request.get("If-None-Match") for request in server.requests] == [None, ETAG]
+    with open(translations["A.sol"]) as fh:
+        assert fh.read() == SOURCE
+    assert nodes["A.sol"].size == len(SOURCE.encode())
+
+
+def test_server_errors_are_retried_until_success(server):
+    server.statuses = [503, 500]
+    client = HttpClient(retries=2, backoff=0.01)
+    assert client.fetch(_get_url(server)).source == SOURCE
+    assert len(server.requests) == 3
+
+
+def test_server_errors_fail_after_the_last_retry(server):
+    server.statuses = [502, 502]
+    client = HttpClient(retries=1, backoff=0.01)
+    with pytest.raises(RetrievalFailedError):
+        client.fetch(_get_url(server))
+    assert len(server.requests) == 2
@@ -0,0 +1,79 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+
+import pytest
+
+from sol_binder.project.config import ContractDeploymentData, ProjectConfig
+from sol_binder.project.errors import DeploymentNotFoundError
+from sol_binder.project.manifest import DeploymentManifest
+
+TOKEN_ABI = [{"type": "function", "name": "totalSupply", "stateMutability": "view", "inputs": [],
+              "outputs": [{"name": "", "type": "uint256"}]}]
+VAULT_ABI = [{"type": "function", "name": "deposit", "stateMutability": "nonpayable", "inputs": [], "outputs": []}]
+
+
+def _deployment(abi, index: int) -> ContractDeploymentData:
+    return ContractDeploymentData(abi=abi, contract_address="0x" + f"{index:040x}", tx_hash="",
+                                  account="0x" + "01" * 20, chain_id=1337, w3_url="", source_hash="",
+                                  deployment_cost_wei=index)
+
+
+def test_instances_of_a_contract_share_one_abi(tmp_path):
+    manifest = DeploymentManifest(str(tmp_path / "deployments" / "net.manifest.json"))
+    deployments = {f"Token{i}": _deployment(TOKEN_ABI, i) for i in range(10)}
+    manifest.update(dict(deployments, Vault=_deployment(VAULT_ABI, 10)))
+
+    with open(manifest.path) as fh:
+        assert len(json.load(fh)["abis"]) == 2
+    assert manifest.get("Token3") == deployments["Token3"]
+    assert manifest.get("Token3").abi is manifest.get("Token4").abi
+    assert manifest.get("Missing") is None
+
+    # Replacing the only deployment of an ABI drops it
+    manifest.update({"Vault": _deployment(TOKEN_ABI, 11)})
+    with open(manifest.path) as fh:
+        assert len(json.load(fh)["abis"]) == 1
+
+
+def test_changes_of_other_processes_are_seen(tmp_path, monkeypatch):
+    path = str(tmp_path / "net.manifest.json")
+    manifest, other = DeploymentManifest(path), DeploymentManifest(path)
+    manifest.update({"Token": _deployment(TOKEN_ABI, 1)})
+
+    loads = []
+    original_load = json.load
+    monkeypatch.setattr(json, "load", lambda fh: loads.append(fh.name) or original_load(fh))
+    for _ in range(3):
+        assert manifest.get("Token").deployment_cost_wei == 1
+    assert loads == []  # Still the file this instance wrote
+
+    other.update({"Vault": _deployment(VAULT_ABI, 2)})
+    loads.clear()
+    assert manifest.get_names() == ["Token", "Vault"]
+    assert manifest.get("Vault").abi == VAULT_ABI
+    assert loads == [path]
+
+
+def test_concurrent_updates_are_all_kept(tmp_path):
+    path = str(tmp_path / "net.manifest.json")
+    manifests = [DeploymentManifest(path) for _ in range(4)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for future in [executor.submit(manifests[i % 4].update, {f"Token{i}": _deployment(TOKEN_ABI, i)})
+                       for i in range(40)]:
+            future.result()
+    assert DeploymentManifest(path).get_names() == sorted(f"Token{i}" for i in range(40))
+
+
+def test_project_falls_back_to_legacy_deployment_files(tmp_path):
+    project_config = ProjectConfig(project_root=str(tmp_path), default_network="net")
+    os.makedirs(project_config.deploy_cache_dir)
+    with open(project_config.get_deployment_filepath("Legacy"), "w") as fh:
+        json.dump(asdict(_deployment(TOKEN_ABI, 1)), fh)
+    project_config.save_deployment_data({"Token": _deployment(TOKEN_ABI, 2)})
+
+    assert project_config.get_deployment_data("Legacy").deployment_cost_wei == 1
+    assert project_config.get_deployment_data("Token").deployment_cost_wei == 2
+    with pytest.raises(DeploymentNotFoundError):
+        project_config.get_deployment_data("Missing")
@@ -0,0 +1,122 @@
+import pytest
+from eth_abi import decode_abi, encode_abi
+from eth_utils import function_abi_to_4byte_selector, to_checksum_address
+from web3 import Web3
+
+from fake_node import RpcError
+from sol_binder.contracts.multicall import Multicall, MulticallCallError, MulticallError, MULTICALL_ABI
+
+MULTICALL_ADDRESS = to_checksum_address("0x" + "99" * 20)
+TOKEN_ADDRESS = to_checksum_address("0x" + "77" * 20)
+EMPTY_ADDRESS = to_checksum_address("0x" + "55" * 20)
+TOKEN_ABI = [
+    {"type": "function", "name": "balanceOf", "stateMutability": "view",
+     "inputs": [{"name": "owner", "type": "address"}], "outputs": [{"name": "", "type": "uint256"}]},
+    {"type": "function", "name": "name", "stateMutability": "view", "inputs": [],
+     "outputs": [{"name": "", "type": "string"}]},
+    {"type": "function", "name": "broken", "stateMutability": "view", "inputs": [],
+     "outputs": [{"name": "", "type": "uint256"}]},
+]
+AGGREGATE3_SELECTOR = function_abi_to_4byte_selector(MULTICALL_ABI[0])
+SELECTORS = {function_abi_to_4byte_selector(abi): abi["name"] for abi in TOKEN_ABI}
+
+
+class FakeAggregator(object):
+    """Answers the `eth_call`s of the node like Multicall.sol, with a token contract at TOKEN_ADDRESS"""
+
+    def __init__(self):
+        self.aggregate_calls = []  # (number of calls, block identifier) of every aggregate3 call
+
+    def __call__(self, transaction, block_identifier) -> bytes:
+        data = bytes.fromhex(transaction["data"][2:])
+        assert to_checksum_address(transaction["to"]) == MULTICALL_ADDRESS and data[:4] == AGGREGATE3_SELECTOR
+        [calls] = decode_abi(["(address,bool,bytes)[]"], data[4:])
+        self.aggregate_calls.append((len(calls), block_identifier))
+        results = []
+        for target, allow_failure, call_data in calls:
+            success, return_data = self.__call_token(to_checksum_address(target), call_data, block_identifier)
+            if not success and not allow_failure:
+                raise RpcError("execution reverted: Multicall3: call failed")
+            results.append((success, return_data))
+        return encode_abi(["(bool,bytes)[]"], [results])
+
+    @staticmethod
+    def __call_token(target, call_data, block_identifier):
+        if target != TOKEN_ADDRESS:
+            return True, b""  # No code
+        name = SELECTORS[call_data[:4]]
+        if name == "balanceOf":
+            [owner] = decode_abi(["address"], call_data[4:])
+            return True, encode_abi(["uint256"], [int(owner[-2:], 16) * 100 + int(block_identifier, 16)])
+        if name == "name":
+            return True, encode_abi(["string"], ["Token"])
+        return False, b""
+
+
+@pytest.fixture
+def aggregator(node):
+    node.call_handler = aggregator = FakeAggregator()
+    return aggregator
+
+
+def _get_token(node, address=TOKEN_ADDRESS):
+    return Web3(Web3.HTTPProvider(node.url)).eth.contract(address=address, abi=TOKEN_ABI)
+
+
+def test_results_are_decoded_with_the_abi_of_their_function(node, aggregator):
+    token = _get_token(node)
+    with Multicall(token.web3, MULTICALL_ADDRESS, block_identifier=5) as mc:
+        balances = [mc.add(token, "balanceOf", to_checksum_address("0x" + f"{i:040x}")) for i in range(1, 4)]
+        name = mc.add(token, "name")
+    assert [balance.value for balance in balances] == [105, 205, 305]
+    assert name.value == "Token"
+    assert aggregator.aggregate_calls == [(4, "0x5")]
+
+
+def test_large_batches_are_split_and_read_at_one_block(node, aggregator):
+    token = _get_token(node)
+    node.block_number = 7
+    mc = Multicall(token.web3, MULTICALL_ADDRESS, batch_size=2)
+    results = [mc.add(token, "balanceOf", to_checksum_address("0x" + f"{i:040x}")) for i in range(5)]
+    node.mine()  # Doesn't change the block the queued calls are read at
+    mc.execute()
+    assert [result.value for result in results] == [i * 100 + 8 for i in range(5)]
+    assert aggregator.aggregate_calls == [(2, "0x8"), (2, "0x8"), (1, "0x8")]
+
+
+def test_failures_are_reported_on_the_results_that_allow_them(node, aggregator):
+    token, empty = _get_token(node), _get_token(node, EMPTY_ADDRESS)
+    with Multicall(token.web3, MULTICALL_ADDRESS, block_identifier=1, allow_failure=True) as mc:
+        broken = mc.add(token, "broken")
+        no_code = mc.add(empty, "name")
+        name = mc.add(token, "name")
+    assert (broken.success, no_code.success, name.value) == (False, False, "Token")
+    with pytest.raises(MulticallCallError, match="reverted"):
+        broken.value
+    with pytest.raises(MulticallCallError):
+        no_code.value
+
+
+def test_a_failure_that_is_not_allowed_fails_the_multicall(node, aggregator):
+    token, empty = _get_token(node), _get_token(node, EMPTY_ADDRESS)
+    mc = Multicall(token.web3, MULTICALL_ADDRESS, block_identifier=1)
+    broken = mc.add(token, "broken")
+    mc.add(token, "name", allow_failure=True)
+    with pytest.raises(MulticallError, match="Multicall failed"):
+        mc.execute()
+    assert broken.success is None
+
+    # Undecodable results are only noticed by sol-binder
+    no_code = mc.add(empty, "name")
+    with pytest.raises(MulticallError, match="name failed"):
+        mc.execute()
+    assert no_code.success is False
+
+
+def test_from_project_uses_the_multicall_address_of_the_network(project_config, node, aggregator):
+    project_config.get_network_info()["multicall_address"] = MULTICALL_ADDRESS
+    mc = Multicall.from_project(project_config, block_identifier=3)
+    assert mc.address == MULTICALL_ADDRESS
+    name = mc.add(_get_token(node), "name")
+    mc.execute()
+    assert name.value == "Token"
@@ -0,0 +1,91 @@
+from concurrent.futures import Future
+from threading import Thread, Lock
+
+import pytest
+from hexbytes import HexBytes
+
+from sol_binder.contracts.pipeline import TransactionPipeline
+
+ACCOUNT = "0x" + "11" * 20
+
+
+class FakeNonceManager(object):
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.next_nonce = 0
+        self.syncs = 0
+        self.__lock = Lock()
+
+    def reserve_nonces(self, account: str, count: int):
+        with self.__lock:
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("RPC unavailable")
+            nonces = list(range(self.next_nonce, self.next_nonce + count))
+            self.next_nonce += count
+            return nonces
+
+    def sync_from_chain(self, accounts):
+        self.syncs += 1
+
+
+class FakeReceiptWaiter(object):
+    """Every transaction is mined as soon as it is sent"""
+
+    def wait(self, tx_hash, timeout=None, callback=None):
+        future = Future()
+        future.set_result({"transactionHash": tx_hash, "status": 1})
+        callback(future)
+        return future
+
+
+class FakeInstance(object):
+    def __init__(self, nonce_manager: FakeNonceManager):
+        self.nonce_manager = nonce_manager
+        self.receipt_waiter = FakeReceiptWaiter()
+        self.sent = []
+
+    def build_transaction(self, func_name, func_args, tx_args):
+        return {"from": ACCOUNT, "data": func_name}
+
+    def sign_transaction(self, tx):
+        return HexBytes(tx["nonce"])
+
+    def send_transaction(self, tx, raw_transaction):
+        self.sent.append(tx["nonce"])
+        return HexBytes(tx["nonce"].to_bytes(32, "big"))
+
+    def _log_transaction(self, tx_hash, func_name, func_args):
+        pass
+
+
+def _submit_all(pipeline: TransactionPipeline, count: int) -> list:
+    transactions = []
+    thread = Thread(target=lambda: transactions.extend(pipeline.submit("ping") for _ in range(count)), daemon=True)
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive(), "submit blocked on the slots of failed transactions"
+    return transactions
+
+
+def test_nonce_errors_fail_the_batch_and_the_pipeline_keeps_sending():
+    instance = FakeInstance(FakeNonceManager(failures=1))
+    with TransactionPipeline(instance, max_in_flight=1, max_queued=2) as pipeline:
+        transactions = _submit_all(pipeline, 6)
+        with pytest.raises(ConnectionError):
+            transactions[0].receipt.result(5)
+        later = _submit_all(pipeline, 2)
+    receipts = [transaction.receipt.result(5) for transaction in later]
+    assert [receipt["status"] for receipt in receipts] == [1, 1]
+    assert instance.nonce_manager.syncs == 1
+    assert instance.sent == list(range(len(instance.sent)))
+
+
+def test_every_transaction_is_resolved_when_the_nonces_keep_failing():
+    instance = FakeInstance(FakeNonceManager(failures=1000))
+    with TransactionPipeline(instance, max_in_flight=2, max_queued=2) as pipeline:
+        transactions = _submit_all(pipeline, 5)
+    for transaction in transactions:
+        with pytest.raises(ConnectionError):
+            transaction.tx_hash.result(5)
+    assert instance.sent == []
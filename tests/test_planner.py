@@ -0,0 +1,63 @@
+import pytest
+from eth_abi import decode_abi
+
+from fake_node import ACCOUNTS, get_create_address
+from sol_binder.commands.deploy import deploy_all
+from sol_binder.commands.errors import DeploymentPlanError
+from sol_binder.commands.planner import get_deployment_waves, resolve_plan
+from sol_binder.project.config import ProjectContractDeployment
+
+VAULT_ABI = [{"type": "constructor", "stateMutability": "nonpayable",
+              "inputs": [{"name": "token", "type": "address"}, {"name": "oracle", "type": "address"}]}]
+
+
+def _plan(name: str, *args) -> ProjectContractDeployment:
+    return ProjectContractDeployment(name, f"contracts/{name}.sol", list(args))
+
+
+def _get_wave_names(plans):
+    return [[plan.name for plan in wave] for wave in get_deployment_waves(plans)]
+
+
+def test_waves_follow_the_references():
+    plans = [_plan("Vault", "${Token.address}", "${Oracle.address}"), _plan("Token"),
+             _plan("Router", ["${Vault.address}", {"fee": "${Token.address}"}]), _plan("Oracle", 10)]
+    assert _get_wave_names(plans) == [["Token", "Oracle"], ["Vault"], ["Router"]]
+
+
+def test_unknown_and_circular_references_are_rejected():
+    with pytest.raises(DeploymentPlanError, match="Oracle"):
+        get_deployment_waves([_plan("Vault", "${Oracle.address}")])
+    with pytest.raises(DeploymentPlanError, match="Circular"):
+        get_deployment_waves([_plan("A", "${B.address}"), _plan("B", "${A.address}"), _plan("C")])
+
+
+def test_references_are_resolved_anywhere_in_the_arguments():
+    plan = _plan("Router", "${Token.address}", ["${Vault.address}"], {"fee": "to ${Token.address}"}, 3)
+    addresses = {"Token": "0x" + "01" * 20, "Vault": "0x" + "02" * 20}
+    assert resolve_plan(plan, addresses).args == [
+        addresses["Token"], [addresses["Vault"]], {"fee": f"to {addresses['Token']}"}, 3]
+
+
+def _create_project(project_config, fake_solc):
+    for name in ("Token", "Oracle", "Vault"):
+        with open(f"{project_config.contracts_dir}/{name}.sol", "w") as fh:
+            fh.write(f"contract {name} {{}}\n")
+        fake_solc.add(f"{name}.sol", name, VAULT_ABI if name == "Vault" else [])
+    project_config.deployments = {"Vault.sol": {"Vault": ["${Token.address}", "${Oracle.address}"]},
+                                  "Token.sol": "Token", "Oracle.sol": "Oracle"}
+
+
+@pytest.mark.parametrize("pipeline", [False, True])
+def test_deploy_all_deploys_dependencies_first(project_config, node, fake_solc, pipeline):
+    _create_project(project_config, fake_solc)
+    deploy_all(solbinder_config=project_config, max_workers=1, pipeline=pipeline)
+
+    addresses = {name: project_config.get_deployment_data(name).contract_address
+                 for name in ("Token", "Oracle", "Vault")}
+    # Token and Oracle make up the first wave, in plan order
+    assert [addresses["Token"], addresses["Oracle"], addresses["Vault"]] == [
+        get_create_address(ACCOUNTS[0], nonce) for nonce in range(3)]
+    vault_transaction = node.transactions[2]
+    arguments = decode_abi(["address", "address"], bytes.fromhex(vault_transaction["data"][2 + len("6000"):]))
+    assert [address.lower() for address in arguments] == [addresses["Token"].lower(), addresses["Oracle"].lower()]
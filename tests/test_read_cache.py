@@ -0,0 +1,97 @@
+import pytest
+from eth_abi import decode_abi, encode_abi
+from eth_utils import function_abi_to_4byte_selector
+from web3 import Web3
+
+from fake_node import ACCOUNTS
+from sol_binder.contracts.instance import ContractInstance
+from sol_binder.contracts.read_cache import ReadCache
+from sol_binder.project.config import ContractDeploymentData
+
+TOKEN_ADDRESS = Web3.toChecksumAddress("0x" + "77" * 20)
+TOKEN_ABI = [
+    {"type": "function", "name": "totalSupply", "stateMutability": "view", "inputs": [],
+     "outputs": [{"name": "", "type": "uint256"}]},
+    {"type": "function", "name": "balanceOf", "stateMutability": "view",
+     "inputs": [{"name": "owner", "type": "address"}], "outputs": [{"name": "", "type": "uint256"}]},
+]
+BALANCE_OF_SELECTOR = function_abi_to_4byte_selector(TOKEN_ABI[1])
+
+
+def _token_call_handler(transaction, block_identifier) -> bytes:
+    """The supply is 1000 times the block number, balances are the last byte of the owner plus the block number"""
+    data = bytes.fromhex(transaction["data"][2:])
+    block_number = 9 if block_identifier == "pending" else int(block_identifier, 16)
+    if data[:4] == BALANCE_OF_SELECTOR:
+        [owner] = decode_abi(["address"], data[4:])
+        return encode_abi(["uint256"], [int(owner[-2:], 16) + block_number])
+    return encode_abi(["uint256"], [block_number * 1000])
+
+
+@pytest.fixture
+def token(node):
+    node.call_handler = _token_call_handler
+    w3 = Web3(Web3.HTTPProvider(node.url))
+    return w3.eth.contract(address=TOKEN_ADDRESS, abi=TOKEN_ABI)
+
+
+def test_latest_reads_are_cached_until_a_new_block(node, token):
+    cache = ReadCache(token.web3, block_poll_interval=0)
+    assert [cache.call(token.functions.totalSupply()) for _ in range(3)] == [1000] * 3
+    assert node.requests.count("eth_call") == 1
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    node.mine()
+    assert cache.call(token.functions.totalSupply()) == 2000
+    assert node.requests.count("eth_call") == 2
+    assert len(cache) == 1
+
+
+def test_new_blocks_are_only_checked_for_every_poll_interval(node, token):
+    cache = ReadCache(token.web3, block_poll_interval=60)
+    assert cache.call(token.functions.totalSupply()) == 1000
+    node.mine()
+    assert cache.call(token.functions.totalSupply()) == 1000
+    assert node.requests.count("eth_blockNumber") == 1
+    cache.invalidate()
+    assert cache.call(token.functions.totalSupply()) == 2000
+
+
+def test_pinned_reads_are_kept_across_blocks(node, token):
+    cache = ReadCache(token.web3, block_poll_interval=0)
+    assert cache.call(token.functions.totalSupply(), block_identifier=1) == 1000
+    node.mine(5)
+    assert cache.call(token.functions.totalSupply()) == 6000
+    assert cache.call(token.functions.totalSupply(), block_identifier=1) == 1000
+    block_hash = "0x" + f"{3:064x}"
+    assert cache.call(token.functions.totalSupply(), block_identifier=block_hash) == 3000
+    assert cache.call(token.functions.totalSupply(), block_identifier=bytes.fromhex(block_hash[2:])) == 3000
+    assert node.requests.count("eth_call") == 3
+
+    # Not a fixed block
+    assert cache.call(token.functions.totalSupply(), block_identifier="pending") == 9000
+    assert cache.call(token.functions.totalSupply(), block_identifier="pending") == 9000
+    assert node.requests.count("eth_call") == 5
+
+
+def test_reads_are_keyed_by_arguments_and_evicted_least_recently_used_first(node, token):
+    cache = ReadCache(token.web3, max_size=2, block_poll_interval=0)
+    assert [cache.call(token.functions.balanceOf(account)) for account in ACCOUNTS[:2]] == [2, 3]
+    cache.call(token.functions.balanceOf(ACCOUNTS[0]))  # Now the most recently used
+    cache.call(token.functions.balanceOf(ACCOUNTS[2]))
+    assert len(cache) == 2
+    cache.call(token.functions.balanceOf(ACCOUNTS[0]))
+    cache.call(token.functions.balanceOf(ACCOUNTS[1]))
+    assert (cache.hits, cache.misses) == (2, 4)
+    assert cache.get_stats() == "read cache: 2 hits, 4 misses, 2 entries"
+
+
+def test_project_instances_share_the_read_cache_of_their_network(project_config, node, token):
+    project_config.get_network_info()["read_cache"] = {"block_poll_interval": 0}
+    project_config.save_deployment_data({"Token": ContractDeploymentData(
+        abi=TOKEN_ABI, contract_address=TOKEN_ADDRESS, tx_hash="", account=ACCOUNTS[0], chain_id=node.chain_id,
+        w3_url=node.url, source_hash="", deployment_cost_wei=0)})
+    instances = [ContractInstance.from_project(project_config, "Token") for _ in range(2)]
+    assert instances[0].read_cache is instances[1].read_cache is not None
+    assert [instance.call("totalSupply") for instance in instances] == [1000, 1000]
+    assert node.requests.count("eth_call") == 1
@@ -0,0 +1,96 @@
+from time import sleep
+
+import pytest
+from web3 import Web3
+from web3.exceptions import TimeExhausted
+
+from fake_node import ACCOUNTS
+from sol_binder.receipt_waiter import ReceiptWaiter
+from sol_binder.rpc_batch import BatchHTTPProvider
+
+POLL_INTERVAL = 0.01
+
+
+@pytest.fixture
+def w3(node) -> Web3:
+    node.auto_mine = False
+    return Web3(BatchHTTPProvider(node.url))
+
+
+def _send(w3: Web3, count: int = 1):
+    return [w3.eth.send_transaction({"from": ACCOUNTS[0], "to": ACCOUNTS[1], "value": 1}) for _ in range(count)]
+
+
+def _count_receipt_requests(node) -> int:
+    with node.lock:
+        return node.requests.count("eth_getTransactionReceipt")
+
+
+def test_pending_transactions_are_fetched_together_once_per_block(node, w3):
+    tx_hashes = _send(w3, 20)
+    waiter = ReceiptWaiter(w3, block_poll_interval=POLL_INTERVAL)
+    futures = [waiter.wait(tx_hash) for tx_hash in tx_hashes]
+    sleep(20 * POLL_INTERVAL)
+    assert not any(future.done() for future in futures)
+    # Every receipt is asked for once, then only when a block is mined
+    fetched = _count_receipt_requests(node)
+    assert fetched == 20
+    sleep(10 * POLL_INTERVAL)
+    assert _count_receipt_requests(node) == fetched
+
+    node.mine()
+    receipts = [future.result(timeout=5) for future in futures]
+    assert [receipt["transactionHash"] for receipt in receipts] == tx_hashes
+    assert {receipt["blockNumber"] for receipt in receipts} == {2}
+    assert _count_receipt_requests(node) == 40
+    assert all(len(batch) > 1 for batch in node.batches)
+    assert len(waiter) == 0
+
+
+def test_receipts_wait_for_their_confirmations(node, w3):
+    [tx_hash] = _send(w3)
+    waiter = ReceiptWaiter(w3, confirmations=2, block_poll_interval=POLL_INTERVAL)
+    confirmed, mined = waiter.wait(tx_hash), waiter.wait(tx_hash, confirmations=0)
+    node.mine()
+    assert mined.result(timeout=5)["blockNumber"] == 2
+    sleep(10 * POLL_INTERVAL)
+    assert not confirmed.done()
+    node.mine(2)
+    assert confirmed.result(timeout=5)["blockNumber"] == 2
+
+
+def test_transactions_that_are_not_mined_time_out(node, w3):
+    tx_hashes = _send(w3, 2)
+    waiter = ReceiptWaiter(w3, timeout=5, block_poll_interval=POLL_INTERVAL)
+    called = []
+    expiring = waiter.wait(tx_hashes[0], timeout=10 * POLL_INTERVAL, callback=called.append)
+    with pytest.raises(TimeExhausted):
+        expiring.result(timeout=5)
+    assert called == [expiring]
+    assert len(waiter) == 0
+
+    node.mine()
+    assert list(waiter.wait_for_receipts(tx_hashes, timeout=1)) == tx_hashes
+    node.auto_mine = True
+    receipts = waiter.wait_for_receipts(_send(w3) + ["0x" + "00" * 32], timeout=10 * POLL_INTERVAL)
+    assert len(receipts) == 1
+
+
+def test_node_errors_are_retried(node, w3):
+    [tx_hash] = _send(w3)
+    node.mine()
+    node.fail("eth_blockNumber", 3)
+    node.fail("eth_getTransactionReceipt", 1)
+    waiter = ReceiptWaiter(w3, block_poll_interval=POLL_INTERVAL)
+    assert waiter.wait_for_receipt(tx_hash, timeout=5)["transactionHash"] == tx_hash
+
+
+def test_project_networks_share_a_configured_waiter(project_config, node):
+    project_config.get_network_info()["receipts"] = {"confirmations": 1, "block_poll_interval": POLL_INTERVAL}
+    waiter = project_config.get_receipt_waiter()
+    assert waiter is project_config.get_receipt_waiter(project_config.default_network)
+    assert (waiter.confirmations, waiter.block_poll_interval) == (1, POLL_INTERVAL)
+    [tx_hash] = _send(project_config.get_w3())
+    future = waiter.wait(tx_hash)
+    node.mine()
+    assert future.result(timeout=5)["blockNumber"] == 2
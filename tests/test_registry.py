@@ -0,0 +1,80 @@
+import pytest
+from eth_abi import encode_abi
+from web3 import Web3
+
+from fake_node import ACCOUNTS
+from sol_binder.contracts import registry as registry_module
+from sol_binder.contracts.instance import ContractInstance
+from sol_binder.contracts.registry import ContractRegistry, get_contract_registry
+from sol_binder.project.config import ContractDeploymentData, ProjectConfig
+
+TOKEN_ABI = [
+    {"type": "function", "name": "totalSupply", "stateMutability": "view", "inputs": [],
+     "outputs": [{"name": "", "type": "uint256"}]},
+    {"type": "function", "name": "mint", "stateMutability": "nonpayable",
+     "inputs": [{"name": "amount", "type": "uint256"}], "outputs": []},
+]
+ADDRESSES = [Web3.toChecksumAddress("0x" + f"{i:02x}" * 20) for i in range(0x70, 0x74)]
+
+
+class Token(ContractInstance):
+    CONTRACT_NAME = "Token"
+
+
+@pytest.fixture
+def project(project_config, node, monkeypatch):
+    """A project with two deployments of the same token contract, whose config can't be loaded again"""
+    node.call_handler = lambda transaction, block_identifier: encode_abi(
+        ["uint256"], [ADDRESSES.index(Web3.toChecksumAddress(transaction["to"]))])
+    project_config.save_deployment_data({
+        name: ContractDeploymentData(abi=TOKEN_ABI, contract_address=address, tx_hash="", account=ACCOUNTS[0],
+                                     chain_id=node.chain_id, w3_url=node.url, source_hash="", deployment_cost_wei=0)
+        for name, address in zip(["Token", "Token2"], ADDRESSES)})
+
+    def load_project_config(*args, **kwargs):
+        raise AssertionError("The project config is loaded again")
+    monkeypatch.setattr(ProjectConfig, "load_project_config", load_project_config)
+    return project_config
+
+
+def test_instances_share_the_state_of_their_network(project):
+    registry = ContractRegistry(project)
+    token, other_token, token2 = (registry.get_instance("Token", instance_class=Token), registry.get_instance("Token"),
+                                  registry.get_instance("Token2"))
+    assert isinstance(token, Token)
+    assert token._contract is other_token._contract
+    assert type(token._contract) is type(token2._contract)
+    assert token._contract is not token2._contract
+    for attribute in ("nonce_manager", "fee_oracle", "read_cache", "receipt_waiter", "web3"):
+        assert getattr(token, attribute) is getattr(token2, attribute)
+    assert (token.call("totalSupply"), token2.call("totalSupply")) == (0, 1)
+    assert token.creator_account == ACCOUNTS[0]
+
+
+def test_instances_transact_through_the_project_nonce_manager(project, node):
+    token = ContractRegistry(project).get_instance("Token", account=ACCOUNTS[1])
+    tx_hashes = [token.transact("mint", [amount]) for amount in (1, 2)]
+    assert [transaction["hash"] for transaction in node.transactions] == [tx_hash.hex() for tx_hash in tx_hashes]
+    assert [(transaction["from"], transaction["nonce"]) for transaction in node.transactions] == [
+        (ACCOUNTS[1], 0), (ACCOUNTS[1], 1)]
+    assert token.wait_for_receipt(tx_hashes[1], timeout=5)["status"] == 1
+
+
+def test_contracts_at_any_address_are_bounded(project):
+    registry = ContractRegistry(project, max_bound_contracts=2)
+    abi = list(TOKEN_ABI)
+    contracts = [registry.get_contract(address, abi) for address in ADDRESSES[:3]]
+    assert len({type(contract) for contract in contracts}) == 1
+    assert registry.get_contract(ADDRESSES[2].lower(), abi) is contracts[2]
+    assert registry.get_contract(ADDRESSES[0], abi) is not contracts[0]
+    clone = registry.get_instance_at(ADDRESSES[3], abi, creator_account=ACCOUNTS[2])
+    assert (clone.call("totalSupply"), clone.creator_account) == (3, ACCOUNTS[2])
+
+
+def test_from_project_uses_the_shared_registry(project, monkeypatch):
+    monkeypatch.setattr(registry_module, "_shared_registries", {None: ContractRegistry(project)})
+    assert get_contract_registry() is get_contract_registry()
+    token, other_token = Token.from_project(), Token.from_project()
+    assert isinstance(token, Token)
+    assert token._contract is other_token._contract
+    assert token.call("totalSupply") == 0
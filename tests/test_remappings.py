@@ -0,0 +1,42 @@
+import os
+
+from sol_binder.binder import SolBinder
+from sol_binder.imports.remappings import Remappings
+from sol_binder.project.config import ProjectConfig
+
+
+def _write(path: str, content: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as fh:
+        fh.write(content)
+
+
+def test_longest_prefix_and_context_win():
+    remappings = Remappings(["@foo/=lib/foo/", "@foo/bar/=lib/bar/", "lib/baz:@foo/=lib/foo-v2/"])
+    assert remappings.apply("@foo/Foo.sol") == "lib/foo/Foo.sol"
+    assert remappings.apply("@foo/bar/Bar.sol") == "lib/bar/Bar.sol"
+    assert remappings.apply("@foo/Foo.sol", "lib/baz/Baz.sol") == "lib/foo-v2/Foo.sol"
+    assert remappings.apply("other/Other.sol") == "other/Other.sol"
+
+
+def test_relative_targets_are_resolved_against_the_base_path():
+    remappings = Remappings(["@foo/=lib/foo/", "@bar/=https://example.com/bar/", "lib/baz:@foo/=lib/foo-v2/"],
+                            base_path="../..")
+    assert remappings.apply("@foo/Foo.sol") == "../../lib/foo/Foo.sol"
+    assert remappings.apply("@foo/Foo.sol", "../../lib/baz/Baz.sol") == "../../lib/foo-v2/Foo.sol"
+    assert remappings.apply("@bar/Bar.sol") == "https://example.com/bar/Bar.sol"
+    assert remappings.get_local_targets() == ["../../lib/foo/", "../../lib/foo-v2/"]
+
+
+def test_project_relative_remapping_binds_files_of_the_project(tmp_path):
+    _write(str(tmp_path / "lib" / "foo" / "Foo.sol"), 'import "./Bar.sol";\ncontract Foo is Bar {}\n')
+    _write(str(tmp_path / "lib" / "foo" / "Bar.sol"), "contract Bar {}\n")
+    project_config = ProjectConfig(project_root=str(tmp_path), remappings=["@foo/=lib/foo/"])
+    binder = SolBinder.from_project_config(project_config, lock_path=str(tmp_path / "solbinder.lock"))
+
+    bind_result = binder.bind_with_imports('import "@foo/Foo.sol";\ncontract A is Foo {}\n')
+    foo_path = os.path.normpath(os.path.join(binder.import_path, "../../lib/foo/Foo.sol"))
+    assert foo_path == str(tmp_path / "lib" / "foo" / "Foo.sol")
+    assert bind_result.source == f'import "{foo_path}";\ncontract A is Foo {{}}\n'
+    assert sorted(bind_result.imports) == ["../../lib/foo/Bar.sol", "../../lib/foo/Foo.sol"]
+    assert str(tmp_path / "lib" / "foo") in binder.allow_paths
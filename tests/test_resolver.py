@@ -0,0 +1,89 @@
+import os
+
+from sol_binder.imports import resolver as resolver_module
+from sol_binder.imports.lockfile import ImportLock
+from sol_binder.imports.resolver import ImportResolver
+from sol_binder.imports.store import ContentStore
+from sol_binder.imports.validators import ValidatorCache
+from sol_binder.retrievers.base import BaseRetriever
+from sol_binder.retrievers.http import FetchResult
+
+SOURCES = {
+    "lib/A.sol": 'import "./B.sol";\ncontract A {}\n',
+    "lib/B.sol": "contract B {}\n",
+}
+
+
+class RemoteRetriever(BaseRetriever):
+    """Serves SOURCES as if they were remote"""
+
+    def __init__(self):
+        self.fetched = []
+
+    def get_local_path(self, import_path: str) -> str:
+        return import_path
+
+    def get_dep_context(self, import_path: str):
+        return None
+
+    def is_local(self) -> bool:
+        return False
+
+    def fetch(self, import_path: str, validators=None) -> FetchResult:
+        self.fetched.append(import_path)
+        return FetchResult(SOURCES[import_path])
+
+
+def _create_resolver(tmp_path, retriever: RemoteRetriever) -> ImportResolver:
+    return ImportResolver(str(tmp_path / "imports"), lambda url: retriever, ContentStore(str(tmp_path / "store")),
+                          ImportLock(str(tmp_path / "solbinder.lock")), ValidatorCache(str(tmp_path / "validators")),
+                          max_workers=1)
+
+
+def _count_hashes(monkeypatch) -> list:
+    hashed = []
+    hash_source = resolver_module.hash_source
+    monkeypatch.setattr(resolver_module, "hash_source", lambda source: hashed.append(source) or hash_source(source))
+    return hashed
+
+
+def test_locked_imports_are_resolved_without_reading_them(tmp_path, monkeypatch):
+    retriever = RemoteRetriever()
+    _create_resolver(tmp_path, retriever).resolve(["lib/A.sol"])
+    assert sorted(retriever.fetched) == ["lib/A.sol", "lib/B.sol"]
+
+    hashed = _count_hashes(monkeypatch)
+    translations, nodes = _create_resolver(tmp_path, retriever).resolve(["lib/A.sol"])
+    assert len(retriever.fetched) == 2
+    assert hashed == []
+    assert sorted(nodes) == ["lib/A.sol", "lib/B.sol"]
+    assert translations["lib/A.sol"] == os.path.join(str(tmp_path / "imports"), "lib/A.sol")
+
+
+def test_edited_local_copy_of_the_same_size_is_restored(tmp_path):
+    retriever = RemoteRetriever()
+    _create_resolver(tmp_path, retriever).resolve(["lib/A.sol"])
+    local_path = str(tmp_path / "imports" / "lib" / "B.sol")
+    with open(local_path, "w") as fh:
+        fh.write("contract X {}\n")
+    stat = os.stat(local_path)
+    os.utime(local_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    _create_resolver(tmp_path, retriever).resolve(["lib/A.sol"])
+    with open(local_path) as fh:
+        assert fh.read() == SOURCES["lib/B.sol"]
+    assert len(retriever.fetched) == 2
+
+
+def test_touched_local_copy_is_hashed_again_once(tmp_path, monkeypatch):
+    retriever = RemoteRetriever()
+    _create_resolver(tmp_path, retriever).resolve(["lib/A.sol"])
+    local_path = str(tmp_path / "imports" / "lib" / "B.sol")
+    stat = os.stat(local_path)
+    os.utime(local_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    hashed = _count_hashes(monkeypatch)
+    _create_resolver(tmp_path, retriever).resolve(["lib/A.sol"])
+    assert hashed == [SOURCES["lib/B.sol"]]
+    _create_resolver(tmp_path, retriever).resolve(["lib/A.sol"])
+    assert hashed == [SOURCES["lib/B.sol"]]
@@ -0,0 +1,78 @@
+import pytest
+from eth_abi import encode_abi
+from web3 import Web3, HTTPProvider
+
+from fake_node import ACCOUNTS
+from sol_binder.rpc_batch import (BatchHTTPProvider, JsonRpcBatch, JsonRpcError, get_transaction_counts,
+                                  get_transaction_receipts)
+
+TOKEN_ADDRESS = "0x" + "77" * 20
+TOKEN_ABI = [{"type": "function", "name": "balanceOf", "stateMutability": "view",
+              "inputs": [{"name": "owner", "type": "address"}], "outputs": [{"name": "", "type": "uint256"}]}]
+
+
+def _get_w3(node, **kwargs) -> Web3:
+    return Web3(BatchHTTPProvider(node.url, **kwargs))
+
+
+def test_responses_are_matched_to_their_requests(node):
+    # The node answers batches in reverse order
+    for i, account in enumerate(ACCOUNTS):
+        node.nonces[account.lower()] = i * 10
+    counts = get_transaction_counts(_get_w3(node), ACCOUNTS)
+    assert counts == {account: i * 10 for i, account in enumerate(ACCOUNTS)}
+    assert node.batches == [["eth_getTransactionCount"] * 3]
+
+
+def test_large_batches_are_split(node):
+    node.nonces[ACCOUNTS[2].lower()] = 5
+    counts = get_transaction_counts(_get_w3(node, max_batch_size=2), ACCOUNTS)
+    assert counts == {ACCOUNTS[0]: 0, ACCOUNTS[1]: 0, ACCOUNTS[2]: 5}
+    assert [len(batch) for batch in node.batches] == [2, 1]
+
+
+def test_results_are_formatted_like_web3_does(node):
+    w3 = _get_w3(node)
+    node.call_handler = lambda transaction, block_identifier: encode_abi(["uint256"], [int(block_identifier, 16)])
+    tx_hash = w3.eth.send_transaction({"from": ACCOUNTS[0], "to": ACCOUNTS[1], "value": 1})
+    node.auto_mine = False
+    pending_hash = w3.eth.send_transaction({"from": ACCOUNTS[0], "to": ACCOUNTS[1], "value": 1})
+    token = w3.eth.contract(address=Web3.toChecksumAddress(TOKEN_ADDRESS), abi=TOKEN_ABI)
+
+    with JsonRpcBatch(w3) as batch:
+        block_number = batch.get_block_number()
+        balance = batch.call(token, "balanceOf", ACCOUNTS[0], block_identifier=1)
+        receipts = [batch.get_transaction_receipt(tx_hash), batch.get_transaction_receipt(pending_hash)]
+    assert block_number.value == 2
+    assert balance.value == 1
+    assert receipts[0].value.blockNumber == 2 and receipts[0].value["transactionHash"] == tx_hash
+    assert receipts[1].value is None
+    assert get_transaction_receipts(w3, [tx_hash, pending_hash.hex()]) == {
+        tx_hash: receipts[0].value, pending_hash: None}
+
+
+def test_a_failed_request_only_fails_its_result(node):
+    node.fail("eth_getTransactionCount")
+    batch = JsonRpcBatch(_get_w3(node))
+    results = [batch.get_transaction_count(account) for account in ACCOUNTS[:2]] + [batch.get_block_number()]
+    with pytest.raises(JsonRpcError, match="not executed yet"):
+        results[0].value
+    batch.execute()
+    assert [result.error is None for result in results] == [False, True, True]
+    with pytest.raises(JsonRpcError, match="eth_getTransactionCount failed"):
+        results[0].value
+    assert results[2].value == 1
+
+
+def test_other_providers_send_the_requests_one_by_one(node):
+    w3 = Web3(HTTPProvider(node.url))
+    assert get_transaction_counts(w3, ACCOUNTS) == {account: 0 for account in ACCOUNTS}
+    assert node.batches == []
+    assert node.requests == ["eth_getTransactionCount"] * 3
+
+
+def test_project_networks_batch_their_requests(project_config, node):
+    w3 = project_config.get_w3()
+    assert isinstance(w3.provider, BatchHTTPProvider)
+    project_config.get_nonce_manager().sync_from_chain(ACCOUNTS)
+    assert node.batches == [["eth_getTransactionCount"] * 3]
@@ -0,0 +1,67 @@
+import time
+
+from sol_binder.imports.scanner import iter_import_directives, iter_import_urls, rewrite_imports
+
+
+def test_every_import_form():
+    source = "\n".join([
+        'pragma solidity ^0.8.0;',
+        'import "./A.sol";',
+        "import './B.sol';",
+        'import "./C.sol" as C;',
+        'import * as D from "./D.sol";',
+        'import {E, F as G} from "./E.sol";',
+        'import H from "./H.sol";',
+        'contract X {}',
+    ])
+    assert list(iter_import_urls(source)) == ["./A.sol", "./B.sol", "./C.sol", "./D.sol", "./E.sol", "./H.sol"]
+
+
+def test_imports_over_several_lines():
+    source = 'import {\n    A,\n    B as C\n}\nfrom\n    "./A.sol"\n;\nimport\n"./B.sol";\n'
+    assert list(iter_import_urls(source)) == ["./A.sol", "./B.sol"]
+
+
+def test_comments_and_strings_are_skipped():
+    source = "\n".join([
+        '// import "./Line.sol";',
+        '/* import "./Block.sol";',
+        '   import {A} from "./Block.sol"; */',
+        '/** @dev import "./Doc.sol"; **/',
+        'contract X {',
+        '    string s = "import \\"./String.sol\\";";',
+        "    string t = 'import \"./Single.sol\";';",
+        '    uint256 reimport; function doimport() public {}',
+        '}',
+        'import "./Real.sol"; // import "./Trailing.sol";',
+    ])
+    assert list(iter_import_urls(source)) == ["./Real.sol"]
+
+
+def test_rewrite_only_replaces_the_paths():
+    source = 'import "./A.sol";\n// import "./A.sol";\nimport {B} from \'./B.sol\';\ncontract X {}\n'
+    directives = list(iter_import_directives(source))
+    assert [source[d.start:d.end] for d in directives] == ["./A.sol", "./B.sol"]
+    rewritten = rewrite_imports(source, {"./A.sol": "/lib/A.sol", "./B.sol": "/lib/B.sol"}, directives)
+    assert rewritten == 'import "/lib/A.sol";\n// import "./A.sol";\nimport {B} from \'/lib/B.sol\';\ncontract X {}\n'
+    assert rewrite_imports(source, {"./A.sol": "./A.sol", "./B.sol": "./B.sol"}) == source
+
+
+def test_multi_megabyte_sources_are_scanned_in_linear_time():
+    chunk = "\n".join([
+        'import {{A, B as C}} from "./Lib{0}.sol";',
+        '/* import "./Commented.sol"; */',
+        'contract X{0} {{ string s = "import"; // import',
+        '    function f() public pure returns (uint256) {{ return {0}; }}',
+        '}}',
+    ])
+    source = "\n".join(chunk.format(i) for i in range(40000))
+    assert len(source) > 5 * 1024 * 1024
+    started = time.monotonic()
+    directives = list(iter_import_directives(source))
+    rewritten = rewrite_imports(source, {d.path: d.path.upper() for d in directives}, directives)
+    elapsed = time.monotonic() - started
+    assert [d.path for d in directives] == [f"./Lib{i}.sol" for i in range(40000)]
+    assert rewritten.count("./LIB") == 40000
+    # A quadratic scan or rewrite takes minutes on this source
+    assert elapsed < 10, f"scanning {len(source)} bytes took {elapsed:.1f}s"
@@ -0,0 +1,47 @@
+import hashlib
+import os
+
+import solcx
+
+from sol_binder.binder import SolBinder
+from sol_binder.compilation.scheduler import CompileScheduler
+from sol_binder.compilation.solc_registry import SolcRegistry
+from sol_binder.project.config import ProjectConfig
+
+
+def _write(path: str, content: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as fh:
+        fh.write(content)
+
+
+def _fake_compile_standard(input_data, solc_version=None, allow_paths=None, **kwargs):
+    """Compiles like solc would: the bytecode depends on the imported file, read from disk"""
+    with open(os.path.join(allow_paths[0], "Lib.sol"), "rb") as fh:
+        bytecode = hashlib.sha256(fh.read()).hexdigest()
+    return {"contracts": {unit_name: {"A": {"abi": [], "evm": {"bytecode": {"object": bytecode}}}}
+                          for unit_name in input_data["sources"]}}
+
+
+def test_compile_again_after_an_import_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(solcx, "compile_standard", _fake_compile_standard)
+    solc_folder = tmp_path / "solcx"
+    os.makedirs(solc_folder / "solc-v0.8.6")
+    project_config = ProjectConfig(project_root=str(tmp_path))
+    binder = SolBinder(project_config.imports_cache_dir, lock_path=str(tmp_path / "solbinder.lock"))
+    contract_path = os.path.join(project_config.contracts_dir, "A.sol")
+    _write(contract_path, 'pragma solidity ^0.8.0;\nimport "Lib.sol";\ncontract A is Lib {}\n')
+    _write(os.path.join(binder.import_path, "Lib.sol"), "contract Lib {}\n")
+
+    def compile_project():
+        scheduler = CompileScheduler(project_config, binder, 1, project_config.get_artifact_cache(),
+                                     SolcRegistry(str(solc_folder)), project_config.get_build_graph())
+        return scheduler.compile([contract_path])
+
+    first = compile_project()
+    assert compile_project().up_to_date == [os.path.abspath(contract_path)]
+
+    _write(os.path.join(binder.import_path, "Lib.sol"), "contract Lib { uint256 x; }\n")
+    second = compile_project()
+    assert second.up_to_date == []
+    assert second.get_compiled_contract(contract_path) != first.get_compiled_contract(contract_path)
@@ -0,0 +1,47 @@
+from click.testing import CliRunner
+from eth_abi import decode_abi
+
+from fake_node import ACCOUNTS, PRIVATE_KEY, KEY_ACCOUNT
+from sol_binder.bin.solbinder import cli
+from sol_binder.project.config import ContractDeploymentData
+
+ADDRESS = "0x" + "cc" * 20
+ABI = [{"type": "function", "name": "increment", "stateMutability": "nonpayable",
+        "inputs": [{"name": "by", "type": "uint256"}], "outputs": []}]
+
+
+def _deploy_counter(project_config):
+    project_config.save_deployment_data({"Counter": ContractDeploymentData(
+        abi=ABI, contract_address=ADDRESS, tx_hash="", account=ACCOUNTS[0], chain_id=1337, w3_url="",
+        source_hash="", deployment_cost_wei=0)})
+
+
+def _transact(project_config, *args):
+    return CliRunner().invoke(cli, ["-P", project_config.project_root, "transact", *args, "Counter", "increment", "5"])
+
+
+def test_transact_signs_with_the_private_key(project_config, node):
+    _deploy_counter(project_config)
+    result = _transact(project_config, "-p", PRIVATE_KEY)
+    assert result.exit_code == 0, result.output
+    assert "gas used in ETH" in result.output
+    [transaction] = node.transactions
+    assert transaction["raw"] and transaction["from"] == KEY_ACCOUNT
+    assert decode_abi(["uint256"], bytes.fromhex(transaction["data"][10:])) == (5,)
+
+
+def test_transact_sends_from_an_unlocked_account(project_config, node):
+    _deploy_counter(project_config)
+    result = _transact(project_config, "-u", ACCOUNTS[1])
+    assert result.exit_code == 0, result.output
+    [transaction] = node.transactions
+    assert not transaction["raw"] and transaction["from"] == ACCOUNTS[1]
+
+
+def test_manual_nonce_is_reported(project_config, node):
+    _deploy_counter(project_config)
+    result = _transact(project_config, "-N", "7")
+    assert result.exit_code == 1
+    assert "nonce" in result.output
+    assert result.exception is None or isinstance(result.exception, SystemExit)
+    assert node.transactions == []